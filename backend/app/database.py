@@ -5,10 +5,15 @@ Handles SQLAlchemy engine and session creation
 
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
-from contextlib import contextmanager
-from typing import Generator, Any
+from sqlalchemy.pool import StaticPool, QueuePool, AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from contextlib import contextmanager, asynccontextmanager
+from contextvars import ContextVar
+from typing import Generator, AsyncGenerator, Any, Dict, Optional
+import logging
 import os
+import re
+import time
 from dotenv import load_dotenv
 from pathlib import Path
 from fastapi import Depends
@@ -21,21 +26,87 @@ load_dotenv(ENV_PATH)
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/basketball.db")
 
 # SQLite-specific configuration
+SQLITE_IN_MEMORY = DATABASE_URL.startswith("sqlite") and (
+    ":memory:" in DATABASE_URL or "mode=memory" in DATABASE_URL or DATABASE_URL.rstrip("/") == "sqlite:"
+)
+
+# SQLite tuning for file-backed (production) databases
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "10"))
+SQLITE_MAX_OVERFLOW = int(os.getenv("SQLITE_MAX_OVERFLOW", "20"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negative = KiB, i.e. 64 MiB
+
+if SQLITE_IN_MEMORY:
+    # Named shared-cache memory database, so the sync and async engines see the same tables
+    DATABASE_URL = "sqlite:///file:scoringbasket?mode=memory&cache=shared&uri=true"
+
+
+def _async_database_url(url: str) -> str:
+    """Map a sync database URL onto its asyncio driver"""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql://") or url.startswith("postgres://"):
+        return "postgresql+asyncpg://" + url.split("://", 1)[1]
+    return url
+
+
+# Async database URL (override with ASYNC_DATABASE_URL)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_database_url(DATABASE_URL)
+
 if DATABASE_URL.startswith("sqlite"):
-    # For SQLite, we need to enable foreign keys and use StaticPool for in-memory testing
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
+    if SQLITE_IN_MEMORY:
+        # In-memory test database: every session must share the one connection
+        engine = create_engine(
+            DATABASE_URL,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    else:
+        # File database: real connection pool so readers run while a scorer commits
+        engine = create_engine(
+            DATABASE_URL,
+            connect_args={"check_same_thread": False},
+            poolclass=QueuePool,
+            pool_size=SQLITE_POOL_SIZE,
+            max_overflow=SQLITE_MAX_OVERFLOW,
+            pool_pre_ping=True,
+            echo=os.getenv("SQL_ECHO", "False").lower() == "true",
+        )
     
     # Enable foreign keys for SQLite
     @event.listens_for(engine, "connect")
     def set_sqlite_pragma(dbapi_conn, connection_record):
-        """Enable foreign key support in SQLite"""
+        """
+        Enable foreign key support in SQLite
+        File databases also get WAL journaling, NORMAL sync, a busy timeout
+        and mmap/page cache sizing so concurrent readers don't block on writes
+        """
         cursor = dbapi_conn.cursor()
         cursor.execute("PRAGMA foreign_keys=ON")
+        if not SQLITE_IN_MEMORY:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+            cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+            cursor.execute(f"PRAGMA cache_size={SQLITE_CACHE_SIZE}")
+            cursor.execute("PRAGMA temp_store=MEMORY")
         cursor.close()
+
+    if SQLITE_IN_MEMORY:
+        async_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=StaticPool)
+    else:
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=SQLITE_POOL_SIZE,
+            max_overflow=SQLITE_MAX_OVERFLOW,
+            pool_pre_ping=True,
+            echo=os.getenv("SQL_ECHO", "False").lower() == "true",
+        )
+
+    # Same pragmas for connections opened by the async engine
+    event.listen(async_engine.sync_engine, "connect", set_sqlite_pragma)
 else:
     # For other databases (PostgreSQL, MySQL, etc.)
     engine = create_engine(
@@ -43,10 +114,91 @@ else:
         pool_pre_ping=True,
         echo=os.getenv("SQL_ECHO", "False").lower() == "true",
     )
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_pre_ping=True,
+        echo=os.getenv("SQL_ECHO", "False").lower() == "true",
+    )
+
+# ==================== PER-REQUEST QUERY STATS ====================
+
+logger = logging.getLogger(__name__)
+
+# Record query counts/time per request (X-DB-Queries / X-DB-Time-ms headers)
+DB_QUERY_STATS = os.getenv("DB_QUERY_STATS", "True").lower() == "true"
+# Warn when one statement runs more than this many times in a single request
+DB_N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "10"))
+
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_NUMBERED_PARAM_RE = re.compile(r"(?:\$\d+|%\(\w+\)s)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def statement_fingerprint(statement: str) -> str:
+    """Normalize a SQL statement so repeats with different parameters compare equal"""
+    fingerprint = _NUMBERED_PARAM_RE.sub("?", statement)
+    fingerprint = _IN_LIST_RE.sub("(?)", fingerprint)
+    return _WHITESPACE_RE.sub(" ", fingerprint).strip()
+
+
+class QueryStats:
+    """Query count, DB time and per-statement counts for one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0  # seconds
+        self.statements: Dict[str, int] = {}
+
+    def record(self, statement: str, elapsed: float) -> None:
+        """Add one executed statement"""
+        self.count += 1
+        self.total_time += elapsed
+        fingerprint = statement_fingerprint(statement)
+        self.statements[fingerprint] = self.statements.get(fingerprint, 0) + 1
+
+    @property
+    def total_time_ms(self) -> float:
+        return self.total_time * 1000
+
+    def repeated_statements(self, threshold: int = DB_N_PLUS_ONE_THRESHOLD) -> Dict[str, int]:
+        """Statements that ran more than `threshold` times (likely N+1 loops)"""
+        return {sql: count for sql, count in self.statements.items() if count > threshold}
+
+
+# Set by the query stats middleware for the duration of a request;
+# threadpool routes and async sessions inherit the same QueryStats object
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Start the timer for a statement issued during a tracked request"""
+    if current_query_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Record a statement issued during a tracked request"""
+    stats = current_query_stats.get()
+    if stats is None:
+        return
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        return
+    stats.record(statement, time.perf_counter() - start_times.pop())
+
+
+if DB_QUERY_STATS:
+    for _engine in (engine, async_engine.sync_engine):
+        event.listen(_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(_engine, "after_cursor_execute", _after_cursor_execute)
+
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async session factory; objects stay readable after commit since they outlive the request
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
 
 def get_db() -> Any:
     """
@@ -90,6 +242,28 @@ def get_db_context():
         db.close()
 
 
+async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async database dependency, keeps DB I/O off the event loop
+    Usage: async def my_route(db: AsyncSession = Depends(get_async_db_session))
+    Sync service code can be reused with: await db.run_sync(lambda session: ...)
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+@asynccontextmanager
+async def get_async_db_context():
+    """
+    Async context manager for database session outside of request context
+    Usage:
+        async with get_async_db_context() as db:
+            # use db
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
     """
     Initialize database - creates tables if they don't exist
@@ -100,12 +274,26 @@ def init_db():
     # For SQLite, check if tables already exist
     if DATABASE_URL.startswith("sqlite"):
         # Tables are created by schema.sql, not by Base.metadata.create_all()
-        # But we keep this for flexibility during development
-        pass
+        # Derived tables maintained by the app itself are created here
+        from .models import (
+            LivePlayerGameStats, LiveTeamGameStats, GameResult, TeamStanding, PlayerScopeStats, RevokedToken
+        )
+        Base.metadata.create_all(bind=engine, tables=[
+            LivePlayerGameStats.__table__,
+            LiveTeamGameStats.__table__,
+            GameResult.__table__,
+            TeamStanding.__table__,
+            PlayerScopeStats.__table__,
+            RevokedToken.__table__,
+        ])
     else:
         # For other databases, create tables if needed
         Base.metadata.create_all(bind=engine)
 
+    # Bring existing databases up to date (composite indexes etc.)
+    from .migrations import run_migrations
+    run_migrations(engine)
+
 
 def verify_db_connection() -> bool:
     """
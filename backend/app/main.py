@@ -7,6 +7,7 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
+import asyncio
 import os
 from dotenv import load_dotenv
 from starlette.routing import Mount
@@ -15,9 +16,12 @@ from .routes import router
 from .routes_auth import router as auth_router
 from .routes_games import router as games_router
 from .routes_websocket import router as websocket_router
-from .websocket import get_socket_app
-from .websocket import get_socket_app
-from .database import init_db, verify_db_connection
+from .websocket import get_socket_app, scoreboard_broadcaster
+from .services_pubsub import pubsub, presence
+from .database import init_db, verify_db_connection, DB_QUERY_STATS, async_engine
+from .middlewares import QueryStatsMiddleware, RateLimitMiddleware
+from .security import PasswordHashOverloaded, password_hasher
+from .services_token_revocation import token_revocations
 
 # Load environment variables
 load_dotenv()
@@ -29,6 +33,10 @@ app = FastAPI(
     version="0.1.0",
 )
 
+# Throttle login / user search per client; added before CORS so CORS wraps it
+# and 429 responses still carry the CORS headers
+app.add_middleware(RateLimitMiddleware)
+
 # Add CORS middleware FIRST - must be before routes
 cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:5173,http://localhost:8081,http://localhost:8000,http://127.0.0.1:8081,http://127.0.0.1:8000,http://172.20.10.8:8000").split(",")
 # Clean up whitespace
@@ -41,9 +49,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
     allow_headers=["*"],
+    expose_headers=["X-DB-Queries", "X-DB-Time-ms"],
     max_age=3600,
 )
 
+# Per-request SQL query count / DB time headers and N+1 warnings
+if DB_QUERY_STATS:
+    app.add_middleware(QueryStatsMiddleware)
+
 # Initialize database
 try:
     init_db()
@@ -72,6 +85,14 @@ app.routes.append(socket_app)
 @app.on_event("startup")
 async def startup_event():
     """Run on application startup"""
+    scoreboard_broadcaster.bind_loop(asyncio.get_running_loop())
+    # Before the first request; until it succeeds, every token check goes to the database
+    try:
+        token_revocations.rebuild()
+    except Exception as e:
+        print(f"⚠️  Token revocation list not loaded: {e}")
+    await pubsub.start()
+    await presence.start()
     print("🚀 Scoring Basket starting...")
     print(f"✅ Database: {os.getenv('DATABASE_URL')}")
     print("✅ API ready at /docs")
@@ -81,6 +102,11 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Run on application shutdown"""
+    await presence.stop()
+    await pubsub.stop()
+    password_hasher.shutdown()
+    # Pooled aiosqlite connections each hold a non-daemon thread that blocks exit
+    await async_engine.dispose()
     print("🛑 Scoring Basket shutting down...")
 
 
@@ -98,6 +124,15 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         }
     )
 
+@app.exception_handler(PasswordHashOverloaded)
+async def password_hash_overloaded_handler(request, exc):
+    """Refuse logins quickly while the password hashing pool is saturated"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"}
+    )
+
 @app.exception_handler(ValueError)
 async def value_error_handler(request, exc):
     """Handle ValueError exceptions"""
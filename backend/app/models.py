@@ -3,7 +3,7 @@ SQLAlchemy ORM Models for Scoring Basket
 Maps to SQLite database tables
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, Boolean, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, Boolean, Enum, UniqueConstraint, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -54,6 +54,21 @@ class User(Base):
         return f"<User(id={self.id}, username='{self.username}', email='{self.email}')>"
 
 
+class RevokedToken(Base):
+    """RevokedToken model - one revoked access token (jti), or every token of a user issued up to not_before"""
+    __tablename__ = "revoked_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    jti = Column(String(64), unique=True, nullable=True, index=True)  # NULL for a user-wide revocation
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    not_before = Column(Integer, nullable=True)  # user-wide: tokens with iat <= this (epoch seconds) are revoked
+    expires_at = Column(DateTime, nullable=False, index=True)  # row can be purged once every covered token has expired
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<RevokedToken(user_id={self.user_id}, jti={self.jti}, not_before={self.not_before})>"
+
+
 class UserProfile(Base):
     """UserProfile model - extended user information"""
     __tablename__ = "user_profiles"
@@ -84,6 +99,12 @@ class UserProfile(Base):
 class UserStats(Base):
     """UserStats model - aggregated player statistics"""
     __tablename__ = "user_stats"
+    __table_args__ = (
+        # League-wide leaderboards: ORDER BY total DESC LIMIT k walks these
+        Index("ix_user_stats_total_points_user", "total_points", "user_id"),
+        Index("ix_user_stats_total_assists_user", "total_assists", "user_id"),
+        Index("ix_user_stats_total_rebounds_user", "total_rebounds", "user_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
@@ -91,6 +112,10 @@ class UserStats(Base):
     total_points = Column(Integer, default=0, nullable=False)
     total_assists = Column(Integer, default=0, nullable=False)
     total_rebounds = Column(Integer, default=0, nullable=False)
+    total_fouls = Column(Integer, default=0, server_default="0", nullable=False)
+    total_violations = Column(Integer, default=0, server_default="0", nullable=False)
+    total_shots_made = Column(Integer, default=0, server_default="0", nullable=False)
+    total_shots_attempted = Column(Integer, default=0, server_default="0", nullable=False)
     matches_won = Column(Integer, default=0, nullable=False)
     matches_lost = Column(Integer, default=0, nullable=False)
     win_rate = Column(Float, default=0.0, nullable=False)
@@ -141,6 +166,9 @@ class Team(Base):
 class TeamMember(Base):
     """TeamMember model - represents team membership and roles"""
     __tablename__ = "team_members"
+    __table_args__ = (
+        Index("ix_team_members_team_captain_status", "team_id", "is_captain", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -210,6 +238,10 @@ class Player(Base):
 class Game(Base):
     """Game model - represents a basketball game"""
     __tablename__ = "games"
+    __table_args__ = (
+        Index("ix_games_status_match_date", "status", "match_date"),
+        Index("ix_games_status_created_at", "status", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=True)
@@ -245,6 +277,13 @@ class Game(Base):
 class GameEvent(Base):
     """GameEvent model - represents a scoring event in a game"""
     __tablename__ = "game_events"
+    __table_args__ = (
+        Index("ix_game_events_game_created_at", "game_id", "created_at"),
+        Index("ix_game_events_game_timestamp", "game_id", "timestamp"),
+        Index("ix_game_events_game_event_type", "game_id", "event_type"),
+        Index("ix_game_events_game_user_event_type", "game_id", "user_id", "event_type"),
+        Index("ix_game_events_game_team_event_type", "game_id", "team_id", "event_type"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     game_id = Column(Integer, ForeignKey("games.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -377,13 +416,8 @@ class TournamentBracket(Base):
 # PLAYER GAME STATISTICS MODEL
 # ============================================================================
 
-class PlayerGameStats(Base):
-    """PlayerGameStats model - stores stats for a player in a specific game"""
-    __tablename__ = "player_game_stats"
-
-    id = Column(Integer, primary_key=True, index=True)
-    player_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
-    game_id = Column(Integer, ForeignKey("games.id", ondelete="CASCADE"), nullable=False, index=True)
+class PlayerStatCountersMixin:
+    """Box score counter columns shared by per-game player stat tables"""
     points = Column(Integer, default=0, nullable=False)  # Total points
     assists = Column(Integer, default=0, nullable=False)
     rebounds = Column(Integer, default=0, nullable=False)
@@ -397,6 +431,18 @@ class PlayerGameStats(Base):
     three_pointers_attempted = Column(Integer, default=0, nullable=False)
     free_throws_made = Column(Integer, default=0, nullable=False)
     free_throws_attempted = Column(Integer, default=0, nullable=False)
+
+
+class PlayerGameStats(PlayerStatCountersMixin, Base):
+    """PlayerGameStats model - stores stats for a player in a specific game"""
+    __tablename__ = "player_game_stats"
+    __table_args__ = (
+        Index("uq_player_game_stats_player_game", "player_id", "game_id", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    player_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    game_id = Column(Integer, ForeignKey("games.id", ondelete="CASCADE"), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
@@ -408,6 +454,101 @@ class PlayerGameStats(Base):
         return f"<PlayerGameStats(player_id={self.player_id}, game_id={self.game_id}, points={self.points})>"
 
 
+class LivePlayerGameStats(PlayerStatCountersMixin, Base):
+    """LivePlayerGameStats model - running box score line, updated on every event insert/undo"""
+    __tablename__ = "live_player_game_stats"
+    __table_args__ = (
+        UniqueConstraint("game_id", "user_id", name="uq_live_player_game_stats_game_user"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    game_id = Column(Integer, ForeignKey("games.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<LivePlayerGameStats(game_id={self.game_id}, user_id={self.user_id}, points={self.points})>"
+
+
+class LiveTeamGameStats(Base):
+    """LiveTeamGameStats model - running team totals, updated on every event insert/undo"""
+    __tablename__ = "live_team_game_stats"
+    __table_args__ = (
+        UniqueConstraint("game_id", "team_id", name="uq_live_team_game_stats_game_team"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    game_id = Column(Integer, ForeignKey("games.id", ondelete="CASCADE"), nullable=False, index=True)
+    team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False, index=True)
+    points = Column(Integer, default=0, nullable=False)
+    fouls = Column(Integer, default=0, nullable=False)
+    timeouts = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<LiveTeamGameStats(game_id={self.game_id}, team_id={self.team_id}, points={self.points})>"
+
+
+class GameResult(Base):
+    """GameResult model - the completed result each standings row was built from, one per game"""
+    __tablename__ = "game_results"
+
+    id = Column(Integer, primary_key=True, index=True)
+    game_id = Column(Integer, ForeignKey("games.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
+    tournament_id = Column(Integer, ForeignKey("tournaments.id", ondelete="SET NULL"), nullable=True, index=True)
+    home_team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False, index=True)
+    away_team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False, index=True)
+    home_score = Column(Integer, default=0, nullable=False)
+    away_score = Column(Integer, default=0, nullable=False)
+    completed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<GameResult(game_id={self.game_id}, {self.home_score}-{self.away_score})>"
+
+
+class TeamStanding(Base):
+    """TeamStanding model - materialized wins/losses/streak per team, updated when games complete"""
+    __tablename__ = "team_standings"
+
+    id = Column(Integer, primary_key=True, index=True)
+    team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
+    wins = Column(Integer, default=0, nullable=False)
+    losses = Column(Integer, default=0, nullable=False)
+    ties = Column(Integer, default=0, nullable=False)
+    streak = Column(Integer, default=0, nullable=False)  # +N = won last N, -N = lost last N, 0 = tie/none
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<TeamStanding(team_id={self.team_id}, wins={self.wins}, losses={self.losses})>"
+
+
+class PlayerScopeStats(Base):
+    """PlayerScopeStats model - a player's totals within a tournament or team, for leaderboards"""
+    __tablename__ = "player_scope_stats"
+    __table_args__ = (
+        UniqueConstraint("scope", "scope_id", "player_id", name="uq_player_scope_stats_scope_player"),
+        Index("ix_player_scope_stats_scope_points", "scope", "scope_id", "points"),
+        Index("ix_player_scope_stats_scope_assists", "scope", "scope_id", "assists"),
+        Index("ix_player_scope_stats_scope_rebounds", "scope", "scope_id", "rebounds"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    scope = Column(String(20), nullable=False)  # tournament, team
+    scope_id = Column(Integer, nullable=False)  # tournament_id or team_id
+    player_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    games = Column(Integer, default=0, nullable=False)
+    points = Column(Integer, default=0, nullable=False)
+    assists = Column(Integer, default=0, nullable=False)
+    rebounds = Column(Integer, default=0, nullable=False)
+    shots_made = Column(Integer, default=0, nullable=False)
+    shots_attempted = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<PlayerScopeStats({self.scope}={self.scope_id}, player_id={self.player_id}, points={self.points})>"
+
+
 # ============================================================================
 # ANALYTICS & STATISTICS MODELS (Phase 5) - Moved to models_analytics.py
 # ============================================================================
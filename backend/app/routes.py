@@ -20,11 +20,12 @@ from .schemas import (
     ScoreboardResponse, BoxScoreResponse, TeamScore, PlayerStats,
 )
 from .services import (
-    StatsCalculationService,
+    LiveBoxScoreService,
     GameStateService,
     EventValidationService,
     RepositoryService,
 )
+from .services_live import live_game_registry, snapshot_event
 
 router = APIRouter(prefix="/api")
 
@@ -308,14 +309,17 @@ async def record_event(game_id: int, event: GameEventCreate, db = Depends(get_db
         outcome=event.outcome
     )
     db.add(new_event)
+    db.flush()
+    LiveBoxScoreService.record_event(new_event, db)
     db.commit()
     db.refresh(new_event)
+    live_game_registry.apply_event(new_event, db)
     
     # Broadcast event and scoreboard update
     try:
-        from .websocket import broadcast_event_created, broadcast_scoreboard_update
+        from .websocket import broadcast_event_created, schedule_scoreboard_update
         asyncio.create_task(broadcast_event_created(game_id, new_event.id))
-        asyncio.create_task(broadcast_scoreboard_update(game_id))
+        schedule_scoreboard_update(game_id)
     except:
         pass  # WebSocket not available
     
@@ -332,14 +336,18 @@ async def undo_event(game_id: int, event_id: int, db = Depends(get_db)):
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
+    undone_event = snapshot_event(event)
     db.delete(event)
+    db.flush()
+    LiveBoxScoreService.record_event(event, db, direction=-1)
     db.commit()
+    live_game_registry.revert_event(undone_event)
     
     # Broadcast event deletion and scoreboard update
     try:
-        from .websocket import broadcast_event_deleted, broadcast_scoreboard_update
+        from .websocket import broadcast_event_deleted, schedule_scoreboard_update
         asyncio.create_task(broadcast_event_deleted(game_id, event_id))
-        asyncio.create_task(broadcast_scoreboard_update(game_id))
+        schedule_scoreboard_update(game_id)
     except:
         pass  # WebSocket not available
 
@@ -354,8 +362,9 @@ def get_scoreboard(game_id: int, db = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Game not found")
     
     # Get team stats
-    home_stats = StatsCalculationService.get_team_stats(game_id, game.home_team_id, db)
-    away_stats = StatsCalculationService.get_team_stats(game_id, game.away_team_id, db)
+    box_score = LiveBoxScoreService.get_box_score(game, db)
+    home_stats = box_score[game.home_team_id]
+    away_stats = box_score[game.away_team_id]
     
     # Get latest event
     latest_event = RepositoryService.get_latest_game_event(game_id, db)
@@ -384,8 +393,9 @@ def get_boxscore(game_id: int, db = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Game not found")
     
     # Get team stats
-    home_stats = StatsCalculationService.get_team_stats(game_id, game.home_team_id, db)
-    away_stats = StatsCalculationService.get_team_stats(game_id, game.away_team_id, db)
+    box_score = LiveBoxScoreService.get_box_score(game, db)
+    home_stats = box_score[game.home_team_id]
+    away_stats = box_score[game.away_team_id]
     
     # Count events
     event_count = db.query(GameEvent).filter(GameEvent.game_id == game_id).count()
@@ -674,8 +684,11 @@ def record_event(game_id: int, event: GameEventCreate, db = Depends(get_db)):
         outcome=event.outcome
     )
     db.add(new_event)
+    db.flush()
+    LiveBoxScoreService.record_event(new_event, db)
     db.commit()
     db.refresh(new_event)
+    live_game_registry.apply_event(new_event, db)
     return new_event
 
 
@@ -689,8 +702,12 @@ def undo_event(game_id: int, event_id: int, db = Depends(get_db)):
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
+    undone_event = snapshot_event(event)
     db.delete(event)
+    db.flush()
+    LiveBoxScoreService.record_event(event, db, direction=-1)
     db.commit()
+    live_game_registry.revert_event(undone_event)
 
 
 # ==================== SCOREBOARD ENDPOINTS ====================
@@ -703,8 +720,9 @@ def get_scoreboard(game_id: int, db = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Game not found")
     
     # Get team stats
-    home_stats = StatsCalculationService.get_team_stats(game_id, game.home_team_id, db)
-    away_stats = StatsCalculationService.get_team_stats(game_id, game.away_team_id, db)
+    box_score = LiveBoxScoreService.get_box_score(game, db)
+    home_stats = box_score[game.home_team_id]
+    away_stats = box_score[game.away_team_id]
     
     # Get latest event
     latest_event = RepositoryService.get_latest_game_event(game_id, db)
@@ -733,8 +751,9 @@ def get_boxscore(game_id: int, db = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Game not found")
     
     # Get team stats
-    home_stats = StatsCalculationService.get_team_stats(game_id, game.home_team_id, db)
-    away_stats = StatsCalculationService.get_team_stats(game_id, game.away_team_id, db)
+    box_score = LiveBoxScoreService.get_box_score(game, db)
+    home_stats = box_score[game.home_team_id]
+    away_stats = box_score[game.away_team_id]
     
     # Count events
     event_count = db.query(GameEvent).filter(GameEvent.game_id == game_id).count()
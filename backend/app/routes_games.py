@@ -5,19 +5,24 @@ Handles: teams, games, events, tournaments, brackets
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime
 
-from .database import get_db_session
-from .models import User, Team, TeamMember, TeamLeadershipHistory, Game, Tournament
+from .database import get_db_session, get_async_db_session
+from .models import User, Team, TeamMember, TeamLeadershipHistory, Game, GameEvent, Tournament
 from .routes_auth import get_current_user
+from .services import EventValidationService
 from .services_games import GameService
+from .services_leaderboards import LeaderboardService
 from .schemas_games import (
     TeamCreate, TeamUpdate, TeamResponse, TeamDetailsResponse, PlayerResponse,
     TeamMemberInvite, TeamMemberUpdateRole, TeamMemberResponse, TeamLeadershipHistoryResponse, TeamWithMembersResponse,
     GameCreate, GameUpdate, GameResponse, GameEventCreate, GameEventResponse,
     GameDetailsResponse, PlayerStatsResponse, PlayerGameStatsResponse, UserStatsResponse, FinalizeGameResponse,
-    PlayerStatsSummaryResponse, TournamentCreate, TournamentUpdate, TournamentResponse, BracketResponse
+    PlayerStatsSummaryResponse, TournamentCreate, TournamentUpdate, TournamentResponse, BracketResponse,
+    LeaderboardResponse
 )
 
 router = APIRouter(prefix="/api/games", tags=["games"])
@@ -117,47 +122,8 @@ def get_teams(
     db: Session = Depends(get_db_session)
 ):
     """Get all teams in the system"""
-    from .models import Player, TeamMember
-    
-    # Get all teams regardless of user membership
-    teams = db.query(Team).all()
-    
-    teams_list = []
-    for team in teams:
-        # Get captain info
-        captain_member = db.query(TeamMember).filter(
-            TeamMember.team_id == team.id,
-            TeamMember.is_captain == True,
-            TeamMember.status == "active"
-        ).first()
-        
-        captain = None
-        if captain_member:
-            captain_user = db.query(User).filter(User.id == captain_member.user_id).first()
-            if captain_user:
-                captain = {
-                    "id": captain_user.id,
-                    "name": f"{captain_user.first_name} {captain_user.last_name}".strip() or captain_user.username
-                }
-        
-        # Count players
-        player_count = db.query(Player).filter(Player.team_id == team.id).count()
-        
-        teams_list.append({
-            "id": team.id,
-            "name": team.name,
-            "description": team.description,
-            "owner_id": team.owner_id,
-            "city": team.city,
-            "wins": 0,  # TODO: Calculate from match results
-            "losses": 0,  # TODO: Calculate from match results
-            "created_at": team.created_at.isoformat(),
-            "is_admin": False,
-            "captain": captain,
-            "player_count": player_count
-        })
-    
-    return teams_list
+    service = GameService(db)
+    return service.get_all_teams()
 
 
 @router.get("/teams/{team_id}", response_model=TeamResponse)
@@ -181,65 +147,11 @@ def get_my_teams(
     db: Session = Depends(get_db_session)
 ):
     """Get teams where current user is owner or member"""
-    from .models import TeamMember, Player
-    
     service = GameService(db)
     
-    # Get teams where user is owner (automatically admin)
+    # Teams where user is owner (automatically admin), then teams where user is a member
     owned_teams = service.get_user_teams(current_user.id)
-    # Add is_admin flag to owned teams
-    for team in owned_teams:
-        team["is_admin"] = True
-    
-    # Get teams where user is a member (but not owner)
-    member_teams = db.query(Team).join(TeamMember).filter(
-        TeamMember.user_id == current_user.id,
-        TeamMember.status == "active",
-        Team.owner_id != current_user.id  # Exclude teams they own
-    ).all()
-    
-    # Convert member teams to dict format with stats and admin status
-    member_teams_dict = []
-    for team in member_teams:
-        # Check if user is admin in this team
-        membership = db.query(TeamMember).filter(
-            TeamMember.team_id == team.id,
-            TeamMember.user_id == current_user.id
-        ).first()
-        is_admin = membership.is_admin if membership else False
-        
-        # Get captain info
-        captain_member = db.query(TeamMember).filter(
-            TeamMember.team_id == team.id,
-            TeamMember.is_captain == True,
-            TeamMember.status == "active"
-        ).first()
-        
-        captain = None
-        if captain_member:
-            captain_user = db.query(User).filter(User.id == captain_member.user_id).first()
-            if captain_user:
-                captain = {
-                    "id": captain_user.id,
-                    "name": f"{captain_user.first_name} {captain_user.last_name}".strip() or captain_user.username
-                }
-        
-        # Count players
-        player_count = db.query(Player).filter(Player.team_id == team.id).count()
-        
-        member_teams_dict.append({
-            "id": team.id,
-            "name": team.name,
-            "description": team.description,
-            "owner_id": team.owner_id,
-            "city": team.city,
-            "wins": 0,  # TODO: Calculate from match results
-            "losses": 0,  # TODO: Calculate from match results
-            "created_at": team.created_at.isoformat(),
-            "is_admin": is_admin,
-            "captain": captain,
-            "player_count": player_count
-        })
+    member_teams_dict = service.get_member_teams(current_user.id)
     
     # Combine and return
     all_teams = owned_teams + member_teams_dict
@@ -771,14 +683,17 @@ def get_team_with_members(
             "joined_at": member.joined_at
         })
     
+    record = service.get_team_records([team.id])[team.id]
+    
     return {
         "id": team.id,
         "name": team.name,
         "description": team.description,
         "owner_id": team.owner_id,
         "city": team.city,
-        "wins": 0,  # TODO: Calculate from games
-        "losses": 0,  # TODO: Calculate from games
+        "wins": record["wins"],
+        "losses": record["losses"],
+        "streak": record["streak"],
         "members": member_list,
         "created_at": team.created_at
     }
@@ -885,13 +800,12 @@ def get_games(
 
 
 @router.get("/games/{game_id}", response_model=GameDetailsResponse)
-def get_game(
+async def get_game(
     game_id: int,
-    db: Session = Depends(get_db_session)
+    db: AsyncSession = Depends(get_async_db_session)
 ):
     """Get game details with full information"""
-    service = GameService(db)
-    game = service.get_match_with_details(game_id)
+    game = await db.run_sync(lambda session: GameService(session).get_match_with_details(game_id))
     
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
@@ -999,10 +913,23 @@ def add_game_event(
 ):
     """Record a game event (goal, foul, etc.)"""
     service = GameService(db)
-    game = service.get_match(game_id)
-    
-    if not game:
-        raise HTTPException(status_code=404, detail="Game not found")
+
+    # Validated against the game's cached live state
+    is_valid, error_msg = EventValidationService.validate_event(
+        game_id=game_id,
+        player_id=event_data.user_id,
+        team_id=event_data.team_id,
+        event_type=event_data.event_type,
+        period=event_data.period,
+        db=db
+    )
+    if is_valid:
+        is_valid, error_msg = EventValidationService.validate_shot_outcome(
+            event_data.event_type,
+            event_data.outcome
+        )
+    if not is_valid:
+        raise HTTPException(status_code=404 if error_msg == "Game not found" else 400, detail=error_msg)
     
     event = service.add_match_event(
         match_id=game_id,
@@ -1013,23 +940,28 @@ def add_game_event(
         period=event_data.period,
         outcome=event_data.outcome
     )
+
+    # Push the new scoreboard to spectators (coalesced per game)
+    from .websocket import schedule_scoreboard_update
+    schedule_scoreboard_update(game_id)
     return event
 
 
 @router.get("/games/{game_id}/events", response_model=List[GameEventResponse])
-def get_game_events(
+async def get_game_events(
     game_id: int,
-    db: Session = Depends(get_db_session)
+    db: AsyncSession = Depends(get_async_db_session)
 ):
     """Get all events from a game"""
-    service = GameService(db)
-    game = service.get_match(game_id)
+    game = await db.get(Game, game_id)
     
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
     
-    events = service.get_match_events(game_id)
-    return events
+    result = await db.execute(
+        select(GameEvent).filter(GameEvent.game_id == game_id).order_by(GameEvent.timestamp)
+    )
+    return result.scalars().all()
 
 
 @router.post("/games/{game_id}/score")
@@ -1182,6 +1114,50 @@ def get_user_game_stats(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ============================================================================
+# LEADERBOARD ENDPOINTS
+# ============================================================================
+
+def _leaderboard(stat: str, scope: str, scope_id: Optional[int], limit: int, db: Session):
+    """Serve a leaderboard, mapping an unknown stat to 400"""
+    try:
+        return LeaderboardService.get_leaderboard(stat, scope, scope_id, limit, db)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/leaderboards/{stat}", response_model=LeaderboardResponse)
+def get_league_leaderboard(
+    stat: str,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db_session)
+):
+    """Top players league-wide by points, assists, rebounds or shooting"""
+    return _leaderboard(stat, "league", None, limit, db)
+
+
+@router.get("/leaderboards/{stat}/tournaments/{tournament_id}", response_model=LeaderboardResponse)
+def get_tournament_leaderboard(
+    stat: str,
+    tournament_id: int,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db_session)
+):
+    """Top players within a tournament"""
+    return _leaderboard(stat, "tournament", tournament_id, limit, db)
+
+
+@router.get("/leaderboards/{stat}/teams/{team_id}", response_model=LeaderboardResponse)
+def get_team_leaderboard(
+    stat: str,
+    team_id: int,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db_session)
+):
+    """Top players for a team, counting only games played for it"""
+    return _leaderboard(stat, "team", team_id, limit, db)
+
+
 # ============================================================================
 # TOURNAMENT ENDPOINTS
 # ============================================================================
@@ -9,11 +9,12 @@ from sqlalchemy.orm import Session
 import logging
 from typing import Optional
 
-from .database import get_db_session
-from .security import get_current_user_from_token
+from sqlalchemy.ext.asyncio import AsyncSession
+from .database import get_async_db_session, get_async_db_context
+from .security import get_current_user_from_token_async
 from .routes_auth import get_current_user
 from .models import User, Game
-from .services_realtime import realtime_service, EventType, RealtimeEvent
+from .services_realtime import realtime_service, EventType, RealtimeEvent, WS_SEND_QUEUE_SIZE
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["websocket"])
@@ -24,13 +25,18 @@ async def websocket_match_endpoint(
     websocket: WebSocket,
     match_id: int,
     token: Optional[str] = Query(None),
-    db = Depends(get_db_session)
+    resume_from: Optional[int] = Query(None),
+    stream: Optional[str] = Query(None)
 ):
     """
     WebSocket endpoint for real-time match updates
     
     Query parameters:
     - token: JWT authentication token
+    - resume_from: last event seq received before reconnecting; the events
+      after it are replayed, or the room state is sent if they are gone
+    - stream: the room stream the seq belongs to (from connection_established);
+      required for a replay, since seqs are per worker and per room lifetime
     
     Events broadcast:
     - match_started: Game has started
@@ -40,7 +46,7 @@ async def websocket_match_endpoint(
     - match_paused: Game paused
     - match_resumed: Game resumed
     - match_ended: Game finished
-    - message: Chat message from spectator
+    - chat: Chat message from spectator, as {"type": "chat", "data": <message event>, "seq"}
     """
     
     # Authenticate user
@@ -48,72 +54,80 @@ async def websocket_match_endpoint(
         await websocket.close(code=1008, reason="Authentication token required")
         return
     
-    try:
-        user = get_current_user_from_token(token, db)
-        if not user:
-            await websocket.close(code=1008, reason="Invalid authentication token")
+    # Short-lived async session, so a DB connection isn't held for the socket's lifetime
+    async with get_async_db_context() as db:
+        try:
+            user = await get_current_user_from_token_async(token, db)
+            if not user:
+                await websocket.close(code=1008, reason="Invalid authentication token")
+                return
+        except Exception as e:
+            logger.error(f"WebSocket auth error: {str(e)}")
+            await websocket.close(code=1008, reason="Authentication failed")
+            return
+        
+        # Verify match exists
+        match = await db.get(Game, match_id)
+        if not match:
+            await websocket.close(code=1008, reason="Game not found")
             return
-    except Exception as e:
-        logger.error(f"WebSocket auth error: {str(e)}")
-        await websocket.close(code=1008, reason="Authentication failed")
-        return
-    
-    # Verify match exists
-    match = db.query(Game).filter(Game.id == match_id).first()
-    if not match:
-        await websocket.close(code=1008, reason="Game not found")
-        return
     
     # Accept connection
     await websocket.accept()
     connection_id = f"{user.id}_{match_id}_{id(websocket)}"
     
-    # Register connection
-    room = realtime_service.connection_manager.add_connection(
+    # Register connection; every write to this socket goes through its send queue
+    connections = realtime_service.connection_manager
+    room = connections.add_connection(
         connection_id=connection_id,
-        match_id=match_id,
+        game_id=match_id,
         user_id=user.id,
-        username=user.username
+        username=user.username,
+        websocket=websocket
     )
     
     logger.info(f"User {user.username} connected to match {match_id} room")
     
+    # Events missed since resume_from; None when a full room state is needed instead.
+    # A seq is only meaningful on the stream that issued it, so one without a
+    # stream (or from another worker or room lifetime) gets the room state
+    missed = None
+    if resume_from is not None and stream is not None and stream == room.stream:
+        missed = room.events_since(resume_from)
+        if missed is not None and len(missed) >= WS_SEND_QUEUE_SIZE:
+            missed = None
+    
     # Send initial state
-    try:
-        await websocket.send_json({
-            "type": "connection_established",
-            "connection_id": connection_id,
-            "match_id": match_id,
-            "user_id": user.id,
-            "username": user.username,
-            "spectators": room.get_spectator_count(),
-            "room_state": room.get_state()
-        })
-    except Exception as e:
-        logger.error(f"Error sending initial state: {str(e)}")
-        realtime_service.connection_manager.remove_connection(connection_id)
-        return
+    established = {
+        "type": "connection_established",
+        "connection_id": connection_id,
+        "match_id": match_id,
+        "user_id": user.id,
+        "username": user.username,
+        "spectators": realtime_service.get_spectator_count(match_id),
+        "seq": room.seq,
+        "stream": room.stream,
+        "resumed": missed is not None
+    }
+    if missed is None:
+        established["room_state"] = room.get_state()
+    connections.send_to_connection(connection_id, established)
+    for text in missed or ():
+        connections.send_text_to_connection(connection_id, text)
     
     # Broadcast spectator joined
     join_event = RealtimeEvent(
         event_type=EventType.SPECTATOR_JOINED,
-        match_id=match_id,
+        game_id=match_id,
         user_id=user.id,
         data={
             "username": user.username,
             "user_id": user.id,
-            "spectators_count": room.get_spectator_count()
+            "spectators_count": realtime_service.get_spectator_count(match_id)
         }
     )
     
-    connections = realtime_service.connection_manager.get_connections_for_match(match_id)
-    for conn_id in connections:
-        if conn_id != connection_id:
-            try:
-                # This would need to store websocket refs for actual broadcast
-                pass
-            except Exception as e:
-                logger.error(f"Error broadcasting join event: {str(e)}")
+    connections.send_to_match(match_id, join_event.to_dict(), exclude=connection_id)
     
     # Message handling loop
     try:
@@ -124,41 +138,35 @@ async def websocket_match_endpoint(
             
             if message_type == "ping":
                 # Simple heartbeat
-                await websocket.send_json({"type": "pong"})
+                connections.send_to_connection(connection_id, {"type": "pong"})
             
             elif message_type == "chat":
-                # Broadcast chat message
+                # Broadcast chat message to the room, sender included
                 message = data.get("message", "")
                 if message.strip():
-                    event = realtime_service.broadcast_chat(
-                        match_id=match_id,
+                    realtime_service.broadcast_chat(
+                        game_id=match_id,
                         user_id=user.id,
                         username=user.username,
                         message=message
                     )
-                    
-                    # Send to client
-                    await websocket.send_json({
-                        "type": "chat",
-                        "data": event.to_dict()
-                    })
             
             elif message_type == "get_state":
                 # Send current room state
-                room_state = realtime_service.connection_manager.get_room(match_id)
+                room_state = connections.get_room(match_id)
                 if room_state:
-                    await websocket.send_json({
+                    connections.send_to_connection(connection_id, {
                         "type": "room_state",
                         "data": room_state.get_state()
                     })
             
             elif message_type == "get_events":
                 # Send recent events
-                room_state = realtime_service.connection_manager.get_room(match_id)
+                room_state = connections.get_room(match_id)
                 if room_state:
-                    await websocket.send_json({
+                    connections.send_to_connection(connection_id, {
                         "type": "events",
-                        "data": [e.to_dict() for e in room_state.events_history]
+                        "data": room_state.recent_events()
                     })
             
             else:
@@ -172,17 +180,17 @@ async def websocket_match_endpoint(
     
     finally:
         # Remove connection
-        realtime_service.connection_manager.remove_connection(connection_id)
+        connections.remove_connection(connection_id)
         
         # Broadcast spectator left
         try:
-            room = realtime_service.connection_manager.get_room(match_id)
+            room = connections.get_room(match_id)
             if room:
-                spectators_count = room.get_spectator_count()
+                spectators_count = realtime_service.get_spectator_count(match_id)
                 
                 leave_event = RealtimeEvent(
                     event_type=EventType.SPECTATOR_LEFT,
-                    match_id=match_id,
+                    game_id=match_id,
                     user_id=user.id,
                     data={
                         "username": user.username,
@@ -190,6 +198,7 @@ async def websocket_match_endpoint(
                         "spectators_count": spectators_count
                     }
                 )
+                connections.send_to_match(match_id, leave_event.to_dict())
         except Exception as e:
             logger.error(f"Error on disconnect: {str(e)}")
 
@@ -197,12 +206,12 @@ async def websocket_match_endpoint(
 @router.get("/api/matches/{match_id}/spectators")
 async def get_match_spectators(
     match_id: int,
-    db = Depends(get_db_session),
+    db: AsyncSession = Depends(get_async_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Get spectator count for a match"""
     # Verify match exists
-    match = db.query(Game).filter(Game.id == match_id).first()
+    match = await db.get(Game, match_id)
     if not match:
         return {"error": "Game not found"}
     
@@ -218,7 +227,6 @@ async def get_match_spectators(
 
 @router.get("/api/active-matches")
 async def get_active_matches(
-    db = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Get all matches with active spectators"""
@@ -230,6 +238,22 @@ async def get_active_matches(
     }
 
 
+@router.get("/api/realtime/metrics")
+async def get_realtime_metrics(
+    current_user: User = Depends(get_current_user)
+):
+    """Broadcast counters for the realtime layer"""
+    from .websocket import scoreboard_broadcaster, scoreboard_patches
+    from .services_pubsub import pubsub
+
+    return {
+        "scoreboard": scoreboard_broadcaster.get_metrics(),
+        "scoreboard_patches": scoreboard_patches.metrics,
+        "match_connections": realtime_service.connection_manager.get_metrics(),
+        "pubsub": pubsub.get_metrics(),
+    }
+
+
 # Helper function to import in main.py
 def get_websocket_router():
     """Get WebSocket router"""
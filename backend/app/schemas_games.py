@@ -98,6 +98,7 @@ class TeamResponse(BaseModel):
     city: Optional[str]
     wins: int = 0
     losses: int = 0
+    streak: int = 0  # +N = won last N, -N = lost last N
     created_at: datetime
     captain: Optional[dict] = None  # { "id": int, "name": str }
     player_count: int = 0
@@ -113,6 +114,7 @@ class TeamResponse(BaseModel):
                 "city": "Los Angeles",
                 "wins": 15,
                 "losses": 5,
+                "streak": 3,
                 "created_at": "2025-12-26T10:30:00",
                 "captain": {"id": 2, "name": "John Doe"},
                 "player_count": 12
@@ -212,6 +214,7 @@ class TeamWithMembersResponse(BaseModel):
     city: Optional[str]
     wins: int
     losses: int
+    streak: int = 0
     members: List[TeamMemberResponse]
     created_at: datetime
 
@@ -646,6 +649,23 @@ class UserStatsResponse(BaseModel):
         from_attributes = True
 
 
+class LeaderboardEntryResponse(BaseModel):
+    """One ranked player on a leaderboard"""
+    rank: int
+    user_id: int
+    player_name: str
+    games: int
+    value: float  # stat total, or field goal percentage for shooting
+
+
+class LeaderboardResponse(BaseModel):
+    """Leaderboard for a stat within the league, a tournament or a team"""
+    stat: str
+    scope: str
+    scope_id: Optional[int] = None
+    entries: List[LeaderboardEntryResponse]
+
+
 class FinalizeGameResponse(BaseModel):
     """Finalize game response with player stats"""
     game_id: int
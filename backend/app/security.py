@@ -4,15 +4,24 @@ Handles JWT tokens, password hashing, and user verification
 """
 
 from passlib.context import CryptContext
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+import asyncio
+import hashlib
 import jwt
 import os
+import threading
+import time
+import uuid
 from dotenv import load_dotenv
 from pathlib import Path
 from fastapi import HTTPException, status, Header, Depends
 from sqlalchemy.orm import Session
 
+from .services_token_revocation import token_revocations
+
 # Load environment variables
 ENV_PATH = Path(__file__).parent.parent.parent / ".env"
 load_dotenv(ENV_PATH)
@@ -23,12 +32,22 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 
+# Verified token payloads kept so a client's repeat requests skip jwt.decode
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))
+
 # Password hashing
 pwd_context = CryptContext(
     schemes=["pbkdf2_sha256"],
     deprecated="auto"
 )
 
+# Hashing runs in its own pool so a burst of logins cannot starve the event
+# loop or the shared threadpool; "process" spreads it over several cores
+PASSWORD_HASH_EXECUTOR = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Hash jobs queued or running before new ones are refused
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+
 
 def hash_password(password: str) -> str:
     """Hash a password using pbkdf2-sha256"""
@@ -40,6 +59,92 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+class PasswordHashOverloaded(Exception):
+    """Too many password hash jobs are pending; answered with 503"""
+
+
+class PasswordHasher:
+    """
+    Bounded pool for hash_password/verify_password
+    At most max_pending jobs may be queued or running; past that a job is
+    refused at once with PasswordHashOverloaded instead of waiting in line
+    """
+
+    def __init__(self, kind: str = PASSWORD_HASH_EXECUTOR, workers: int = PASSWORD_HASH_WORKERS,
+                 max_pending: int = PASSWORD_HASH_MAX_PENDING):
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self.metrics = {"submitted": 0, "completed": 0, "rejected": 0, "max_pending_seen": 0}
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    def _submit(self, fn, *args):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.metrics["rejected"] += 1
+                raise PasswordHashOverloaded("Too many login attempts in progress, try again shortly")
+            self.pending += 1
+            self.metrics["submitted"] += 1
+            self.metrics["max_pending_seen"] = max(self.metrics["max_pending_seen"], self.pending)
+            executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args)
+        except Exception:
+            with self._lock:
+                self.pending -= 1
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future) -> None:
+        with self._lock:
+            self.pending -= 1
+            self.metrics["completed"] += 1
+
+    def hash(self, password: str) -> str:
+        """hash_password in the pool, from sync code"""
+        return self._submit(hash_password, password).result()
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """verify_password in the pool, from sync code"""
+        return self._submit(verify_password, plain_password, hashed_password).result()
+
+    async def hash_async(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(hash_password, password))
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(self._submit(verify_password, plain_password, hashed_password))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_metrics(self) -> dict:
+        return {
+            **self.metrics,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "workers": self.workers,
+            "executor": self.kind,
+        }
+
+
+# Global password hasher
+password_hasher = PasswordHasher()
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -48,7 +153,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
+    to_encode.setdefault("jti", uuid.uuid4().hex)
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -57,43 +163,130 @@ def create_refresh_token(data: dict) -> str:
     """Create a JWT refresh token"""
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow(), "type": "refresh"})
+    to_encode.setdefault("jti", uuid.uuid4().hex)
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+class VerifiedTokenCache:
+    """
+    Thread-safe LRU of verified JWT payloads keyed by token digest
+    An entry is only served until the token's exp, so a cached token expires
+    exactly when jwt.decode would start rejecting it
+    """
+
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.metrics = {"hits": 0, "misses": 0, "expired": 0}
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, digest: bytes) -> Optional[dict]:
+        with self._lock:
+            payload = self._entries.get(digest)
+            if payload is None:
+                self.metrics["misses"] += 1
+                return None
+            if payload["exp"] <= time.time():
+                del self._entries[digest]
+                self.metrics["expired"] += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.metrics["hits"] += 1
+            return dict(payload)
+
+    def put(self, digest: bytes, payload: dict) -> None:
+        if not isinstance(payload.get("exp"), (int, float)):
+            return
+        with self._lock:
+            self._entries[digest] = dict(payload)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_metrics(self) -> dict:
+        return {**self.metrics, "size": len(self._entries), "maxsize": self.maxsize}
+
+
+# Global verified token cache
+verified_token_cache = VerifiedTokenCache()
+
+
 def decode_token(token: str) -> Optional[dict]:
-    """Decode and verify a JWT token"""
+    """Decode and verify a JWT token; repeat tokens are served from the verified cache"""
+    digest = VerifiedTokenCache.digest(token)
+    payload = verified_token_cache.get(digest)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
+    verified_token_cache.put(digest, payload)
+    return payload
 
 
-def verify_access_token(token: str) -> Optional[int]:
-    """Verify token and return user_id if valid"""
+def _bearer_claims(token: str) -> Optional[Tuple[int, int, Optional[str]]]:
+    """(user_id, iat, jti) of a valid access token, before the revocation check"""
     payload = decode_token(token)
     if payload is None:
         return None
     
+    # Refresh tokens outlive logout by days; they are never valid as bearer tokens
+    if payload.get("type") == "refresh":
+        return None
+    
     user_id_str: str = payload.get("sub")
     if user_id_str is None:
         return None
     
     try:
-        return int(user_id_str)
-    except ValueError:
+        return int(user_id_str), int(payload.get("iat", 0)), payload.get("jti")
+    except (TypeError, ValueError):
+        return None
+
+
+def access_token_claims(token: str) -> Optional[Tuple[int, int]]:
+    """
+    Verify token and return (user_id, iat) if valid and not revoked; iat is 0
+    for tokens issued without one
+    """
+    claims = _bearer_claims(token)
+    # Bloom filter probe; only possible revocations reach the database
+    if claims is None or token_revocations.is_revoked(*claims):
+        return None
+    return claims[:2]
+
+
+async def access_token_claims_async(token: str) -> Optional[Tuple[int, int]]:
+    """access_token_claims for async callers; a revocation query runs off the event loop"""
+    claims = _bearer_claims(token)
+    if claims is None or await token_revocations.is_revoked_async(*claims):
         return None
+    return claims[:2]
+
+
+def verify_access_token(token: str) -> Optional[int]:
+    """Verify token and return user_id if valid"""
+    claims = access_token_claims(token)
+    return claims[0] if claims else None
 
 
 def get_current_user(authorization: Optional[str] = Header(None, alias="Authorization")):
     """FastAPI dependency to get current authenticated user from bearer token"""
     # Lazy import to avoid circular imports
-    from .database import SessionLocal
-    from .models import User
+    from .services_auth_cache import AuthResolver
     
     if not authorization:
         raise HTTPException(
@@ -115,33 +308,46 @@ def get_current_user(authorization: Optional[str] = Header(None, alias="Authoriz
         )
     
     # Verify token
-    user_id = verify_access_token(token)
-    if user_id is None:
+    claims = access_token_claims(token)
+    if claims is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Get db session
-    db = SessionLocal()
-    try:
-        # Get user from database
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        return user
-    finally:
-        db.close()
+    # Cached user; a DB session is only opened on a miss
+    user = AuthResolver.get_user(*claims)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return user
 
 def get_current_user_from_token(token: str, db: Session) -> Optional:
     """Get user from JWT token (for WebSocket authentication)"""
-    from .models import User
+    from .services_auth_cache import AuthResolver
+    
+    if not token:
+        return None
+    
+    # Remove "Bearer " prefix if present
+    if token.startswith("Bearer "):
+        token = token[7:]
+    
+    # Verify token
+    claims = access_token_claims(token)
+    if claims is None:
+        return None
+    
+    return AuthResolver.get_user(*claims, db=db)
+
+async def get_current_user_from_token_async(token: str, db) -> Optional:
+    """Get user from JWT token on an AsyncSession (for WebSocket authentication)"""
+    from .services_auth_cache import AuthResolver
     
     if not token:
         return None
@@ -151,10 +357,8 @@ def get_current_user_from_token(token: str, db: Session) -> Optional:
         token = token[7:]
     
     # Verify token
-    user_id = verify_access_token(token)
-    if user_id is None:
+    claims = await access_token_claims_async(token)
+    if claims is None:
         return None
     
-    # Get user from database
-    user = db.query(User).filter(User.id == user_id).first()
-    return user
\ No newline at end of file
+    return await AuthResolver.get_user_async(db, *claims)
@@ -0,0 +1,50 @@
+"""
+JSON encoding for realtime fan-out
+Room messages are encoded once and the same text is queued for every
+recipient; orjson is used when installed, the stdlib encoder otherwise
+"""
+
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional (pip install scoring-basket[realtime])
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Encode the non-JSON types realtime payloads carry"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> str:
+    """Compact JSON text; int dict keys become strings as with the stdlib encoder"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, default=_default, separators=(",", ":"))
+
+
+def loads(text: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+class SocketIOJSON:
+    """json module stand-in for python-socketio/engineio packet encoding"""
+
+    @staticmethod
+    def dumps(obj: Any, *args, **kwargs) -> str:
+        return dumps(obj)
+
+    @staticmethod
+    def loads(text: Any, *args, **kwargs) -> Any:
+        return loads(text)
+
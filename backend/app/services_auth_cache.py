@@ -0,0 +1,137 @@
+"""
+Authenticated User Cache
+Shared resolver behind the get_current_user dependencies: users are cached
+by (user id, token iat) for a short TTL so authenticated requests skip the
+user SELECT. Profile, password and status changes invalidate the user on
+every worker through the pub/sub bus
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+import os
+import threading
+import time
+
+from .models import User
+from .services_pubsub import pubsub
+
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "10000"))
+# Seconds a cached user is trusted; bounds staleness if an invalidation is missed
+AUTH_USER_CACHE_TTL = float(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+AUTH_USER_CHANNEL = "auth_user"
+
+# Columns kept for a cached user; the password hash never enters the cache
+CACHED_USER_COLUMNS = tuple(
+    column.key for column in User.__table__.columns if column.key != "password_hash"
+)
+
+CacheKey = Tuple[int, int]  # (user id, token iat)
+
+
+def snapshot_user(user: User) -> dict:
+    return {column: getattr(user, column) for column in CACHED_USER_COLUMNS}
+
+
+class AuthUserCache:
+    """
+    Thread-safe LRU of user column snapshots with a TTL
+    Hits return a new detached User built from the snapshot, so no ORM
+    instance is shared between requests or sessions
+    """
+
+    def __init__(self, maxsize: int = AUTH_USER_CACHE_SIZE, ttl: float = AUTH_USER_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[CacheKey, Tuple[float, dict]]" = OrderedDict()
+        self._keys_by_user: Dict[int, Set[CacheKey]] = {}
+        self._lock = threading.Lock()
+        self.metrics = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, user_id: int, iat: int) -> Optional[User]:
+        key = (user_id, iat)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.metrics["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.metrics["hits"] += 1
+        return User(**entry[1])
+
+    def put(self, user: User, iat: int) -> None:
+        key = (user.id, iat)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, snapshot_user(user))
+            self._entries.move_to_end(key)
+            self._keys_by_user.setdefault(user.id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.metrics["evictions"] += 1
+
+    def _remove(self, key: CacheKey) -> None:
+        self._entries.pop(key, None)
+        keys = self._keys_by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[key[0]]
+
+    def invalidate(self, user_id: int, publish: bool = True) -> None:
+        """Forget every cached token of a user, here and on the other workers"""
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(key)
+            self.metrics["invalidations"] += 1
+        if publish:
+            pubsub.publish(AUTH_USER_CHANNEL, {"user_id": user_id})
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def get_metrics(self) -> Dict[str, int]:
+        return {**self.metrics, "size": len(self._entries), "ttl_seconds": self.ttl}
+
+
+# Global auth user cache
+auth_user_cache = AuthUserCache()
+pubsub.subscribe(AUTH_USER_CHANNEL, lambda message: auth_user_cache.invalidate(message["user_id"], publish=False))
+
+
+class AuthResolver:
+    """Resolve verified token claims to a User, through the cache"""
+
+    @staticmethod
+    def get_user(user_id: int, iat: int, db: Optional[Session] = None) -> Optional[User]:
+        """Cached user; on a miss without a session, a short-lived one is opened"""
+        user = auth_user_cache.get(user_id, iat)
+        if user is not None:
+            return user
+        if db is None:
+            from .database import SessionLocal
+            with SessionLocal() as session:
+                return AuthResolver._load(session, user_id, iat)
+        return AuthResolver._load(db, user_id, iat)
+
+    @staticmethod
+    def _load(db: Session, user_id: int, iat: int) -> Optional[User]:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user:
+            auth_user_cache.put(user, iat)
+        return user
+
+    @staticmethod
+    async def get_user_async(db: AsyncSession, user_id: int, iat: int) -> Optional[User]:
+        """Cached user, loaded on the AsyncSession on a miss"""
+        user = auth_user_cache.get(user_id, iat)
+        if user is not None:
+            return user
+        user = await db.get(User, user_id)
+        if user:
+            auth_user_cache.put(user, iat)
+        return user
@@ -3,9 +3,10 @@ Game and Tournament Service Layer
 Handles all business logic for matches, teams, and tournaments
 """
 
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, and_, or_
+from sqlalchemy.orm import Session, joinedload, selectinload, aliased
+from sqlalchemy import desc, and_, or_, func, select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql, sqlite
 from datetime import datetime
 from typing import List, Optional, Dict
 import json
@@ -13,8 +14,14 @@ import json
 from .models import (
     Team, Player, Game, GameEvent, GamePlayer,
     Tournament, TournamentTeam, TournamentBracket, User,
-    TeamMember, TeamLeadershipHistory, PlayerGameStats
+    TeamMember, TeamLeadershipHistory, PlayerGameStats, TeamStanding
 )
+from .services import LiveBoxScoreService, STAT_COUNTER_FIELDS
+from .services_live import live_game_registry
+from .services_standings import StandingsService
+from .services_career_stats import CareerStatsService
+from .services_leaderboards import LeaderboardService, leaderboard_cache
+from .services_names import NameLoader, format_display_name
 
 
 class GameService:
@@ -22,6 +29,7 @@ class GameService:
 
     def __init__(self, db: Session):
         self.db = db
+        self.names = NameLoader(db)
 
     # ========================================================================
     # TEAM MANAGEMENT
@@ -104,115 +112,110 @@ class GameService:
 
     def get_team(self, team_id: int) -> Dict:
         """Get team details with calculated stats"""
-        from .models import TeamMember, User, Player
-        
-        team = self.db.query(Team).filter(Team.id == team_id).first()
-        if not team:
+        rows = self._team_listing_query().filter(Team.id == team_id).all()
+        if not rows:
             return None
-            
-        # Calculate wins and losses from completed matches
-        home_matches = self.db.query(Game).filter(
-            Game.home_team_id == team_id,
-            Game.status == "completed"
-        ).all()
-        
-        away_matches = self.db.query(Game).filter(
-            Game.away_team_id == team_id,
-            Game.status == "completed"
-        ).all()
-        
-        wins = 0
-        losses = 0
-        
-        # Calculate home wins/losses
-        for match in home_matches:
-            if match.home_score > match.away_score:
-                wins += 1
-            elif match.home_score < match.away_score:
-                losses += 1
-        
-        # Calculate away wins/losses
-        for match in away_matches:
-            if match.away_score > match.home_score:
-                wins += 1
-            elif match.away_score < match.home_score:
-                losses += 1
-        
-        # Get captain info
-        captain_member = self.db.query(TeamMember).filter(
-            TeamMember.team_id == team_id,
-            TeamMember.is_captain == True,
-            TeamMember.status == "active"
-        ).first()
-        
-        captain = None
-        if captain_member:
-            captain_user = self.db.query(User).filter(User.id == captain_member.user_id).first()
+
+        team = self._team_listing_rows(rows, is_admin=False)[0]
+        team.pop("is_admin")
+        return team
+
+    def get_team_records(self, team_ids: List[int]) -> Dict[int, Dict[str, int]]:
+        """Get {team_id: {"wins", "losses", "streak"}} for the given teams from the standings table"""
+        return StandingsService.get_standings(team_ids, self.db)
+
+    def _team_listing_query(self, *extra_columns):
+        """
+        One query for team listings: each team with its active captain's user,
+        player count and materialized standings row
+        """
+        captain_member = aliased(TeamMember)
+        captain_user = aliased(User)
+        player_counts = select(
+            Player.team_id,
+            func.count(Player.id).label("player_count"),
+        ).group_by(Player.team_id).subquery()
+
+        return self.db.query(
+            Team,
+            captain_user,
+            func.coalesce(player_counts.c.player_count, 0),
+            TeamStanding,
+            *extra_columns,
+        ).outerjoin(
+            captain_member,
+            and_(
+                captain_member.team_id == Team.id,
+                captain_member.is_captain == True,
+                captain_member.status == "active",
+            ),
+        ).outerjoin(
+            captain_user, captain_user.id == captain_member.user_id
+        ).outerjoin(
+            player_counts, player_counts.c.team_id == Team.id
+        ).outerjoin(
+            TeamStanding, TeamStanding.team_id == Team.id
+        ).order_by(Team.id)
+
+    @staticmethod
+    def _team_listing_rows(rows, is_admin=None) -> List[Dict]:
+        """
+        Convert _team_listing_query rows to team dicts
+        is_admin=None reads the flag from the row's extra column
+        """
+        result = []
+        seen = set()
+        for row in rows:
+            team, captain_user, player_count, standing = row[:4]
+            if team.id in seen:
+                continue  # more than one active captain; keep the first
+            seen.add(team.id)
+
+            captain = None
             if captain_user:
                 captain = {
                     "id": captain_user.id,
                     "name": f"{captain_user.first_name} {captain_user.last_name}".strip() or captain_user.username
                 }
-        
-        # Count players
-        player_count = self.db.query(Player).filter(Player.team_id == team_id).count()
-        
-        return {
-            "id": team.id,
-            "name": team.name,
-            "description": team.description,
-            "owner_id": team.owner_id,
-            "city": team.city,
-            "wins": wins,
-            "losses": losses,
-            "created_at": team.created_at.isoformat(),
-            "captain": captain,
-            "player_count": player_count
-        }
 
-    def get_user_teams(self, user_id: int) -> List[Dict]:
-        """Get all teams owned by a user with stats"""
-        from .models import TeamMember, User
-        
-        teams = self.db.query(Team).filter(Team.owner_id == user_id).all()
-        result = []
-        
-        for team in teams:
-            # Get captain info
-            captain_member = self.db.query(TeamMember).filter(
-                TeamMember.team_id == team.id,
-                TeamMember.is_captain == True,
-                TeamMember.status == "active"
-            ).first()
-            
-            captain = None
-            if captain_member:
-                captain_user = self.db.query(User).filter(User.id == captain_member.user_id).first()
-                if captain_user:
-                    captain = {
-                        "id": captain_user.id,
-                        "name": f"{captain_user.first_name} {captain_user.last_name}".strip() or captain_user.username
-                    }
-            
-            # Count players
-            player_count = self.db.query(Player).filter(Player.team_id == team.id).count()
-            
             result.append({
                 "id": team.id,
                 "name": team.name,
                 "description": team.description,
                 "owner_id": team.owner_id,
                 "city": team.city,
-                "wins": 0,  # TODO: Calculate from match results
-                "losses": 0,  # TODO: Calculate from match results
+                "wins": standing.wins if standing else 0,
+                "losses": standing.losses if standing else 0,
+                "streak": standing.streak if standing else 0,
                 "created_at": team.created_at.isoformat(),
-                "is_admin": True,  # Owner is always admin
+                "is_admin": bool(row[4]) if is_admin is None else is_admin,
                 "captain": captain,
                 "player_count": player_count
             })
-        
+
         return result
 
+    def get_all_teams(self) -> List[Dict]:
+        """Get all teams with captain, player count and record in one query"""
+        return self._team_listing_rows(self._team_listing_query().all(), is_admin=False)
+
+    def get_user_teams(self, user_id: int) -> List[Dict]:
+        """Get all teams owned by a user with stats"""
+        rows = self._team_listing_query().filter(Team.owner_id == user_id).all()
+        return self._team_listing_rows(rows, is_admin=True)  # Owner is always admin
+
+    def get_member_teams(self, user_id: int) -> List[Dict]:
+        """Get teams where the user is an active member but not the owner, with stats"""
+        membership = aliased(TeamMember)
+        rows = self._team_listing_query(membership.is_admin).join(
+            membership,
+            and_(membership.team_id == Team.id, membership.user_id == user_id),
+        ).filter(
+            membership.status == "active",
+            Team.owner_id != user_id,  # Exclude teams they own
+        ).all()
+        return self._team_listing_rows(rows)
+
     def add_player_to_team(self, team_id: int, user_id: int, jersey_number: int = None, position: str = None, status: str = "active") -> Player:
         """Add a player to a team"""
         try:
@@ -329,6 +332,8 @@ class GameService:
                     self.db.add(match_player)
             
             self.db.commit()
+            # Roster changed: drop any cached live/validation state for the game
+            live_game_registry.evict(match.id)
 
             return match
         except Exception as e:
@@ -351,10 +356,13 @@ class GameService:
                 match.match_date = match_date
             if status:
                 match.status = status
+                StandingsService.sync_game(match, self.db)
             match.updated_at = datetime.utcnow()
 
             self.db.commit()
             self.db.refresh(match)
+            if status:
+                live_game_registry.set_status(match_id, status)
             return match
         except Exception as e:
             self.db.rollback()
@@ -369,35 +377,39 @@ class GameService:
         game = self.db.query(Game).options(
             joinedload(Game.home_team),
             joinedload(Game.away_team),
-            joinedload(Game.game_players).joinedload(GamePlayer.user),
-            joinedload(Game.events)
+            selectinload(Game.game_players),
+            selectinload(Game.events)
         ).filter(Game.id == match_id).first()
 
         if not game:
             return None
 
+        records = self.get_team_records([game.home_team_id, game.away_team_id])
+
         # Structure the response to match GameDetailsResponse schema
         home_players = []
         away_players = []
 
+        self.names.load(player.user_id for player in game.game_players)
         for player in game.game_players:
+            user = self.names.fields(player.user_id)
             player_data = {
                 "id": player.id,
                 "game_id": player.game_id,
                 "user_id": player.user_id,
                 "team_id": player.team_id,
-                "name": player.user.username if player.user else "Unknown Player",
+                "name": format_display_name(user),
                 "jersey_number": player.jersey_number,
                 "position": player.position,
                 "is_starter": player.is_starter,
                 "minutes_played": player.minutes_played,
                 "created_at": player.created_at,
                 "user": {
-                    "id": player.user.id if player.user else None,
-                    "username": player.user.username if player.user else "Unknown",
-                    "first_name": player.user.first_name if player.user else "",
-                    "last_name": player.user.last_name if player.user else ""
-                } if player.user else None
+                    "id": player.user_id,
+                    "username": user[0],
+                    "first_name": user[1] or "",
+                    "last_name": user[2] or ""
+                } if user else None
             }
 
             if player.team_id == game.home_team_id:
@@ -422,8 +434,9 @@ class GameService:
                 "description": game.home_team.description,
                 "owner_id": game.home_team.owner_id,
                 "city": game.home_team.city,
-                "wins": 0,  # TODO: Calculate actual wins
-                "losses": 0,  # TODO: Calculate actual losses
+                "wins": records[game.home_team_id]["wins"],
+                "losses": records[game.home_team_id]["losses"],
+                "streak": records[game.home_team_id]["streak"],
                 "created_at": game.home_team.created_at
             } if game.home_team else None,
             "away_team": {
@@ -432,8 +445,9 @@ class GameService:
                 "description": game.away_team.description,
                 "owner_id": game.away_team.owner_id,
                 "city": game.away_team.city,
-                "wins": 0,  # TODO: Calculate actual wins
-                "losses": 0,  # TODO: Calculate actual losses
+                "wins": records[game.away_team_id]["wins"],
+                "losses": records[game.away_team_id]["losses"],
+                "streak": records[game.away_team_id]["streak"],
                 "created_at": game.away_team.created_at
             } if game.away_team else None,
             "home_players": home_players,
@@ -455,7 +469,9 @@ class GameService:
 
     def start_match(self, match_id: int) -> Game:
         """Start a match (change status to in_progress)"""
-        return self.update_match(match_id, status="in_progress")
+        match = self.update_match(match_id, status="in_progress")
+        live_game_registry.hydrate(match, self.db)
+        return match
 
     def end_match(self, match_id: int, home_score: int, away_score: int) -> Game:
         """End a match and set final score"""
@@ -468,9 +484,11 @@ class GameService:
             match.home_score = home_score
             match.away_score = away_score
             match.updated_at = datetime.utcnow()
+            StandingsService.sync_game(match, self.db)
 
             self.db.commit()
             self.db.refresh(match)
+            live_game_registry.evict(match_id)
             return match
         except Exception as e:
             self.db.rollback()
@@ -629,6 +647,8 @@ class GameService:
             match.home_score = home_score
             match.away_score = away_score
             match.updated_at = datetime.utcnow()
+            if match.status == "completed":
+                StandingsService.sync_game(match, self.db)
 
             self.db.commit()
             self.db.refresh(match)
@@ -665,8 +685,11 @@ class GameService:
                 outcome=outcome
             )
             self.db.add(event)
+            self.db.flush()
+            LiveBoxScoreService.record_event(event, self.db)
             self.db.commit()
             self.db.refresh(event)
+            live_game_registry.apply_event(event, self.db)
             return event
         except Exception as e:
             self.db.rollback()
@@ -953,13 +976,9 @@ class GameService:
             if not match:
                 raise Exception("Game not found")
 
-            # Update tournament team status
-            tournament_team = self.db.query(TournamentTeam).filter(
-                and_(TournamentTeam.tournament_id == tournament_id, TournamentTeam.team_id == winner_team_id)
-            ).first()
-            if tournament_team:
-                tournament_team.wins += 1
-                self.db.commit()
+            # Tournament wins/losses come from the standings; make sure this result is counted
+            StandingsService.sync_game(match, self.db)
+            self.db.commit()
 
             return True
         except Exception as e:
@@ -969,116 +988,104 @@ class GameService:
     # GAME FINALIZATION & STATS CALCULATION
     # ========================================================================
 
+    def _upsert_player_game_stats(self, game_id: int, player_stats: Dict[int, Dict[str, int]]) -> None:
+        """
+        Write all of a game's PlayerGameStats rows in one statement
+        INSERT ... ON CONFLICT (player_id, game_id) DO UPDATE on SQLite/Postgres;
+        other dialects fall back to one SELECT plus bulk insert/update
+        Rows for players no longer in the box score are removed
+        """
+        now = datetime.utcnow()
+        stale = self.db.query(PlayerGameStats).filter(PlayerGameStats.game_id == game_id)
+        if player_stats:
+            stale = stale.filter(PlayerGameStats.player_id.notin_(list(player_stats)))
+        stale.delete(synchronize_session=False)
+
+        if not player_stats:
+            return
+
+        rows = [
+            {"player_id": player_id, "game_id": game_id, "created_at": now, "updated_at": now, **stats}
+            for player_id, stats in player_stats.items()
+        ]
+
+        dialect = self.db.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            # Core executemany: the statement compiles once and is cached, where a
+            # multi-row VALUES list is recompiled with every row's bind parameters
+            insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            statement = insert(PlayerGameStats.__table__)
+            statement = statement.on_conflict_do_update(
+                index_elements=["player_id", "game_id"],
+                set_={
+                    **{field: statement.excluded[field] for field in STAT_COUNTER_FIELDS},
+                    "updated_at": statement.excluded.updated_at,
+                },
+            )
+            self.db.execute(statement, rows)
+            return
+
+        existing = {
+            player_id: stats_id
+            for stats_id, player_id in self.db.query(PlayerGameStats.id, PlayerGameStats.player_id).filter(
+                PlayerGameStats.game_id == game_id
+            ).all()
+        }
+        updates = []
+        for row in rows:
+            if row["player_id"] in existing:
+                row.pop("created_at")
+                updates.append({"id": existing[row["player_id"]], **row})
+        inserts = [row for row in rows if row["player_id"] not in existing]
+        if updates:
+            self.db.bulk_update_mappings(PlayerGameStats, updates)
+        if inserts:
+            self.db.bulk_insert_mappings(PlayerGameStats, inserts)
+
     def finalize_game(self, game_id: int) -> Dict:
         """
         Finalize a game and calculate player statistics
-        Aggregates all game events and creates PlayerGameStats records
+        Copies the live box score rows into PlayerGameStats with one bulk upsert,
+        in a single transaction together with the status, standings and career
+        stats update; re-finalizing a corrected game takes the same path and only
+        applies the difference to each player's career and leaderboard totals
         """
         try:
             game = self.db.query(Game).filter(Game.id == game_id).first()
             if not game:
                 raise Exception("Game not found")
 
-            # Get all events for this game
-            events = self.db.query(GameEvent).filter(GameEvent.game_id == game_id).all()
-
-            # Dictionary to accumulate player stats
-            player_stats = {}
-
-            # Process each event
-            for event in events:
-                if not event.user_id:
-                    continue  # Skip team events without a user_id (like timeouts)
-
-                if event.user_id not in player_stats:
-                    player_stats[event.user_id] = {
-                        'points': 0,
-                        'assists': 0,
-                        'rebounds': 0,
-                        'fouls': 0,
-                        'violations': 0,
-                        'shots_made': 0,
-                        'shots_attempted': 0,
-                        'two_pointers_made': 0,
-                        'two_pointers_attempted': 0,
-                        'three_pointers_made': 0,
-                        'three_pointers_attempted': 0,
-                        'free_throws_made': 0,
-                        'free_throws_attempted': 0,
-                    }
+            # Read the live box score rows maintained on every event insert/undo
+            live_rows = LiveBoxScoreService.get_player_rows(game, self.db, commit=False)
+            player_stats = {
+                row.user_id: {field: getattr(row, field) for field in STAT_COUNTER_FIELDS}
+                for row in live_rows
+            }
+            team_by_player = dict(
+                self.db.query(GamePlayer.user_id, GamePlayer.team_id).filter(GamePlayer.game_id == game_id).all()
+            )
+            team_by_player.update((row.user_id, row.team_id) for row in live_rows)
 
-                stats = player_stats[event.user_id]
-
-                # Process different event types
-                if event.event_type == '2PT':
-                    stats['shots_attempted'] += 1
-                    stats['two_pointers_attempted'] += 1
-                    if event.outcome == 'made':
-                        stats['points'] += 2
-                        stats['shots_made'] += 1
-                        stats['two_pointers_made'] += 1
-
-                elif event.event_type == '3PT':
-                    stats['shots_attempted'] += 1
-                    stats['three_pointers_attempted'] += 1
-                    if event.outcome == 'made':
-                        stats['points'] += 3
-                        stats['shots_made'] += 1
-                        stats['three_pointers_made'] += 1
-
-                elif event.event_type == 'FT':  # Free Throw
-                    stats['free_throws_attempted'] += 1
-                    if event.outcome == 'made':
-                        stats['points'] += 1
-                        stats['free_throws_made'] += 1
-
-                elif event.event_type == 'AST':  # Assist
-                    stats['assists'] += 1
-
-                elif event.event_type == 'REB':  # Rebound
-                    stats['rebounds'] += 1
-
-                elif event.event_type in ['FLS', 'FOUL_BLOCKING', 'FOUL_CHARGING', 'FOUL_HOLDING', 
-                                          'FOUL_PUSHING', 'FOUL_HAND_CHECKING', 'FOUL_ILLEGAL_SCREEN', 
-                                          'FOUL_ELBOWING', 'FOUL_SHOOTING']:  # Fouls
-                    stats['fouls'] += 1
-
-                elif event.event_type in ['VIOLATION_TRAVELING', 'VIOLATION_DOUBLE_DRIBBLE']:  # Violations
-                    stats['violations'] += 1
-
-            # Create PlayerGameStats records
-            created_stats = []
-            for player_id, stats in player_stats.items():
-                # Check if stats for this player/game already exist
-                existing_stats = self.db.query(PlayerGameStats).filter(
-                    and_(
-                        PlayerGameStats.player_id == player_id,
-                        PlayerGameStats.game_id == game_id
-                    )
-                ).first()
-
-                if existing_stats:
-                    # Update existing record
-                    for key, value in stats.items():
-                        setattr(existing_stats, key, value)
-                    existing_stats.updated_at = datetime.utcnow()
-                    self.db.commit()
-                    self.db.refresh(existing_stats)
-                    created_stats.append(existing_stats)
-                else:
-                    # Create new record
-                    player_game_stat = PlayerGameStats(
-                        player_id=player_id,
-                        game_id=game_id,
-                        **stats
-                    )
-                    self.db.add(player_game_stat)
-                    created_stats.append(player_game_stat)
+            # Career and leaderboard totals move by (new rows - previously finalized rows)
+            old_rows = CareerStatsService.game_rows(game_id, self.db)
+            self._upsert_player_game_stats(game_id, player_stats)
+            deltas = CareerStatsService.diff_game_rows(old_rows, player_stats)
+            CareerStatsService.apply_deltas(deltas, self.db)
+            LeaderboardService.apply_game_deltas(game, deltas, team_by_player, self.db)
 
-            # Update game status to completed
+            # Update game status to completed, with standings in the same transaction
             game.status = 'completed'
             game.ended_at = datetime.utcnow()
+            StandingsService.sync_game(game, self.db)
             self.db.commit()
+            live_game_registry.evict(game_id)
+            leaderboard_cache.apply(
+                LeaderboardService.game_scopes(game, team_by_player), deltas.keys(), self.db
+            )
+
+            created_stats = self.db.query(PlayerGameStats).filter(
+                PlayerGameStats.game_id == game_id
+            ).all()
 
             return {
                 'game_id': game_id,
@@ -1094,58 +1101,13 @@ class GameService:
     def get_player_stats(self, player_id: int) -> Dict:
         """
         Get aggregated career stats for a player
+        Reads the UserStats row kept current by finalize_game
         """
         try:
-            player = self.db.query(User).filter(User.id == player_id).first()
-            if not player:
+            stats = CareerStatsService.get_career_stats(player_id, self.db)
+            if stats is None:
                 raise Exception("Player not found")
-
-            # Get all game stats for this player
-            game_stats = self.db.query(PlayerGameStats).filter(
-                PlayerGameStats.player_id == player_id
-            ).all()
-
-            if not game_stats:
-                return {
-                    'user_id': player_id,
-                    'total_games': 0,
-                    'total_points': 0,
-                    'average_points_per_game': 0.0,
-                    'total_assists': 0,
-                    'total_rebounds': 0,
-                    'total_fouls': 0,
-                    'total_violations': 0,
-                    'total_shots_made': 0,
-                    'total_shots_attempted': 0,
-                    'career_shooting_percentage': 0.0
-                }
-
-            # Aggregate stats
-            total_points = sum(stat.points for stat in game_stats)
-            total_assists = sum(stat.assists for stat in game_stats)
-            total_rebounds = sum(stat.rebounds for stat in game_stats)
-            total_fouls = sum(stat.fouls for stat in game_stats)
-            total_violations = sum(stat.violations for stat in game_stats)
-            total_shots_made = sum(stat.shots_made for stat in game_stats)
-            total_shots_attempted = sum(stat.shots_attempted for stat in game_stats)
-            
-            total_games = len(game_stats)
-            average_ppg = total_points / total_games if total_games > 0 else 0.0
-            shooting_pct = (total_shots_made / total_shots_attempted * 100) if total_shots_attempted > 0 else 0.0
-
-            return {
-                'user_id': player_id,
-                'total_games': total_games,
-                'total_points': total_points,
-                'average_points_per_game': round(average_ppg, 2),
-                'total_assists': total_assists,
-                'total_rebounds': total_rebounds,
-                'total_fouls': total_fouls,
-                'total_violations': total_violations,
-                'total_shots_made': total_shots_made,
-                'total_shots_attempted': total_shots_attempted,
-                'career_shooting_percentage': round(shooting_pct, 2)
-            }
+            return stats
 
         except Exception as e:
             self.db.rollback()
@@ -1183,31 +1145,36 @@ class GameService:
                     if event.user_id:
                         if event.team_id == game.home_team_id:
                             if event.user_id not in home_team_stats:
-                                home_team_stats[event.user_id] = {'points': 0, 'name': self._get_player_name(event.user_id)}
+                                home_team_stats[event.user_id] = {'points': 0}
                             home_team_stats[event.user_id]['points'] += points
                         else:
                             if event.user_id not in away_team_stats:
-                                away_team_stats[event.user_id] = {'points': 0, 'name': self._get_player_name(event.user_id)}
+                                away_team_stats[event.user_id] = {'points': 0}
                             away_team_stats[event.user_id]['points'] += points
                 
                 # Track fouls
                 if event.event_type.startswith('FOUL_'):
                     if event.user_id:
                         if event.user_id not in foul_stats:
-                            foul_stats[event.user_id] = {'fouls': 0, 'name': self._get_player_name(event.user_id)}
+                            foul_stats[event.user_id] = {'fouls': 0}
                         foul_stats[event.user_id]['fouls'] += 1
             
             # Get top 2 scorers for each team
             home_scorers = sorted(home_team_stats.items(), key=lambda x: x[1]['points'], reverse=True)[:2]
             away_scorers = sorted(away_team_stats.items(), key=lambda x: x[1]['points'], reverse=True)[:2]
             top_foul_scorers = sorted(foul_stats.items(), key=lambda x: x[1]['fouls'], reverse=True)[:2]
+
+            # Resolve the names of everyone listed with one batched lookup
+            names = self.names.names(
+                user_id for user_id, stats in home_scorers + away_scorers + top_foul_scorers
+            )
             
             return {
                 'game_id': game_id,
                 'home_team_top_scorers': [
                     {
                         'user_id': user_id,
-                        'name': stats['name'],
+                        'name': names[user_id],
                         'points': stats['points']
                     }
                     for user_id, stats in home_scorers
@@ -1215,7 +1182,7 @@ class GameService:
                 'away_team_top_scorers': [
                     {
                         'user_id': user_id,
-                        'name': stats['name'],
+                        'name': names[user_id],
                         'points': stats['points']
                     }
                     for user_id, stats in away_scorers
@@ -1223,7 +1190,7 @@ class GameService:
                 'top_foul_scorers': [
                     {
                         'user_id': user_id,
-                        'name': stats['name'],
+                        'name': names[user_id],
                         'fouls': stats['fouls']
                     }
                     for user_id, stats in top_foul_scorers
@@ -1233,13 +1200,3 @@ class GameService:
         except Exception as e:
             self.db.rollback()
             raise
-
-    def _get_player_name(self, user_id: int) -> str:
-        """Get player name from user"""
-        from .models import User
-        user = self.db.query(User).filter(User.id == user_id).first()
-        if user:
-            if user.first_name and user.last_name:
-                return f"{user.first_name} {user.last_name}"
-            return user.username
-        return "Unknown Player"
\ No newline at end of file
@@ -0,0 +1,235 @@
+"""
+Live Game State
+In-process accumulator for games in progress, keyed by game_id
+Hydrated once from game_events, then mutated per event after the DB commit
+(write-through), so live reads never go back to the database
+"""
+
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+import threading
+
+from .models import Game, GameEvent
+from .services import BoxScoreService, empty_stat_counters, event_stat_deltas
+from .services_names import NameLoader
+from .services_pubsub import pubsub
+
+# Game statuses that keep a live state (legacy "active" and current "in_progress")
+LIVE_GAME_STATUSES = ("active", "in_progress")
+# Bus channel carrying status changes and evictions to the other workers' registries
+LIVE_GAME_CHANNEL = "live_game"
+
+
+def snapshot_event(event: GameEvent) -> GameEvent:
+    """Copy an event into a transient GameEvent that is safe to use after its session closes"""
+    return GameEvent(
+        id=event.id,
+        game_id=event.game_id,
+        user_id=event.user_id,
+        team_id=event.team_id,
+        event_type=event.event_type,
+        period=event.period,
+        timestamp=event.timestamp,
+        outcome=event.outcome,
+        created_at=event.created_at,
+    )
+
+
+class LiveGameState:
+    """Scores, per-player counters, fouls, timeouts, period and last event for one game"""
+
+    def __init__(self, game: Game):
+        self.game_id = game.id
+        self.status = game.status
+        self.home_team_id = game.home_team_id
+        self.away_team_id = game.away_team_id
+        self.team_names: Dict[int, str] = {}
+        self.roster: Dict[Tuple[int, int], Dict] = {}  # (team_id, user_id) -> player info
+        self.roster_teams: Dict[int, int] = {}  # user_id -> team_id, game roster only
+        self.player_counters: Dict[Tuple[int, int], Dict[str, int]] = {}
+        self.team_points: Dict[int, int] = {self.home_team_id: 0, self.away_team_id: 0}
+        self.team_fouls: Dict[int, int] = {self.home_team_id: 0, self.away_team_id: 0}
+        self.team_timeouts: Dict[int, int] = {self.home_team_id: 0, self.away_team_id: 0}
+        self.current_period = 1
+        self.last_event: Optional[GameEvent] = None
+        self.updated_at = datetime.utcnow()
+        self.lock = threading.Lock()
+
+    def apply_event(self, event: GameEvent, direction: int = 1) -> None:
+        """
+        Apply an event to the running totals in O(1)
+        direction=-1 reverses the counters of a previously applied event
+        """
+        with self.lock:
+            if event.event_type == "TO":
+                self.team_timeouts[event.team_id] = self.team_timeouts.get(event.team_id, 0) + direction
+
+            if event.user_id:
+                deltas = event_stat_deltas(event.event_type, event.outcome)
+                if deltas:
+                    key = (event.team_id, event.user_id)
+                    counters = self.player_counters.setdefault(key, empty_stat_counters())
+                    for field, delta in deltas.items():
+                        counters[field] += delta * direction
+                    self.team_points[event.team_id] = (
+                        self.team_points.get(event.team_id, 0) + deltas.get("points", 0) * direction
+                    )
+                    self.team_fouls[event.team_id] = (
+                        self.team_fouls.get(event.team_id, 0) + deltas.get("fouls", 0) * direction
+                    )
+
+            if direction > 0:
+                if event.event_type == "PERIOD_START":
+                    self.current_period = event.period
+                self.last_event = snapshot_event(event)
+
+            self.updated_at = datetime.utcnow()
+
+    def player_fouls(self, team_id: int, user_id: int) -> int:
+        """Running personal foul count for a player"""
+        counters = self.player_counters.get((team_id, user_id))
+        return counters["fouls"] if counters else 0
+
+    def get_box_score(self) -> Dict[int, Dict]:
+        """Build the scoreboard team dicts from memory, same shape as BoxScoreService.get_box_score"""
+        with self.lock:
+            return BoxScoreService.format_team_lines(
+                [self.home_team_id, self.away_team_id],
+                self.team_names,
+                self.roster,
+                self.player_counters,
+                self.team_timeouts,
+            )
+
+
+class LiveGameRegistry:
+    """Registry of LiveGameState objects for games in progress"""
+
+    def __init__(self):
+        self.games: Dict[int, LiveGameState] = {}
+        self._lock = threading.Lock()
+
+    def get(self, game_id: int) -> Optional[LiveGameState]:
+        """Get the live state for a game if it is being tracked"""
+        return self.games.get(game_id)
+
+    def hydrate(self, game: Game, db: Session) -> LiveGameState:
+        """Build a game's live state from game_events and start tracking it"""
+        state = LiveGameState(game)
+
+        player_counters, team_timeouts = BoxScoreService.aggregate_events(game.id, db)
+        state.team_names, state.roster = BoxScoreService.load_roster(game, player_counters.keys(), db)
+        state.roster_teams = {
+            user_id: team_id
+            for (team_id, user_id), info in state.roster.items()
+            if info["status"] != "unknown"
+        }
+        state.player_counters = player_counters
+        state.team_timeouts.update(team_timeouts)
+        for (team_id, user_id), counters in player_counters.items():
+            state.team_points[team_id] = state.team_points.get(team_id, 0) + counters["points"]
+            state.team_fouls[team_id] = state.team_fouls.get(team_id, 0) + counters["fouls"]
+
+        period_start = db.query(GameEvent).filter(
+            GameEvent.game_id == game.id,
+            GameEvent.event_type == "PERIOD_START",
+        ).order_by(GameEvent.created_at.desc()).first()
+        if period_start:
+            state.current_period = period_start.period
+
+        last_event = db.query(GameEvent).filter(
+            GameEvent.game_id == game.id
+        ).order_by(GameEvent.created_at.desc()).first()
+        if last_event:
+            state.last_event = snapshot_event(last_event)
+
+        with self._lock:
+            self.games[game.id] = state
+        return state
+
+    def get_or_load(self, game_id: int, db: Session) -> Optional[LiveGameState]:
+        """Get the live state for a game, hydrating it if the game is in progress"""
+        state = self.games.get(game_id)
+        if state:
+            return state
+
+        game = db.query(Game).filter(Game.id == game_id).first()
+        if not game or game.status not in LIVE_GAME_STATUSES:
+            return None
+        return self.hydrate(game, db)
+
+    def apply_event(self, event: GameEvent, db: Session) -> None:
+        """Apply a committed event to its game's live state, if tracked"""
+        state = self.games.get(event.game_id)
+        if not state:
+            return
+
+        key = (event.team_id, event.user_id)
+        if event.user_id and key not in state.roster:
+            state.roster[key] = {
+                "name": NameLoader(db).name(event.user_id),
+                "number": None,
+                "position": None,
+                "status": "unknown",
+            }
+
+        state.apply_event(event)
+
+    def revert_event(self, event: GameEvent) -> None:
+        """
+        Reverse a deleted event in its game's live state, if tracked
+        Undoing the last event or a period start evicts the state instead,
+        since the previous value is not kept; it is rehydrated on next access
+        """
+        state = self.games.get(event.game_id)
+        if not state:
+            return
+
+        is_last_event = state.last_event is not None and state.last_event.id == event.id
+        if is_last_event or event.event_type == "PERIOD_START":
+            # The other workers evict on the scoreboard notice every event write sends
+            self.evict(event.game_id, publish=False)
+            return
+
+        state.apply_event(event, direction=-1)
+
+    def set_status(self, game_id: int, status: str, publish: bool = True) -> None:
+        """
+        Track a game status change, here and on the other workers, evicting
+        the state once the game is no longer live
+        """
+        if publish:
+            pubsub.publish(LIVE_GAME_CHANNEL, {"game_id": game_id, "status": status})
+        state = self.games.get(game_id)
+        if not state:
+            return
+
+        if status not in LIVE_GAME_STATUSES:
+            self.evict(game_id, publish=False)
+        else:
+            state.status = status
+
+    def evict(self, game_id: int, publish: bool = True) -> None:
+        """Stop tracking a game, here and on the other workers"""
+        if publish:
+            pubsub.publish(LIVE_GAME_CHANNEL, {"game_id": game_id})
+        with self._lock:
+            self.games.pop(game_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.games.clear()
+
+    def _on_remote(self, message: dict) -> None:
+        if "status" in message:
+            self.set_status(message["game_id"], message["status"], publish=False)
+        else:
+            self.evict(message["game_id"], publish=False)
+
+
+# Global instance
+live_game_registry = LiveGameRegistry()
+pubsub.subscribe(LIVE_GAME_CHANNEL, live_game_registry._on_remote)
+# Changes published while this worker was off the bus were missed; rehydrate on demand
+pubsub.on_connect(live_game_registry.clear)
@@ -0,0 +1,254 @@
+"""
+Rate Limiting
+Token buckets for expensive endpoints (login hashing, user search), keyed by
+client IP or authenticated user. Each key costs one fixed-size bucket, and
+buckets that have refilled completely carry no state and are swept periodically.
+
+Stores:
+- "mmap": fixed-size table in a memory-mapped file shared by the workers of
+  one deployment, guarded by an flock (default when WEB_CONCURRENCY > 1)
+- "memory": per-process dict, for a single worker (default otherwise)
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import time
+
+from .database import DATABASE_URL
+
+
+def default_rate_limit_path() -> str:
+    """Shared table file for this deployment, one per working directory and database"""
+    instance = hashlib.blake2b(f"{os.getcwd()}\0{DATABASE_URL}".encode(), digest_size=6).hexdigest()
+    return os.path.join(tempfile.gettempdir(), f"scoring-basket-ratelimit-{instance}.bin")
+
+
+# Worker processes serving the app (the variable uvicorn/gunicorn read)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "mmap" if WEB_CONCURRENCY > 1 else "memory")
+RATE_LIMIT_PATH = os.getenv("RATE_LIMIT_PATH") or default_rate_limit_path()
+# Buckets in the shared table; when a set is full the bucket closest to
+# being refilled is forgotten, which only ever lets extra requests through
+RATE_LIMIT_SLOTS = int(os.getenv("RATE_LIMIT_SLOTS", "65536"))
+RATE_LIMIT_SWEEP_INTERVAL = float(os.getenv("RATE_LIMIT_SWEEP_INTERVAL", "60"))
+# Use the first X-Forwarded-For address as the client IP (behind a trusted proxy only)
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+
+# "<requests>/<seconds>" per key, or "off"
+RATE_LIMIT_LOGIN = os.getenv("RATE_LIMIT_LOGIN", "10/60")
+RATE_LIMIT_SEARCH_USERS = os.getenv("RATE_LIMIT_SEARCH_USERS", "30/10")
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """A route's limit: `requests` per `seconds`, bursting up to `requests`"""
+    name: str
+    requests: int
+    seconds: float
+    key: str = "ip"  # "ip" or "user" (token subject, IP when unauthenticated)
+
+    @property
+    def rate(self) -> float:
+        return self.requests / self.seconds
+
+    @classmethod
+    def parse(cls, name: str, spec: str, key: str = "ip") -> Optional["RateLimit"]:
+        if spec.strip().lower() in ("", "0", "off"):
+            return None
+        try:
+            requests, seconds = spec.split("/")
+            return cls(name, int(requests), float(seconds), key)
+        except ValueError:
+            raise ValueError(f"Invalid rate limit {name}={spec!r}; expected '<requests>/<seconds>'")
+
+
+def refill(tokens: float, updated: float, limit: RateLimit, now: float) -> Tuple[float, float, float]:
+    """
+    Take one token from a bucket
+    Returns (tokens left, seconds to wait if refused (0 = allowed), time the bucket is full again)
+    """
+    tokens = min(float(limit.requests), tokens + (now - updated) * limit.rate)
+    if tokens >= 1:
+        tokens -= 1
+        wait = 0.0
+    else:
+        wait = (1 - tokens) / limit.rate
+    return tokens, wait, now + (limit.requests - tokens) / limit.rate
+
+
+class BucketStore:
+    """take() returns the seconds to wait, 0 when the request may proceed"""
+
+    def take(self, key: str, limit: RateLimit, now: float) -> float:
+        raise NotImplementedError
+
+    def sweep(self, now: float) -> int:
+        """Forget buckets that are full again; returns how many"""
+        return 0
+
+    def __len__(self) -> int:
+        return 0
+
+
+class InMemoryBucketStore(BucketStore):
+    """Per-process buckets: {key: (tokens, updated, full_at)}"""
+
+    def __init__(self):
+        self.buckets: Dict[str, Tuple[float, float, float]] = {}
+
+    def take(self, key: str, limit: RateLimit, now: float) -> float:
+        tokens, updated, _ = self.buckets.get(key, (float(limit.requests), now, now))
+        tokens, wait, full_at = refill(tokens, updated, limit, now)
+        self.buckets[key] = (tokens, now, full_at)
+        return wait
+
+    def sweep(self, now: float) -> int:
+        expired = [key for key, (_, _, full_at) in self.buckets.items() if full_at <= now]
+        for key in expired:
+            del self.buckets[key]
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self.buckets)
+
+
+class SharedMemoryBucketStore(BucketStore):
+    """
+    Set-associative table of buckets in a memory-mapped file
+    Slot layout: key hash (u64, 0 = empty), tokens, updated, full_at (f64).
+    Every worker maps the same file; an exclusive flock serializes updates.
+    Only called from the event loop thread.
+    """
+
+    SLOT = struct.Struct("<Qddd")
+    WAYS = 8
+
+    def __init__(self, path: str = RATE_LIMIT_PATH, slots: int = RATE_LIMIT_SLOTS):
+        self.path = path
+        self.sets = max(1, slots // self.WAYS)
+        size = self.sets * self.WAYS * self.SLOT.size
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        try:
+            # Only ever grown: shrinking a file other workers have mapped would fault them
+            if os.fstat(self.fd).st_size < size:
+                os.ftruncate(self.fd, size)
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self.map = mmap.mmap(self.fd, size)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+    def take(self, key: str, limit: RateLimit, now: float) -> float:
+        key_hash = self._hash(key)
+        first = (key_hash % self.sets) * self.WAYS
+        slot_size, unpack_from = self.SLOT.size, self.SLOT.unpack_from
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        try:
+            found = victim = None
+            victim_full_at = float("inf")
+            for slot in range(first, first + self.WAYS):
+                slot_hash, tokens, updated, full_at = unpack_from(self.map, slot * slot_size)
+                if slot_hash == key_hash:
+                    found = slot
+                    break
+                # Empty and refilled slots are free; otherwise evict the one nearest to full
+                if slot_hash == 0 or full_at <= now:
+                    full_at = float("-inf")
+                if full_at < victim_full_at:
+                    victim, victim_full_at = slot, full_at
+            if found is None:
+                found, tokens, updated = victim, float(limit.requests), now
+            tokens, wait, full_at = refill(tokens, updated, limit, now)
+            self.SLOT.pack_into(self.map, found * slot_size, key_hash, tokens, now, full_at)
+            return wait
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+    def sweep(self, now: float) -> int:
+        empty = bytes(self.SLOT.size)
+        swept = 0
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        try:
+            for slot, (slot_hash, _, _, full_at) in enumerate(self.SLOT.iter_unpack(self.map)):
+                if slot_hash and full_at <= now:
+                    offset = slot * self.SLOT.size
+                    self.map[offset:offset + self.SLOT.size] = empty
+                    swept += 1
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        return swept
+
+    def __len__(self) -> int:
+        return sum(1 for slot_hash, _, _, _ in self.SLOT.iter_unpack(self.map) if slot_hash)
+
+
+BUCKET_STORES = {
+    "memory": InMemoryBucketStore,
+    "mmap": SharedMemoryBucketStore,
+}
+
+
+def create_store(name: str = RATE_LIMIT_BACKEND) -> BucketStore:
+    if name not in BUCKET_STORES:
+        raise ValueError(f"Unknown RATE_LIMIT_BACKEND {name!r}; expected one of {', '.join(BUCKET_STORES)}")
+    return BUCKET_STORES[name]()
+
+
+class RateLimiter:
+    """Per-route limits over one bucket store"""
+
+    def __init__(self, rules: Dict[Tuple[str, str], Optional[RateLimit]], store: Optional[BucketStore] = None):
+        self.rules = {route: limit for route, limit in rules.items() if limit is not None}
+        self._store = store
+        self._next_sweep = time.time() + RATE_LIMIT_SWEEP_INTERVAL
+        self.metrics: Dict[str, Dict[str, int]] = {
+            limit.name: {"allowed": 0, "limited": 0} for limit in self.rules.values()
+        }
+        self.swept = 0
+
+    @property
+    def store(self) -> BucketStore:
+        # Opened on first use, so importing the app doesn't create the file
+        if self._store is None:
+            self._store = create_store()
+        return self._store
+
+    def rule_for(self, method: str, path: str) -> Optional[RateLimit]:
+        return self.rules.get((method, path))
+
+    def check(self, limit: RateLimit, identity: str) -> float:
+        """Seconds the caller must wait, 0 when the request may proceed"""
+        now = time.time()
+        if now >= self._next_sweep:
+            self._next_sweep = now + RATE_LIMIT_SWEEP_INTERVAL
+            self.swept += self.store.sweep(now)
+        wait = self.store.take(f"{limit.name}:{identity}", limit, now)
+        self.metrics[limit.name]["limited" if wait else "allowed"] += 1
+        return wait
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "backend": RATE_LIMIT_BACKEND,
+            "rules": {
+                limit.name: f"{limit.requests}/{limit.seconds:g}s per {limit.key}" for limit in self.rules.values()
+            },
+            "routes": self.metrics,
+            "buckets": len(self.store),
+            "swept": self.swept,
+        }
+
+
+# Global rate limiter
+rate_limiter = RateLimiter({
+    ("POST", "/api/auth/login"): RateLimit.parse("login", RATE_LIMIT_LOGIN, key="ip"),
+    ("GET", "/api/auth/search-users"): RateLimit.parse("search_users", RATE_LIMIT_SEARCH_USERS, key="user"),
+})
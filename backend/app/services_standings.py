@@ -0,0 +1,181 @@
+"""
+Team Standings
+Materialized wins/losses/streak per team (team_standings) and per tournament
+(TournamentTeam.wins/losses), updated in the same transaction that completes a game
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy import or_, desc
+from datetime import datetime
+from typing import Dict, List
+
+from .models import Game, GameResult, TeamStanding, TournamentTeam
+
+
+def game_outcome(team_id: int, result: GameResult) -> int:
+    """+1 if the team won the game, -1 if it lost, 0 for a tie"""
+    if team_id == result.home_team_id:
+        own, other = result.home_score, result.away_score
+    else:
+        own, other = result.away_score, result.home_score
+    return (own > other) - (own < other)
+
+
+class StandingsService:
+    """Maintain and read the materialized standings; callers own the commit"""
+
+    @staticmethod
+    def _get_standing(team_id: int, db: Session) -> TeamStanding:
+        """Get or create the standings row for a team"""
+        standing = db.query(TeamStanding).filter(TeamStanding.team_id == team_id).first()
+        if not standing:
+            standing = TeamStanding(team_id=team_id, wins=0, losses=0, ties=0, streak=0)
+            db.add(standing)
+        return standing
+
+    @staticmethod
+    def _apply_result(result: GameResult, db: Session, direction: int = 1) -> None:
+        """Add (direction=1) or remove (direction=-1) a result's wins/losses/ties"""
+        for team_id in (result.home_team_id, result.away_team_id):
+            outcome = game_outcome(team_id, result)
+            standing = StandingsService._get_standing(team_id, db)
+            if outcome > 0:
+                standing.wins += direction
+            elif outcome < 0:
+                standing.losses += direction
+            else:
+                standing.ties += direction
+
+            if direction > 0:
+                # Newly completed game is the team's latest result
+                if outcome > 0:
+                    standing.streak = standing.streak + 1 if standing.streak > 0 else 1
+                elif outcome < 0:
+                    standing.streak = standing.streak - 1 if standing.streak < 0 else -1
+                else:
+                    standing.streak = 0
+            standing.updated_at = datetime.utcnow()
+
+            if result.tournament_id:
+                tournament_team = db.query(TournamentTeam).filter(
+                    TournamentTeam.tournament_id == result.tournament_id,
+                    TournamentTeam.team_id == team_id,
+                ).first()
+                if tournament_team:
+                    if outcome > 0:
+                        tournament_team.wins = (tournament_team.wins or 0) + direction
+                    elif outcome < 0:
+                        tournament_team.losses = (tournament_team.losses or 0) + direction
+
+    @staticmethod
+    def recompute_streak(team_id: int, db: Session) -> int:
+        """Recompute a team's streak from its results, newest first"""
+        results = db.query(GameResult).filter(
+            or_(GameResult.home_team_id == team_id, GameResult.away_team_id == team_id)
+        ).order_by(desc(GameResult.completed_at), desc(GameResult.id)).yield_per(50)
+
+        streak = 0
+        for result in results:
+            outcome = game_outcome(team_id, result)
+            if outcome == 0 or (streak and (outcome > 0) != (streak > 0)):
+                break
+            streak += outcome
+
+        StandingsService._get_standing(team_id, db).streak = streak
+        return streak
+
+    @staticmethod
+    def sync_game(game: Game, db: Session) -> None:
+        """
+        Bring standings in line with a game's current status and score
+        Completing a game adds its result, a corrected score replaces it,
+        and reopening or cancelling a completed game removes it
+        Does not commit, so it is atomic with the caller's status change
+        """
+        result = db.query(GameResult).filter(GameResult.game_id == game.id).first()
+
+        if game.status != "completed":
+            if result:
+                StandingsService._apply_result(result, db, direction=-1)
+                db.delete(result)
+                db.flush()
+                for team_id in (result.home_team_id, result.away_team_id):
+                    StandingsService.recompute_streak(team_id, db)
+            return
+
+        home_score = game.home_score or 0
+        away_score = game.away_score or 0
+        if result:
+            unchanged = (
+                result.home_score == home_score
+                and result.away_score == away_score
+                and result.tournament_id == game.tournament_id
+            )
+            if unchanged:
+                return
+            # Score corrected after completion: swap the old result for the new one
+            StandingsService._apply_result(result, db, direction=-1)
+            result.home_score = home_score
+            result.away_score = away_score
+            result.tournament_id = game.tournament_id
+            StandingsService._apply_result(result, db, direction=1)
+            db.flush()
+            for team_id in (result.home_team_id, result.away_team_id):
+                StandingsService.recompute_streak(team_id, db)
+            return
+
+        result = GameResult(
+            game_id=game.id,
+            tournament_id=game.tournament_id,
+            home_team_id=game.home_team_id,
+            away_team_id=game.away_team_id,
+            home_score=home_score,
+            away_score=away_score,
+            completed_at=game.ended_at or datetime.utcnow(),
+        )
+        db.add(result)
+        StandingsService._apply_result(result, db, direction=1)
+        db.flush()
+
+    @staticmethod
+    def get_standings(team_ids: List[int], db: Session) -> Dict[int, Dict[str, int]]:
+        """Get {team_id: {"wins", "losses", "streak"}} for the given teams"""
+        result = {team_id: {"wins": 0, "losses": 0, "streak": 0} for team_id in team_ids}
+        rows = db.query(TeamStanding).filter(TeamStanding.team_id.in_(team_ids)).all()
+        for standing in rows:
+            result[standing.team_id] = {
+                "wins": standing.wins,
+                "losses": standing.losses,
+                "streak": standing.streak,
+            }
+        return result
+
+    @staticmethod
+    def backfill(db: Session) -> int:
+        """
+        Rebuild game_results, team_standings and TournamentTeam wins/losses
+        from completed games, oldest first so streaks come out right
+        Returns the number of games replayed
+        """
+        try:
+            db.query(GameResult).delete(synchronize_session=False)
+            db.query(TeamStanding).delete(synchronize_session=False)
+            db.query(TournamentTeam).update(
+                {TournamentTeam.wins: 0, TournamentTeam.losses: 0}, synchronize_session=False
+            )
+            db.flush()
+
+            games = db.query(Game).filter(Game.status == "completed").order_by(
+                Game.ended_at, Game.updated_at, Game.id
+            ).all()
+
+            count = 0
+            for game in games:
+                StandingsService.sync_game(game, db)
+                count += 1
+
+            db.commit()
+            return count
+        except Exception:
+            db.rollback()
+            raise
@@ -6,30 +6,52 @@ Manages real-time game updates using Socket.IO
 from fastapi import Depends
 from sqlalchemy.orm import Session
 from socketio import AsyncServer, ASGIApp
+import asyncio
 import logging
+import os
 from typing import Dict, Set, Optional
 from datetime import datetime
 
-from .database import get_db_context
+from .database import get_async_db_context
 from .models import Game, GameEvent
-from .services import StatsCalculationService, GameStateService, RepositoryService
+from .services import LiveBoxScoreService, GameStateService, RepositoryService
+from .services_live import live_game_registry
+from .serialization import SocketIOJSON
+from .services_pubsub import pubsub, presence
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Create async Socket.IO server
+# Room emits build one packet for all recipients; SocketIOJSON makes that
+# single encode use orjson when available
 sio = AsyncServer(
     async_mode="asgi",
     cors_allowed_origins="*",
     ping_interval=20,
     ping_timeout=10,
     max_http_buffer_size=1000000,
+    json=SocketIOJSON,
 )
 
 # Track connected clients per game
 game_rooms: Dict[int, Set[str]] = {}  # {game_id: {session_id, ...}}
 
+# Scoreboard protocol modes chosen on join_game: full scoreboard_update
+# messages (default) or a snapshot followed by scoreboard_patch messages
+# (RFC 7396 merge patches; patch-mode snapshots omit null fields, so an
+# absent key reads as null and a null in a patch removes the key)
+SCOREBOARD_MODES = ("full", "patch")
+
+# Minimum time between two scoreboard broadcasts for the same game
+SCOREBOARD_BROADCAST_INTERVAL_MS = int(os.getenv("SCOREBOARD_BROADCAST_INTERVAL_MS", "100"))
+
+# Bus channels shared with the other workers: one-off room emits, and
+# "game changed" notices after which each worker rebuilds its own scoreboard
+EMIT_CHANNEL = "sio_emit"
+SCOREBOARD_CHANNEL = "scoreboard"
+
 
 # ==================== CONNECTION HANDLERS ====================
 
@@ -61,14 +83,18 @@ async def join_game(sid: str, data: dict):
     Expected data: {"game_id": int}
     """
     game_id = data.get("game_id")
+    mode = data.get("mode", "full")
     
     if not game_id:
         logger.warning(f"Invalid join_game data from {sid}: {data}")
         return {"status": "error", "message": "game_id required"}
+
+    if mode not in SCOREBOARD_MODES:
+        return {"status": "error", "message": f"mode must be one of {', '.join(SCOREBOARD_MODES)}"}
     
     # Verify game exists
-    with get_db_context() as db:
-        game = db.query(Game).filter(Game.id == game_id).first()
+    async with get_async_db_context() as db:
+        game = await db.get(Game, game_id)
         if not game:
             logger.warning(f"Game {game_id} not found")
             return {"status": "error", "message": "Game not found"}
@@ -79,15 +105,40 @@ async def join_game(sid: str, data: dict):
     
     game_rooms[game_id].add(sid)
     sio.enter_room(sid, f"game_{game_id}")
+    sio.enter_room(sid, scoreboard_room(game_id, mode))
     
-    logger.info(f"✅ Client {sid} joined game {game_id} room ({len(game_rooms[game_id])} clients)")
+    logger.info(f"✅ Client {sid} joined game {game_id} room ({len(game_rooms[game_id])} clients, {mode})")
     
-    return {
+    response = {
         "status": "success",
         "message": f"Joined game {game_id}",
         "game_id": game_id,
-        "room": f"game_{game_id}"
+        "room": f"game_{game_id}",
+        "mode": mode,
     }
+    if mode == "patch":
+        # Patches apply on top of this snapshot, starting at seq + 1
+        seq, snapshot = await _current_scoreboard_snapshot(game_id)
+        response.update({"seq": seq, "snapshot": snapshot})
+    return response
+
+
+@sio.on("resync_scoreboard")
+async def resync_scoreboard(sid: str, data: dict):
+    """
+    Full scoreboard snapshot for a patch-mode client that missed a sequence number
+    Expected data: {"game_id": int}
+    """
+    game_id = data.get("game_id")
+    
+    if not game_id:
+        return {"status": "error", "message": "game_id required"}
+    
+    seq, snapshot = await _current_scoreboard_snapshot(game_id)
+    if snapshot is None:
+        return {"status": "error", "message": "Game is not live"}
+    scoreboard_patches.metrics["resyncs"] += 1
+    return {"status": "success", "game_id": game_id, "seq": seq, "snapshot": snapshot}
 
 
 @sio.on("leave_game")
@@ -101,6 +152,8 @@ async def leave_game(sid: str, data: dict):
     if game_id and game_id in game_rooms:
         game_rooms[game_id].discard(sid)
         sio.leave_room(sid, f"game_{game_id}")
+        for mode in SCOREBOARD_MODES:
+            sio.leave_room(sid, scoreboard_room(game_id, mode))
         logger.info(f"Client {sid} left game {game_id} room ({len(game_rooms[game_id])} clients)")
     
     return {"status": "success", "message": "Left game room"}
@@ -108,6 +161,198 @@ async def leave_game(sid: str, data: dict):
 
 # ==================== GAME UPDATE HANDLERS ====================
 
+def scoreboard_room(game_id: int, mode: str) -> str:
+    """Socket.IO room receiving a game's scoreboard in the given protocol mode"""
+    return f"game_{game_id}_scoreboard_{mode}"
+
+
+def merge_patch(old: dict, new: dict) -> dict:
+    """
+    JSON merge patch (RFC 7396) turning old into new
+    Only changed keys are included, nested objects are diffed recursively
+    and keys that disappeared are set to None; new must hold no None values
+    (see _drop_nulls), so a None in the patch always means "remove this key"
+    """
+    patch = {}
+    for key, value in new.items():
+        if key not in old:
+            patch[key] = value
+            continue
+        before = old[key]
+        if isinstance(value, dict) and isinstance(before, dict):
+            nested = merge_patch(before, value)
+            if nested:
+                patch[key] = nested
+        elif before != value:
+            patch[key] = value
+    for key in old.keys() - new.keys():
+        patch[key] = None
+    return patch
+
+
+class ScoreboardPatchStream:
+    """
+    Last published scoreboard snapshot and sequence number per game
+    Every flush diffs the new snapshot against the last one and publishes the
+    changed fields as patch seq + 1
+    """
+
+    def __init__(self):
+        self.streams: Dict[int, tuple] = {}  # game_id -> (seq, snapshot)
+        self.metrics = {"patches": 0, "unchanged": 0, "resyncs": 0}
+
+    def current(self, game_id: int) -> tuple:
+        """(seq, snapshot) last published for a game, (0, None) if none yet"""
+        return self.streams.get(game_id, (0, None))
+
+    def publish(self, game_id: int, snapshot: dict) -> Optional[dict]:
+        """Record a new snapshot; returns the patch message, None if nothing changed"""
+        seq, previous = self.current(game_id)
+        if previous is None:
+            self.streams[game_id] = (0, snapshot)
+            return None
+
+        changes = merge_patch(previous, snapshot)
+        if not changes:
+            self.metrics["unchanged"] += 1
+            return None
+
+        self.streams[game_id] = (seq + 1, snapshot)
+        self.metrics["patches"] += 1
+        return {
+            "event": "scoreboard_patch",
+            "game_id": game_id,
+            "seq": seq + 1,
+            "changes": changes,
+        }
+
+    def seed(self, game_id: int, snapshot: dict) -> tuple:
+        """Start a game's stream from a snapshot unless one is already published"""
+        if game_id not in self.streams:
+            self.streams[game_id] = (0, snapshot)
+        return self.streams[game_id]
+
+    def discard(self, game_id: int) -> None:
+        self.streams.pop(game_id, None)
+
+
+# Global patch streams
+scoreboard_patches = ScoreboardPatchStream()
+
+
+def _latest_event_payload(latest_event: Optional[GameEvent]) -> Optional[dict]:
+    """Scoreboard summary of the last recorded event"""
+    if not latest_event:
+        return None
+    return {
+        "id": latest_event.id,
+        "event_type": latest_event.event_type,
+        "period": latest_event.period,
+        "outcome": latest_event.outcome,
+        "player_id": latest_event.user_id,
+        "team_id": latest_event.team_id,
+    }
+
+
+def _drop_nulls(value):
+    """
+    Omit None-valued keys at every level: in a merge patch null means removal,
+    so a null field (no latest_event, an unrostered player's number) is sent
+    as an absent key instead
+    """
+    if isinstance(value, dict):
+        return {key: _drop_nulls(item) for key, item in value.items() if item is not None}
+    return value
+
+
+def _patch_snapshot(state, box_score: Dict[int, dict]) -> dict:
+    """
+    Patch-mode scoreboard: players keyed by id so patches can address single
+    fields, and null fields omitted so patches are plain RFC 7396
+    """
+    snapshot = {
+        "game_status": state.status,
+        "period": state.current_period,
+        "latest_event": _latest_event_payload(state.last_event),
+    }
+    for side, team_id in (("home_team", state.home_team_id), ("away_team", state.away_team_id)):
+        team = dict(box_score[team_id])
+        team["players"] = {str(player["player_id"]): player for player in team["players"]}
+        snapshot[side] = team
+    return _drop_nulls(snapshot)
+
+
+async def _load_live_state(game_id: int):
+    """Live state for a game, hydrating it from the DB if needed"""
+    state = live_game_registry.get(game_id)
+    if not state:
+        async with get_async_db_context() as db:
+            state = await db.run_sync(lambda session: live_game_registry.get_or_load(game_id, session))
+    return state
+
+
+async def _current_scoreboard_snapshot(game_id: int) -> tuple:
+    """(seq, snapshot) a patch-mode client should start from"""
+    seq, snapshot = scoreboard_patches.current(game_id)
+    if snapshot is not None:
+        return seq, snapshot
+    state = await _load_live_state(game_id)
+    if not state:
+        return 0, None
+    return scoreboard_patches.seed(game_id, _patch_snapshot(state, state.get_box_score()))
+
+def _scoreboard_payload(game_id: int, db: Session) -> dict:
+    """Build the get_scoreboard response; runs on the async session's sync facade"""
+    game = db.query(Game).filter(Game.id == game_id).first()
+    if not game:
+        return {"status": "error", "message": "Game not found"}
+    
+    # Calculate scoreboard data
+    box_score = LiveBoxScoreService.get_box_score(game, db)
+    home_stats = box_score[game.home_team_id]
+    away_stats = box_score[game.away_team_id]
+    period = GameStateService.get_current_period(game_id, db)
+    latest_event = RepositoryService.get_latest_game_event(game_id, db)
+    
+    return {
+        "status": "success",
+        "game_id": game_id,
+        "game_status": game.status,
+        "period": period,
+        "home_team": home_stats,
+        "away_team": away_stats,
+        "latest_event": {
+            "id": latest_event.id,
+            "event_type": latest_event.event_type,
+            "period": latest_event.period,
+            "outcome": latest_event.outcome,
+        } if latest_event else None,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+def _boxscore_payload(game_id: int, db: Session) -> dict:
+    """Build the get_boxscore response; runs on the async session's sync facade"""
+    game = db.query(Game).filter(Game.id == game_id).first()
+    if not game:
+        return {"status": "error", "message": "Game not found"}
+    
+    box_score = LiveBoxScoreService.get_box_score(game, db)
+    home_stats = box_score[game.home_team_id]
+    away_stats = box_score[game.away_team_id]
+    event_count = db.query(GameEvent).filter(GameEvent.game_id == game_id).count()
+    
+    return {
+        "status": "success",
+        "game_id": game_id,
+        "home_team": home_stats,
+        "away_team": away_stats,
+        "total_events": event_count,
+        "game_status": game.status,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
 @sio.on("get_scoreboard")
 async def get_scoreboard(sid: str, data: dict):
     """
@@ -119,32 +364,8 @@ async def get_scoreboard(sid: str, data: dict):
     if not game_id:
         return {"status": "error", "message": "game_id required"}
     
-    with get_db_context() as db:
-        game = db.query(Game).filter(Game.id == game_id).first()
-        if not game:
-            return {"status": "error", "message": "Game not found"}
-        
-        # Calculate scoreboard data
-        home_stats = StatsCalculationService.get_team_stats(game_id, game.home_team_id, db)
-        away_stats = StatsCalculationService.get_team_stats(game_id, game.away_team_id, db)
-        period = GameStateService.get_current_period(game_id, db)
-        latest_event = RepositoryService.get_latest_game_event(game_id, db)
-        
-        return {
-            "status": "success",
-            "game_id": game_id,
-            "game_status": game.status,
-            "period": period,
-            "home_team": home_stats,
-            "away_team": away_stats,
-            "latest_event": {
-                "id": latest_event.id,
-                "event_type": latest_event.event_type,
-                "period": latest_event.period,
-                "outcome": latest_event.outcome,
-            } if latest_event else None,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+    async with get_async_db_context() as db:
+        return await db.run_sync(lambda session: _scoreboard_payload(game_id, session))
 
 
 @sio.on("get_boxscore")
@@ -158,24 +379,8 @@ async def get_boxscore(sid: str, data: dict):
     if not game_id:
         return {"status": "error", "message": "game_id required"}
     
-    with get_db_context() as db:
-        game = db.query(Game).filter(Game.id == game_id).first()
-        if not game:
-            return {"status": "error", "message": "Game not found"}
-        
-        home_stats = StatsCalculationService.get_team_stats(game_id, game.home_team_id, db)
-        away_stats = StatsCalculationService.get_team_stats(game_id, game.away_team_id, db)
-        event_count = db.query(GameEvent).filter(GameEvent.game_id == game_id).count()
-        
-        return {
-            "status": "success",
-            "game_id": game_id,
-            "home_team": home_stats,
-            "away_team": away_stats,
-            "total_events": event_count,
-            "game_status": game.status,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+    async with get_async_db_context() as db:
+        return await db.run_sync(lambda session: _boxscore_payload(game_id, session))
 
 
 # ==================== BROADCAST FUNCTIONS ====================
@@ -184,47 +389,142 @@ async def broadcast_scoreboard_update(game_id: int):
     """
     Broadcast scoreboard update to all clients in game room
     Called when new event is recorded
+    Served from the live game state; the DB is only read to hydrate it
     """
-    with get_db_context() as db:
-        game = db.query(Game).filter(Game.id == game_id).first()
-        if not game:
-            return
-        
-        # Calculate scoreboard data
-        home_stats = StatsCalculationService.get_team_stats(game_id, game.home_team_id, db)
-        away_stats = StatsCalculationService.get_team_stats(game_id, game.away_team_id, db)
-        period = GameStateService.get_current_period(game_id, db)
-        latest_event = RepositoryService.get_latest_game_event(game_id, db)
+    state = await _load_live_state(game_id)
+    if not state:
+        scoreboard_patches.discard(game_id)
+        return
+    
+    box_score = state.get_box_score()
     
     message = {
         "event": "scoreboard_update",
         "game_id": game_id,
-        "game_status": game.status,
-        "period": period,
-        "home_team": home_stats,
-        "away_team": away_stats,
-        "latest_event": {
-            "id": latest_event.id,
-            "event_type": latest_event.event_type,
-            "period": latest_event.period,
-            "outcome": latest_event.outcome,
-            "player_id": latest_event.player_id,
-            "team_id": latest_event.team_id,
-        } if latest_event else None,
+        "game_status": state.status,
+        "period": state.current_period,
+        "home_team": box_score[state.home_team_id],
+        "away_team": box_score[state.away_team_id],
+        "latest_event": _latest_event_payload(state.last_event),
         "timestamp": datetime.utcnow().isoformat()
     }
     
-    # Broadcast to all clients in game room
-    await sio.emit("scoreboard_update", message, room=f"game_{game_id}")
+    # Full scoreboard for full-mode clients, changed fields only for patch-mode clients
+    await sio.emit("scoreboard_update", message, room=scoreboard_room(game_id, "full"))
+    patch = scoreboard_patches.publish(game_id, _patch_snapshot(state, box_score))
+    if patch:
+        patch["timestamp"] = message["timestamp"]
+        await sio.emit("scoreboard_patch", patch, room=scoreboard_room(game_id, "patch"))
     logger.info(f"📡 Broadcasted scoreboard update for game {game_id}")
 
 
+class ScoreboardBroadcaster:
+    """
+    Coalesces scoreboard broadcasts per game
+    Recording an event marks its game dirty; a per-game flush task sends one
+    scoreboard right away, then at most one more per interval however many
+    events arrived in between
+    """
+
+    def __init__(self, interval_ms: int = SCOREBOARD_BROADCAST_INTERVAL_MS):
+        self.interval = interval_ms / 1000
+        self.dirty: Set[int] = set()
+        self.tasks: Dict[int, asyncio.Task] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.metrics = {"requested": 0, "coalesced": 0, "flushed": 0, "errors": 0}
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Remember the server's event loop so worker threads can schedule flushes"""
+        self.loop = loop
+
+    def mark_dirty(self, game_id: int) -> None:
+        """Request a scoreboard broadcast; must run on the event loop"""
+        self.loop = asyncio.get_running_loop()
+        self.metrics["requested"] += 1
+        if game_id in self.dirty:
+            self.metrics["coalesced"] += 1
+            return
+        self.dirty.add(game_id)
+        if game_id not in self.tasks:
+            self.tasks[game_id] = self.loop.create_task(self._run(game_id))
+
+    def schedule(self, game_id: int) -> None:
+        """mark_dirty from any thread (sync routes run in the threadpool)"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            if self.loop and not self.loop.is_closed():
+                self.loop.call_soon_threadsafe(self.mark_dirty, game_id)
+            return
+        self.mark_dirty(game_id)
+
+    async def _run(self, game_id: int) -> None:
+        """Flush while the game keeps getting dirty, pausing one interval after each flush"""
+        try:
+            while game_id in self.dirty:
+                self.dirty.discard(game_id)
+                try:
+                    await broadcast_scoreboard_update(game_id)
+                    self.metrics["flushed"] += 1
+                except Exception as e:
+                    self.metrics["errors"] += 1
+                    logger.error(f"Scoreboard broadcast failed for game {game_id}: {e}")
+                await asyncio.sleep(self.interval)
+        finally:
+            self.tasks.pop(game_id, None)
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Broadcast counters; coalesced = requests folded into an already pending flush"""
+        return {
+            **self.metrics,
+            "pending": len(self.dirty),
+            "interval_ms": int(self.interval * 1000),
+        }
+
+
+# Global broadcaster
+scoreboard_broadcaster = ScoreboardBroadcaster()
+
+
+def schedule_scoreboard_update(game_id: int) -> None:
+    """Mark a game's scoreboard dirty on every worker; it is broadcast within one interval"""
+    pubsub.publish(SCOREBOARD_CHANNEL, {"game_id": game_id})
+    scoreboard_broadcaster.schedule(game_id)
+
+
+def _on_remote_scoreboard(message: dict) -> None:
+    """
+    Another worker recorded an event: our cached live state is stale, and our
+    own clients in the game need a scoreboard (with this worker's patch seq)
+    """
+    game_id = message["game_id"]
+    live_game_registry.evict(game_id, publish=False)
+    if game_rooms.get(game_id):
+        scoreboard_broadcaster.mark_dirty(game_id)
+
+
+async def _emit_to_room(event: str, message: dict, room: str) -> None:
+    """Emit to a room's clients on this worker and on the others"""
+    pubsub.publish(EMIT_CHANNEL, {"event": event, "message": message, "room": room})
+    await sio.emit(event, message, room=room)
+
+
+def _on_remote_emit(message: dict) -> None:
+    asyncio.get_running_loop().create_task(
+        sio.emit(message["event"], message["message"], room=message["room"])
+    )
+
+
+pubsub.subscribe(SCOREBOARD_CHANNEL, _on_remote_scoreboard)
+pubsub.subscribe(EMIT_CHANNEL, _on_remote_emit)
+
+
 async def broadcast_game_status_update(game_id: int, status: str):
     """
     Broadcast game status change to all clients in game room
     """
-    with get_db_context() as db:
-        game = db.query(Game).filter(Game.id == game_id).first()
+    async with get_async_db_context() as db:
+        game = await db.get(Game, game_id)
         if not game:
             return
     
@@ -237,7 +537,7 @@ async def broadcast_game_status_update(game_id: int, status: str):
         "timestamp": datetime.utcnow().isoformat()
     }
     
-    await sio.emit("game_status_update", message, room=f"game_{game_id}")
+    await _emit_to_room("game_status_update", message, f"game_{game_id}")
     logger.info(f"📡 Broadcasted game status update for game {game_id}: {status}")
 
 
@@ -245,8 +545,8 @@ async def broadcast_event_created(game_id: int, event_id: int):
     """
     Broadcast new event to all clients in game room
     """
-    with get_db_context() as db:
-        event = db.query(GameEvent).filter(GameEvent.id == event_id).first()
+    async with get_async_db_context() as db:
+        event = await db.get(GameEvent, event_id)
         if not event:
             return
     
@@ -258,12 +558,12 @@ async def broadcast_event_created(game_id: int, event_id: int):
         "period": event.period,
         "timestamp": event.timestamp,
         "outcome": event.outcome,
-        "player_id": event.player_id,
+        "player_id": event.user_id,
         "team_id": event.team_id,
         "created_at": event.created_at.isoformat()
     }
     
-    await sio.emit("event_created", message, room=f"game_{game_id}")
+    await _emit_to_room("event_created", message, f"game_{game_id}")
     logger.info(f"📡 Broadcasted event {event_id} for game {game_id}")
 
 
@@ -278,7 +578,7 @@ async def broadcast_event_deleted(game_id: int, event_id: int):
         "timestamp": datetime.utcnow().isoformat()
     }
     
-    await sio.emit("event_deleted", message, room=f"game_{game_id}")
+    await _emit_to_room("event_deleted", message, f"game_{game_id}")
     logger.info(f"📡 Broadcasted event deletion {event_id} for game {game_id}")
 
 
@@ -294,18 +594,25 @@ async def broadcast_roster_update(game_id: int, player_id: int, status: str):
         "timestamp": datetime.utcnow().isoformat()
     }
     
-    await sio.emit("roster_update", message, room=f"game_{game_id}")
+    await _emit_to_room("roster_update", message, f"game_{game_id}")
     logger.info(f"📡 Broadcasted roster update for game {game_id}")
 
 
+def _local_game_room_counts() -> Dict[int, int]:
+    return {game_id: len(clients) for game_id, clients in game_rooms.items() if clients}
+
+
+presence.register("game", _local_game_room_counts)
+
+
 def get_game_room_client_count(game_id: int) -> int:
-    """Get number of connected clients for a game"""
-    return len(game_rooms.get(game_id, set()))
+    """Get number of connected clients for a game, across all workers"""
+    return presence.count("game", game_id)
 
 
 def get_connected_games() -> Dict[int, int]:
-    """Get all games with connected clients and their client count"""
-    return {game_id: len(clients) for game_id, clients in game_rooms.items() if clients}
+    """Get all games with connected clients and their client count, across all workers"""
+    return presence.counts("game")
 
 
 # ==================== ASGI APP ====================
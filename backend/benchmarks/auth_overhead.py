@@ -0,0 +1,106 @@
+"""
+Auth overhead benchmark
+Times the get_current_user dependency used by /api/games/* for a stream of
+requests from a pool of clients that each keep reusing their access token:
+without caches (jwt.decode + user SELECT per request, as before), with the
+authenticated-user cache only, and with the verified-token cache as well
+Usage (from backend/): python -m benchmarks.auth_overhead [--clients 50] [--requests 5000]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Base, User
+from app.routes_auth import get_current_user
+from app.security import create_access_token, verified_token_cache, TOKEN_CACHE_SIZE
+from app.services_auth_cache import auth_user_cache, AUTH_USER_CACHE_SIZE
+from app.services_token_revocation import token_revocations
+
+
+def seed_users(path: str, clients: int) -> list:
+    """`clients` users in a file-backed SQLite database; returns their ids"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    users = [User(email=f"c{i}@bench", username=f"c{i}", password_hash="x") for i in range(clients)]
+    db.add_all(users)
+    db.commit()
+    user_ids = [user.id for user in users]
+    db.close()
+    engine.dispose()
+    return user_ids
+
+
+async def run(SessionAsync, headers: list, requests: int, seed: int) -> list:
+    """Per-request get_current_user time in microseconds, one session per request"""
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(requests):
+        authorization = rng.choice(headers)
+        async with SessionAsync() as db:
+            start = time.perf_counter()
+            await get_current_user(authorization=authorization, db=db)
+            samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def configure(user_cache: bool, token_cache: bool) -> None:
+    """Size 0 turns a cache into a pass-through"""
+    auth_user_cache.maxsize = AUTH_USER_CACHE_SIZE if user_cache else 0
+    verified_token_cache.maxsize = TOKEN_CACHE_SIZE if token_cache else 0
+    auth_user_cache.clear()
+    verified_token_cache.clear()
+
+
+async def main_async(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        user_ids = seed_users(path, args.clients)
+        # Revocation checks read the benchmark database, not the app's
+        revocation_engine = create_engine(f"sqlite:///{path}")
+        token_revocations.session_factory = sessionmaker(bind=revocation_engine)
+        token_revocations.rebuild()
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        SessionAsync = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        headers = [f"Bearer {create_access_token({'sub': str(user_id)})}" for user_id in user_ids]
+
+        print(f"get_current_user: {args.clients} clients, {args.requests} requests "
+              f"(~{args.requests // args.clients} per token)")
+        print(f"{'configuration':<28}{'median us':>12}{'p95 us':>12}{'mean us':>12}")
+        for label, user_cache, token_cache in (
+            ("no caches (before)", False, False),
+            ("user cache", True, False),
+            ("user + token cache", True, True),
+        ):
+            configure(user_cache, token_cache)
+            samples = await run(SessionAsync, headers, args.requests, seed=7)
+            samples.sort()
+            p95 = samples[int(len(samples) * 0.95)]
+            print(f"{label:<28}{statistics.median(samples):>12.1f}{p95:>12.1f}{statistics.fmean(samples):>12.1f}")
+        await engine.dispose()
+        revocation_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
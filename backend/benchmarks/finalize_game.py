@@ -0,0 +1,204 @@
+"""
+finalize_game benchmark
+Times the per-player SELECT/COMMIT loop finalize_game used to run against the
+bulk upsert path, for a first finalize, a re-finalize and a corrected re-finalize
+Both paths do the same work: the PlayerGameStats rows, career and leaderboard
+totals and standings; only the PlayerGameStats write differs
+Usage (from backend/): python -m benchmarks.finalize_game [--players 40] [--events 1500]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, event, and_
+from sqlalchemy.orm import sessionmaker
+
+from app.models import (
+    Base, User, Team, Game, GameEvent, GamePlayer, PlayerGameStats, LivePlayerGameStats,
+)
+from app.services import LiveBoxScoreService, STAT_COUNTER_FIELDS
+from app.services_career_stats import CareerStatsService
+from app.services_games import GameService
+from app.services_leaderboards import LeaderboardService
+from app.services_standings import StandingsService
+
+EVENT_MIX = [("2PT", "made"), ("2PT", "miss"), ("3PT", "made"), ("3PT", "miss"), ("FT", "made"),
+             ("FT", "miss"), ("AST", None), ("REB", None), ("REB", None), ("FLS", None)]
+
+
+def make_engine(path: str):
+    """File-backed SQLite engine with the app's WAL settings"""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragma(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def seed_game(db, players: int, events: int, rng: random.Random) -> int:
+    """One in-progress game with `players` split across two teams and `events` scoring events"""
+    suffix = rng.randrange(10 ** 9)
+    users = [
+        User(email=f"p{suffix}_{i}@bench", username=f"p{suffix}_{i}", password_hash="x", first_name=f"P{i}")
+        for i in range(players)
+    ]
+    db.add_all(users)
+    db.flush()
+    home = Team(name=f"Home {suffix}", owner_id=users[0].id)
+    away = Team(name=f"Away {suffix}", owner_id=users[1].id)
+    db.add_all([home, away])
+    db.flush()
+    game = Game(home_team_id=home.id, away_team_id=away.id, status="in_progress",
+                created_by=users[0].id, match_date=datetime.utcnow())
+    db.add(game)
+    db.flush()
+
+    roster = []
+    for i, user in enumerate(users):
+        team_id = home.id if i < players // 2 else away.id
+        roster.append((user.id, team_id))
+        db.add(GamePlayer(game_id=game.id, user_id=user.id, team_id=team_id, jersey_number=i, is_starter=i % 4 == 0))
+
+    db.execute(GameEvent.__table__.insert(), [
+        {
+            "game_id": game.id, "user_id": user_id, "team_id": team_id, "event_type": event_type,
+            "period": 1 + n * 4 // events, "timestamp": n, "outcome": outcome, "created_at": datetime.utcnow(),
+        }
+        for n in range(events)
+        for (user_id, team_id), (event_type, outcome) in [(rng.choice(roster), rng.choice(EVENT_MIX))]
+    ])
+    db.commit()
+
+    # Live rows are kept current by the event write path; build them the same way here
+    LiveBoxScoreService.rebuild(game, db)
+    return game.id
+
+
+def legacy_finalize(db, game_id: int) -> int:
+    """
+    The previous finalize_game body (one SELECT per player, COMMIT + REFRESH per
+    updated row), followed by the same career, leaderboard and standings updates
+    as the current path
+    """
+    game = db.query(Game).filter(Game.id == game_id).first()
+    live_rows = LiveBoxScoreService.get_player_rows(game, db)
+    player_stats = {
+        row.user_id: {field: getattr(row, field) for field in STAT_COUNTER_FIELDS}
+        for row in live_rows
+    }
+    team_by_player = dict(db.query(GamePlayer.user_id, GamePlayer.team_id).filter(GamePlayer.game_id == game_id).all())
+    team_by_player.update((row.user_id, row.team_id) for row in live_rows)
+    old_rows = CareerStatsService.game_rows(game_id, db)
+
+    created_stats = []
+    for player_id, stats in player_stats.items():
+        existing_stats = db.query(PlayerGameStats).filter(
+            and_(PlayerGameStats.player_id == player_id, PlayerGameStats.game_id == game_id)
+        ).first()
+        if existing_stats:
+            for key, value in stats.items():
+                setattr(existing_stats, key, value)
+            existing_stats.updated_at = datetime.utcnow()
+            db.commit()
+            db.refresh(existing_stats)
+            created_stats.append(existing_stats)
+        else:
+            player_game_stat = PlayerGameStats(player_id=player_id, game_id=game_id, **stats)
+            db.add(player_game_stat)
+            created_stats.append(player_game_stat)
+
+    deltas = CareerStatsService.diff_game_rows(old_rows, player_stats)
+    CareerStatsService.apply_deltas(deltas, db)
+    LeaderboardService.apply_game_deltas(game, deltas, team_by_player, db)
+    game.status = "completed"
+    game.ended_at = datetime.utcnow()
+    StandingsService.sync_game(game, db)
+    db.commit()
+    return len(created_stats)
+
+
+def bulk_finalize(db, game_id: int) -> int:
+    """The current GameService.finalize_game"""
+    return GameService(db).finalize_game(game_id)["total_players"]
+
+
+def correct_game(db, game_id: int, rng: random.Random) -> None:
+    """Simulate a scorer correction: shift a few live counters before re-finalizing"""
+    rows = db.query(LivePlayerGameStats).filter(LivePlayerGameStats.game_id == game_id).all()
+    for row in rng.sample(rows, min(5, len(rows))):
+        row.points += 2
+        row.shots_made += 1
+        row.shots_attempted += 1
+    db.commit()
+
+
+def time_call(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def run(SessionLocal, finalize, players: int, events: int, rounds: int, seed: int):
+    """Return {phase: [ms, ...]} for first finalize, re-finalize and corrected re-finalize"""
+    rng = random.Random(seed)
+    timings = {"first finalize": [], "re-finalize": [], "corrected re-finalize": []}
+    query_counts = {}
+    for _ in range(rounds):
+        db = SessionLocal()
+        try:
+            game_id = seed_game(db, players, events, rng)
+            db.expire_all()
+
+            for phase in timings:
+                if phase == "corrected re-finalize":
+                    correct_game(db, game_id, rng)
+                db.expire_all()
+
+                statements = []
+                listener = lambda *a: statements.append(1)
+                event.listen(db.get_bind(), "before_cursor_execute", listener)
+                timings[phase].append(time_call(finalize, db, game_id))
+                event.remove(db.get_bind(), "before_cursor_execute", listener)
+                query_counts[phase] = len(statements)
+        finally:
+            db.close()
+    return timings, query_counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=40)
+    parser.add_argument("--events", type=int, default=1500)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"finalize_game: {args.players} players, {args.events} events, median of {args.rounds} games")
+    print(f"{'path':<8}{'phase':<24}{'median ms':>12}{'queries':>10}")
+    for label, finalize in (("legacy", legacy_finalize), ("bulk", bulk_finalize)):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = make_engine(os.path.join(tmp, "bench.db"))
+            SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+            timings, query_counts = run(SessionLocal, finalize, args.players, args.events, args.rounds, seed=7)
+            for phase, samples in timings.items():
+                print(f"{label:<8}{phase:<24}{statistics.median(samples):>12.2f}{query_counts[phase]:>10}")
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
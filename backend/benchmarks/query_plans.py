@@ -0,0 +1,183 @@
+"""
+Query plan benchmark for the composite index pack
+Builds a scratch SQLite database with the pre-migration schema, prints the
+plan and timing of each hot query, applies the migrations and prints them again
+Usage (from backend/): python -m benchmarks.query_plans [--games 200] [--events 1500]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, text
+
+from app.models import Base
+from app.services import STAT_COUNTER_FIELDS
+from app.migrations import INDEXED_MODELS, run_migrations
+
+EVENT_TYPES = ["2PT", "3PT", "FT", "AST", "REB", "FLS", "TO", "SUB", "FOUL_PUSHING", "PERIOD_START"]
+
+# (label, SQL) for the access patterns used by the live and stats paths
+HOT_QUERIES = [
+    ("box score aggregate",
+     "SELECT user_id, team_id, event_type, outcome, COUNT(id) FROM game_events "
+     "WHERE game_id = :game_id GROUP BY user_id, team_id, event_type, outcome"),
+    ("latest event",
+     "SELECT * FROM game_events WHERE game_id = :game_id ORDER BY created_at DESC LIMIT 1"),
+    ("current period",
+     "SELECT * FROM game_events WHERE game_id = :game_id AND event_type = 'PERIOD_START' "
+     "ORDER BY created_at DESC LIMIT 1"),
+    ("event log",
+     "SELECT * FROM game_events WHERE game_id = :game_id ORDER BY timestamp"),
+    ("player fouls",
+     "SELECT COUNT(id) FROM game_events WHERE game_id = :game_id AND user_id = :user_id "
+     "AND event_type IN ('FLS', 'FOUL_PUSHING')"),
+    ("team fouls",
+     "SELECT COUNT(id) FROM game_events WHERE game_id = :game_id AND team_id = :team_id "
+     "AND event_type IN ('FLS', 'FOUL_PUSHING')"),
+    ("upcoming games",
+     "SELECT * FROM games WHERE status = 'scheduled' ORDER BY match_date LIMIT 20"),
+    ("completed games",
+     "SELECT * FROM games WHERE status = 'completed' ORDER BY created_at DESC LIMIT 20"),
+    ("team captain",
+     "SELECT user_id FROM team_members WHERE team_id = :team_id AND is_captain = 1 AND status = 'active'"),
+    ("player game stats",
+     "SELECT * FROM player_game_stats WHERE player_id = :user_id AND game_id = :game_id"),
+]
+
+
+def build_legacy_schema(engine):
+    """Create all tables, then drop the composite indexes to match a pre-migration database"""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for model in INDEXED_MODELS:
+            for index in model.__table__.indexes:
+                if len(index.columns) > 1:
+                    conn.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+
+
+def seed(engine, games: int, events_per_game: int, players_per_team: int = 10):
+    """Bulk load users, teams, members, games, events and per-game stats"""
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    teams = max(2, games // 5)
+    users = teams * players_per_team
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, email, username, password_hash, is_active, created_at, updated_at) "
+            "VALUES (:id, :email, :username, 'x', 1, :now, :now)"
+        ), [{"id": i, "email": f"u{i}@bench", "username": f"u{i}", "now": now} for i in range(1, users + 1)])
+        conn.execute(text(
+            "INSERT INTO teams (id, name, created_at, updated_at) VALUES (:id, :name, :now, :now)"
+        ), [{"id": t, "name": f"Team {t}", "now": now} for t in range(1, teams + 1)])
+        conn.execute(text(
+            "INSERT INTO team_members (team_id, user_id, role, is_admin, is_captain, is_vice_captain, status, joined_at, "
+            "created_at, updated_at) VALUES (:team_id, :user_id, 'member', 0, :is_captain, 0, 'active', :now, :now, :now)"
+        ), [
+            {"team_id": t, "user_id": (t - 1) * players_per_team + p + 1, "is_captain": int(p == 0), "now": now}
+            for t in range(1, teams + 1) for p in range(players_per_team)
+        ])
+
+        game_rows, event_rows, stat_rows = [], [], []
+        for g in range(1, games + 1):
+            home, away = rng.sample(range(1, teams + 1), 2)
+            status = rng.choice(["scheduled", "in_progress", "completed", "completed"])
+            game_rows.append({
+                "id": g, "home": home, "away": away, "status": status,
+                "match_date": now + timedelta(days=rng.randint(-60, 60)),
+                "created_at": now - timedelta(minutes=g), "now": now,
+            })
+            if status == "scheduled":
+                continue
+            for n in range(events_per_game):
+                team_id = rng.choice([home, away])
+                user_id = (team_id - 1) * players_per_team + rng.randrange(players_per_team) + 1
+                event_type = rng.choice(EVENT_TYPES)
+                event_rows.append({
+                    "game_id": g, "user_id": user_id, "team_id": team_id, "event_type": event_type,
+                    "period": 1 + n * 4 // events_per_game, "timestamp": n,
+                    "outcome": rng.choice(["made", "miss"]) if event_type in ("2PT", "3PT", "FT") else None,
+                    "created_at": now + timedelta(seconds=n),
+                })
+            if status == "completed":
+                for team_id in (home, away):
+                    for p in range(players_per_team):
+                        stat_rows.append({"player_id": (team_id - 1) * players_per_team + p + 1, "game_id": g, "now": now})
+
+        conn.execute(text(
+            "INSERT INTO games (id, home_team_id, away_team_id, home_score, away_score, status, match_date, "
+            "timeout_active, created_at, updated_at) "
+            "VALUES (:id, :home, :away, 0, 0, :status, :match_date, 0, :created_at, :now)"
+        ), game_rows)
+        conn.execute(text(
+            "INSERT INTO game_events (game_id, user_id, team_id, event_type, period, timestamp, outcome, created_at) "
+            "VALUES (:game_id, :user_id, :team_id, :event_type, :period, :timestamp, :outcome, :created_at)"
+        ), event_rows)
+        conn.execute(text(
+            "INSERT INTO player_game_stats (player_id, game_id, created_at, updated_at, "
+            f"{', '.join(STAT_COUNTER_FIELDS)}) VALUES (:player_id, :game_id, :now, :now, "
+            f"{', '.join('0' for _ in STAT_COUNTER_FIELDS)})"
+        ), stat_rows)
+        conn.execute(text("ANALYZE"))
+
+    return {"game_id": games // 2 or 1, "team_id": 1, "user_id": 1}
+
+
+def report(engine, params, repeat: int):
+    """Print EXPLAIN QUERY PLAN and mean latency for each hot query"""
+    results = {}
+    with engine.connect() as conn:
+        for label, sql in HOT_QUERIES:
+            plan = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params).fetchall()
+            start = time.perf_counter()
+            for _ in range(repeat):
+                conn.execute(text(sql), params).fetchall()
+            elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+            results[label] = elapsed_ms
+            print(f"\n{label}: {elapsed_ms:.3f} ms")
+            for row in plan:
+                print(f"    {row[-1]}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--events", type=int, default=1500, help="events per started game")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        build_legacy_schema(engine)
+        params = seed(engine, args.games, args.events)
+
+        print("=" * 60)
+        print("BEFORE (single-column indexes only)")
+        print("=" * 60)
+        before = report(engine, params, args.repeat)
+
+        created = run_migrations(engine)
+        print("\n" + "=" * 60)
+        print(f"AFTER (created: {', '.join(created)})")
+        print("=" * 60)
+        after = report(engine, params, args.repeat)
+
+        print("\n" + "=" * 60)
+        print(f"{'query':<22}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+        for label, _ in HOT_QUERIES:
+            speedup = before[label] / after[label] if after[label] else float("inf")
+            print(f"{label:<22}{before[label]:>12.3f}{after[label]:>12.3f}{speedup:>9.1f}x")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Maintenance commands for Scoring Basket
+Usage (from backend/): python -m app.commands <command>
+    backfill-standings      Rebuild team standings and tournament wins/losses from completed games
+    backfill-career-stats   Rebuild UserStats career totals from PlayerGameStats
+                            [--workers N] [--chunk-size N]
+    backfill-leaderboards   Rebuild tournament/team leaderboard totals from PlayerGameStats
+"""
+
+import argparse
+import time
+
+from .database import SessionLocal, get_db_context, init_db
+
+
+def backfill_standings(args) -> None:
+    """Rebuild team_standings, game_results and TournamentTeam wins/losses"""
+    from .services_standings import StandingsService
+
+    start = time.perf_counter()
+    with get_db_context() as db:
+        count = StandingsService.backfill(db)
+    print(f"✅ Standings rebuilt from {count} completed games in {time.perf_counter() - start:.2f}s")
+
+
+def backfill_career_stats(args) -> None:
+    """Rebuild UserStats career totals, chunked by user across worker threads"""
+    from .services_career_stats import CareerStatsService
+
+    start = time.perf_counter()
+    count = CareerStatsService.backfill(SessionLocal, workers=args.workers, chunk_size=args.chunk_size)
+    print(f"✅ Career stats rebuilt for {count} users in {time.perf_counter() - start:.2f}s")
+
+
+def backfill_leaderboards(args) -> None:
+    """Rebuild player_scope_stats"""
+    from .services_leaderboards import LeaderboardService
+
+    start = time.perf_counter()
+    with get_db_context() as db:
+        count = LeaderboardService.backfill(db)
+    print(f"✅ Leaderboards rebuilt ({count} scope rows) in {time.perf_counter() - start:.2f}s")
+
+
+COMMANDS = {
+    "backfill-standings": backfill_standings,
+    "backfill-career-stats": backfill_career_stats,
+    "backfill-leaderboards": backfill_leaderboards,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scoring Basket maintenance commands")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    parser.add_argument("--workers", type=int, default=4, help="parallel workers for backfills")
+    parser.add_argument("--chunk-size", type=int, default=500, help="users per backfill chunk")
+    args = parser.parse_args()
+
+    init_db()
+    COMMANDS[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,26 @@
 """
 Authentication middleware for Scoring Basket
 Provides JWT token validation and user authentication
+plus per-request SQL query stats and rate limiting
 """
 
 from typing import Optional
+import logging
+import math
 from fastapi import HTTPException, status, Header, Depends
-from sqlalchemy.orm import Session
-from .database import get_db_session
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from sqlalchemy.ext.asyncio import AsyncSession
+from .database import get_async_db_session, QueryStats, current_query_stats, DB_N_PLUS_ONE_THRESHOLD
 from .models import User
-from .security import verify_access_token
+from .security import access_token_claims_async, decode_token
+from .services_auth_cache import AuthResolver
+from .services_rate_limit import RateLimit, RateLimiter, rate_limiter, RATE_LIMIT_TRUST_FORWARDED
 
 
 async def authorize_middleware(
     authorization: Optional[str] = Header(None, alias="Authorization"),
-    db: Session = Depends(get_db_session)
+    db: AsyncSession = Depends(get_async_db_session)
 ) -> User:
     """
     FastAPI dependency for JWT token authentication
@@ -39,16 +46,16 @@ async def authorize_middleware(
         )
 
     # Verify token
-    user_id = verify_access_token(token)
-    if user_id is None:
+    claims = await access_token_claims_async(token)
+    if claims is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Get user from database
-    user = db.query(User).filter(User.id == user_id).first()
+    # Get user, from the auth cache when possible
+    user = await AuthResolver.get_user_async(db, *claims)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -56,4 +63,95 @@ async def authorize_middleware(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return user
\ No newline at end of file
+    return user
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware that counts SQL statements and DB time per HTTP request
+    Adds X-DB-Queries / X-DB-Time-ms response headers and logs a warning with
+    the statement fingerprint when one statement repeats more than the threshold
+    """
+
+    def __init__(self, app, threshold: int = DB_N_PLUS_ONE_THRESHOLD):
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.count).encode()))
+                headers.append((b"x-db-time-ms", f"{stats.total_time_ms:.2f}".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            current_query_stats.reset(token)
+            for statement, count in stats.repeated_statements(self.threshold).items():
+                logger.warning(
+                    f"⚠️  Possible N+1: statement ran {count} times in "
+                    f"{scope['method']} {scope['path']}: {statement}"
+                )
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware that answers 429 with Retry-After once a client runs out
+    of tokens on a rate-limited route, before the route does any work
+    Routes without a rule pass through after one dict lookup
+    """
+
+    def __init__(self, app, limiter: RateLimiter = rate_limiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.limiter.rule_for(scope["method"], scope["path"])
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        wait = self.limiter.check(limit, self.identity(scope, limit))
+        if wait:
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "Too many requests, please try again later"},
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def identity(scope, limit: RateLimit) -> str:
+        """Bucket owner: the token subject for per-user rules, otherwise the client IP"""
+        headers = Headers(scope=scope)
+        if limit.key == "user":
+            authorization = headers.get("authorization", "")
+            if authorization.startswith("Bearer "):
+                payload = decode_token(authorization[7:])
+                if payload and payload.get("sub"):
+                    return f"user:{payload['sub']}"
+
+        if RATE_LIMIT_TRUST_FORWARDED and headers.get("x-forwarded-for"):
+            return f"ip:{headers['x-forwarded-for'].split(',')[0].strip()}"
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
@@ -0,0 +1,166 @@
+"""
+Schema migrations for existing databases
+Adds objects introduced after a database was first created and seeds the
+derived tables (career totals, standings) from existing games, idempotently,
+so they can run at every startup
+Usage: python -m app.migrations
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from typing import List
+import logging
+
+from .models import Game, GameEvent, TeamMember, PlayerGameStats, UserStats, TeamStanding
+
+logger = logging.getLogger(__name__)
+
+# Tables whose composite indexes are declared in __table_args__
+INDEXED_MODELS = (GameEvent, Game, TeamMember, PlayerGameStats, UserStats)
+
+# Columns added to existing tables; each needs a server_default
+ADDED_COLUMNS = {
+    UserStats: ("total_fouls", "total_violations", "total_shots_made", "total_shots_attempted"),
+}
+
+
+def dedupe_player_game_stats(engine: Engine) -> int:
+    """
+    Delete duplicate (player_id, game_id) rows, keeping the newest, so the
+    unique index can be created on databases written by the old upsert loop
+    Returns the number of rows deleted
+    """
+    with engine.begin() as conn:
+        result = conn.execute(text("""
+            DELETE FROM player_game_stats
+            WHERE id NOT IN (
+                SELECT MAX(id) FROM player_game_stats GROUP BY player_id, game_id
+            )
+        """))
+        return result.rowcount or 0
+
+
+def migrate_indexes(engine: Engine) -> List[str]:
+    """
+    Create any missing composite indexes on existing tables
+    Returns the names of the indexes that were created
+    """
+    created = []
+    for model in INDEXED_MODELS:
+        table = model.__table__
+        with engine.connect() as conn:
+            if not engine.dialect.has_table(conn, table.name):
+                continue
+            existing = {index["name"] for index in engine.dialect.get_indexes(conn, table.name)}
+
+        for index in table.indexes:
+            if index.name in existing or len(index.columns) < 2:
+                continue
+            if index.unique and table.name == PlayerGameStats.__tablename__:
+                removed = dedupe_player_game_stats(engine)
+                if removed:
+                    logger.warning(f"Removed {removed} duplicate player_game_stats rows")
+            index.create(bind=engine, checkfirst=True)
+            created.append(index.name)
+            logger.info(f"Created index {index.name}")
+
+    return created
+
+
+def migrate_columns(engine: Engine) -> List[str]:
+    """
+    Add any missing ADDED_COLUMNS with ALTER TABLE ... ADD COLUMN
+    Returns the "table.column" names that were added
+    """
+    added = []
+    for model, column_names in ADDED_COLUMNS.items():
+        table = model.__table__
+        with engine.connect() as conn:
+            if not engine.dialect.has_table(conn, table.name):
+                continue
+            existing = {column["name"] for column in engine.dialect.get_columns(conn, table.name)}
+
+        for name in column_names:
+            if name in existing:
+                continue
+            column = table.columns[name]
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {name} {column.type.compile(engine.dialect)}"
+            if column.server_default is not None:
+                ddl += f" DEFAULT {column.server_default.arg}"
+            if not column.nullable:
+                ddl += " NOT NULL"
+            with engine.begin() as conn:
+                conn.execute(text(ddl))
+            added.append(f"{table.name}.{name}")
+            logger.info(f"Added column {table.name}.{name}")
+
+    return added
+
+
+def seed_career_stats(engine: Engine, columns_added: bool = False) -> int:
+    """
+    Backfill UserStats career totals on databases that predate them: when the
+    total columns were just added, or no user has totals yet but games were
+    played. Returns the number of users processed (0 when nothing was needed)
+    """
+    from .services_career_stats import CareerStatsService
+
+    with engine.connect() as conn:
+        if not all(engine.dialect.has_table(conn, model.__tablename__) for model in (UserStats, PlayerGameStats)):
+            return 0
+
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as db:
+        needed = columns_added or (
+            db.query(PlayerGameStats.id).first() is not None
+            and db.query(UserStats.id).filter(UserStats.total_matches > 0).first() is None
+        )
+    if not needed:
+        return 0
+
+    count = CareerStatsService.backfill(session_factory)
+    logger.info(f"Backfilled career stats for {count} users")
+    return count
+
+
+def seed_standings(engine: Engine) -> int:
+    """
+    Backfill team standings on databases that have completed games but no
+    standings yet. Returns the number of games replayed (0 when nothing was needed)
+    """
+    from .services_standings import StandingsService
+
+    with engine.connect() as conn:
+        if not engine.dialect.has_table(conn, TeamStanding.__tablename__):
+            return 0
+
+    with sessionmaker(bind=engine)() as db:
+        if db.query(TeamStanding.id).first() is not None:
+            return 0
+        if db.query(Game.id).filter(Game.status == "completed").first() is None:
+            return 0
+        count = StandingsService.backfill(db)
+    logger.info(f"Backfilled standings from {count} completed games")
+    return count
+
+
+def run_migrations(engine: Engine) -> List[str]:
+    """Apply all migrations, returning what was created"""
+    added = migrate_columns(engine)
+    created = added + migrate_indexes(engine)
+    seed_career_stats(engine, columns_added=any(name.startswith(f"{UserStats.__tablename__}.") for name in added))
+    seed_standings(engine)
+    if created and engine.dialect.name in ("sqlite", "postgresql"):
+        # Refresh planner statistics so the new indexes get picked
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+    return created
+
+
+if __name__ == "__main__":
+    from .database import engine
+
+    logging.basicConfig(level=logging.INFO)
+    created = run_migrations(engine)
+    print(f"✅ Migrations applied ({len(created)} columns/indexes created)")
@@ -5,11 +5,18 @@ Handles user registration, login, profile management
 
 from fastapi import APIRouter, Depends, HTTPException, status, Header, Query
 from typing import Optional, List
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import or_
-from .database import get_db_session
+from .database import get_db_session, get_async_db_session
 from .models import User, UserProfile, UserStats, FAVORITE_PLAYERS, HandStyle, TeamMember
-from .security import create_access_token, create_refresh_token, verify_access_token
+from .security import (
+    create_access_token, create_refresh_token, access_token_claims_async,
+    password_hasher, PasswordHashOverloaded, verified_token_cache
+)
+from .services_auth_cache import AuthResolver, auth_user_cache
+from .services_token_revocation import token_revocations
+from .services_rate_limit import rate_limiter
 from .services_auth import AuthService
 from .schemas_auth import (
     UserRegister, UserLogin, UserProfileUpdate, ChangePassword,
@@ -18,7 +25,7 @@ from .schemas_auth import (
 from .services_auth import AuthService
 
 # JWT Authentication dependency
-def get_current_user(authorization: Optional[str] = Header(None), db: Session = Depends(get_db_session)) -> User:
+async def get_current_user(authorization: Optional[str] = Header(None), db: AsyncSession = Depends(get_async_db_session)) -> User:
     """Get current authenticated user from JWT token"""
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(
@@ -31,16 +38,17 @@ def get_current_user(authorization: Optional[str] = Header(None), db: Session =
     token = authorization.split(" ")[1]
 
     # Verify token
-    user_id = verify_access_token(token)
-    if user_id is None:
+    claims = await access_token_claims_async(token)
+    if claims is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Get user from database with profile relationship
-    user = db.query(User).options(joinedload(User.profile)).filter(User.id == user_id).first()
+    # Get user, from the auth cache when possible; routes that need the
+    # profile load it themselves (see /me)
+    user = await AuthResolver.get_user_async(db, *claims)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -97,7 +105,7 @@ async def get_hand_styles():
 
 
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserRegister, db = Depends(get_db_session)):
+def register(user_data: UserRegister, db = Depends(get_db_session)):
     """Register a new user"""
     user, error = AuthService.register_user(db, user_data)
     
@@ -114,10 +122,10 @@ async def register(user_data: UserRegister, db = Depends(get_db_session)):
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(credentials: UserLogin, db = Depends(get_db_session)):
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_async_db_session)):
     """Login user and return access/refresh tokens"""
     try:
-        user, error = AuthService.authenticate_user(db, credentials)
+        user, error = await AuthService.authenticate_user_async(db, credentials)
         
         if error:
             raise HTTPException(
@@ -135,6 +143,8 @@ async def login(credentials: UserLogin, db = Depends(get_db_session)):
             "token_type": "bearer",
             "user": UserResponse.model_validate(user)
         }
+    except (HTTPException, PasswordHashOverloaded):
+        raise
     except Exception as e:
         import traceback
         print(f"❌ Login error: {str(e)}")
@@ -145,26 +155,50 @@ async def login(credentials: UserLogin, db = Depends(get_db_session)):
         )
 
 
+@router.get("/metrics")
+async def get_auth_metrics(current_user: User = Depends(get_current_user)):
+    """Password hashing pool, auth cache, token revocation and rate limit counters"""
+    return {
+        "password_hashing": password_hasher.get_metrics(),
+        "user_cache": auth_user_cache.get_metrics(),
+        "token_cache": verified_token_cache.get_metrics(),
+        "revocations": token_revocations.get_metrics(),
+        "rate_limits": rate_limiter.get_metrics(),
+    }
+
+
 @router.post("/logout")
-async def logout(current_user: User = Depends(get_current_user)):
-    """Logout user by clearing client-side tokens"""
-    return {"message": "Logged out successfully"}
+def logout(
+    authorization: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user),
+    db = Depends(get_db_session)
+):
+    """Logout user by revoking the access token on the server"""
+    success, message = AuthService.logout_user(db, current_user.id, authorization.split(" ")[1])
+    
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=message
+        )
+    
+    return {"message": message}
 
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_profile(
     current_user: User = Depends(get_current_user),
-    db = Depends(get_db_session)
+    db: AsyncSession = Depends(get_async_db_session)
 ):
     """Get current authenticated user profile"""
     # Re-fetch user with eager loading of relationships
-    user = db.query(User).filter(User.id == current_user.id).first()
+    user = await AuthService.get_user_by_id_async(db, current_user.id)
     print(f"Fetched user {user.id} with profile: {user.profile}")
     return UserResponse.model_validate(user)
 
 
 @router.put("/profile", response_model=UserResponse)
-async def update_profile(
+def update_profile(
     profile_data: UserProfileUpdate,
     current_user: User = Depends(get_current_user),
     db = Depends(get_db_session)
@@ -191,7 +225,7 @@ async def update_profile(
 
 
 @router.post("/change-password")
-async def change_password(
+def change_password(
     pwd_data: ChangePassword,
     current_user: User = Depends(get_current_user),
     db = Depends(get_db_session)
@@ -214,7 +248,7 @@ async def change_password(
 
 
 @router.get("/users/{username}", response_model=UserResponse)
-async def get_user_by_username(username: str, db = Depends(get_db_session)):
+def get_user_by_username(username: str, db = Depends(get_db_session)):
     """Get public user profile by username"""
     user = AuthService.get_user_by_username(db, username)
     
@@ -228,7 +262,7 @@ async def get_user_by_username(username: str, db = Depends(get_db_session)):
 
 
 @router.get("/users/id/{user_id}", response_model=UserResponse)
-async def get_user_by_id(user_id: int, db = Depends(get_db_session)):
+def get_user_by_id(user_id: int, db = Depends(get_db_session)):
     """Get public user profile by user ID"""
     user = db.query(User).filter(User.id == user_id, User.is_active == True).first()
     
@@ -242,7 +276,7 @@ async def get_user_by_id(user_id: int, db = Depends(get_db_session)):
 
 
 @router.get("/search-users", response_model=List[UserSearchResponse])
-async def search_users(
+def search_users(
     q: str = Query(..., description="Search query for user name or phone"),
     team_id: Optional[int] = Query(None, description="Team ID to exclude existing members"),
     current_user: User = Depends(get_current_user),
@@ -301,7 +335,7 @@ async def search_users(
 
 
 @router.post("/deactivate")
-async def deactivate_account(
+def deactivate_account(
     current_user: User = Depends(get_current_user),
     db = Depends(get_db_session)
 ):
@@ -7,8 +7,74 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
-from .models import Team, Player, Game, GameEvent
+from .models import (
+    Team, Player, Game, GameEvent, GamePlayer, User,
+    LivePlayerGameStats, LiveTeamGameStats,
+)
 from .schemas import PlayerStats, TeamScore, EventType
+from .services_names import NameLoader, format_display_name, UNKNOWN_PLAYER
+
+
+# Event types that count as personal fouls / violations in the box score
+FOUL_EVENT_TYPES = (
+    "FLS", "FOUL_BLOCKING", "FOUL_CHARGING", "FOUL_HOLDING", "FOUL_PUSHING",
+    "FOUL_HAND_CHECKING", "FOUL_ILLEGAL_SCREEN", "FOUL_ELBOWING", "FOUL_SHOOTING",
+)
+VIOLATION_EVENT_TYPES = ("VIOLATION_TRAVELING", "VIOLATION_DOUBLE_DRIBBLE")
+
+# Event types accepted by EventValidationService, and those that need a player
+VALID_EVENT_TYPES = frozenset(
+    [event_type.value for event_type in EventType] + list(FOUL_EVENT_TYPES) + list(VIOLATION_EVENT_TYPES)
+)
+PLAYER_EVENT_TYPES = frozenset(
+    ["2PT", "3PT", "FT", "AST", "REB", "SUB"] + list(FOUL_EVENT_TYPES) + list(VIOLATION_EVENT_TYPES)
+)
+
+# Counter columns shared by PlayerGameStats and the box score engine
+STAT_COUNTER_FIELDS = (
+    "points", "assists", "rebounds", "fouls", "violations",
+    "shots_made", "shots_attempted",
+    "two_pointers_made", "two_pointers_attempted",
+    "three_pointers_made", "three_pointers_attempted",
+    "free_throws_made", "free_throws_attempted",
+)
+
+
+def empty_stat_counters() -> Dict[str, int]:
+    """Return a zeroed set of PlayerGameStats counters"""
+    return {field: 0 for field in STAT_COUNTER_FIELDS}
+
+
+def event_stat_deltas(event_type: str, outcome: Optional[str]) -> Dict[str, int]:
+    """
+    Return the PlayerGameStats counter increments contributed by one event
+    2PT = 2 points, 3PT = 3 points, FT = 1 point, only "made" shots score
+    """
+    made = outcome == "made"
+    if event_type == "2PT":
+        deltas = {"shots_attempted": 1, "two_pointers_attempted": 1}
+        if made:
+            deltas.update({"points": 2, "shots_made": 1, "two_pointers_made": 1})
+        return deltas
+    if event_type == "3PT":
+        deltas = {"shots_attempted": 1, "three_pointers_attempted": 1}
+        if made:
+            deltas.update({"points": 3, "shots_made": 1, "three_pointers_made": 1})
+        return deltas
+    if event_type == "FT":
+        deltas = {"free_throws_attempted": 1}
+        if made:
+            deltas.update({"points": 1, "free_throws_made": 1})
+        return deltas
+    if event_type == "AST":
+        return {"assists": 1}
+    if event_type == "REB":
+        return {"rebounds": 1}
+    if event_type in FOUL_EVENT_TYPES:
+        return {"fouls": 1}
+    if event_type in VIOLATION_EVENT_TYPES:
+        return {"violations": 1}
+    return {}
 
 
 class StatsCalculationService:
@@ -92,70 +158,53 @@ class StatsCalculationService:
         ).count()
         return count
 
+    @staticmethod
+    def format_player_line(player_id: int, counters: Dict[str, int], name: str,
+                           number: Optional[int], position: Optional[str], status: str) -> Dict:
+        """Build the scoreboard stat line for a player from PlayerGameStats counters"""
+        three_pm = counters["three_pointers_made"]
+        three_pa = counters["three_pointers_attempted"]
+        return {
+            "player_id": player_id,
+            "name": name,
+            "number": number if number is not None else 0,
+            "position": position or "",
+            "status": status,
+            "points": counters["points"],
+            "fga": counters["shots_attempted"],
+            "fgm": counters["shots_made"],
+            "fg_pct": StatsCalculationService.calculate_percentage(
+                counters["shots_made"], counters["shots_attempted"]
+            ),
+            "three_pa": three_pa,
+            "three_pm": three_pm,
+            "three_pct": StatsCalculationService.calculate_percentage(three_pm, three_pa),
+            "fta": counters["free_throws_attempted"],
+            "ftm": counters["free_throws_made"],
+            "ft_pct": StatsCalculationService.calculate_percentage(
+                counters["free_throws_made"], counters["free_throws_attempted"]
+            ),
+            "ast": counters["assists"],
+            "reb": counters["rebounds"],
+            "fls": counters["fouls"],
+        }
+
     @staticmethod
     def get_player_stats(game_id: int, player_id: int, db: Session) -> Dict:
         """
         Calculate all stats for a player in a game
         Returns comprehensive stats dictionary
         """
-        player = db.query(Player).filter(Player.id == player_id).first()
-        if not player:
+        game = db.query(Game).filter(Game.id == game_id).first()
+        if not game:
             return None
-        
-        # Get roster status
-        roster = db.query(GameRoster).filter(
-            GameRoster.game_id == game_id,
-            GameRoster.player_id == player_id,
-        ).first()
-        status = roster.status if roster else "unknown"
-        
-        # Calculate field goals (all 2PT and 3PT combined)
-        fga = 0
-        fgm = 0
-        
-        two_pt_made, two_pt_attempts = StatsCalculationService.calculate_field_goals(
-            game_id, player_id, "2PT", db
-        )
-        three_pt_made, three_pt_attempts = StatsCalculationService.calculate_field_goals(
-            game_id, player_id, "3PT", db
-        )
-        
-        fga = two_pt_attempts + three_pt_attempts
-        fgm = two_pt_made + three_pt_made
-        
-        # Calculate free throws
-        ft_made, ft_attempts = StatsCalculationService.calculate_field_goals(
-            game_id, player_id, "FT", db
-        )
-        
-        # Calculate points
-        points = StatsCalculationService.calculate_points(game_id, player_id, db)
-        
-        # Calculate other stats
-        assists = StatsCalculationService.calculate_assists(game_id, player_id, db)
-        rebounds = StatsCalculationService.calculate_rebounds(game_id, player_id, db)
-        fouls = StatsCalculationService.calculate_fouls(game_id, player_id, db)
-        
-        return {
-            "player_id": player_id,
-            "name": player.name,
-            "number": player.number,
-            "position": player.position,
-            "status": status,
-            "points": points,
-            "fga": fga,
-            "fgm": fgm,
-            "fg_pct": StatsCalculationService.calculate_percentage(fgm, fga),
-            "three_pa": three_pt_attempts,
-            "three_pm": three_pt_made,
-            "three_pct": StatsCalculationService.calculate_percentage(three_pt_made, three_pt_attempts),
-            "fta": ft_attempts,
-            "ftm": ft_made,
-            "ft_pct": StatsCalculationService.calculate_percentage(ft_made, ft_attempts),
-            "ast": assists,
-            "reb": rebounds,
-            "fls": fouls,
-        }
+
+        box_score = BoxScoreService.get_box_score(game, db)
+        for team_stats in box_score.values():
+            for player_stat in team_stats["players"]:
+                if player_stat["player_id"] == player_id:
+                    return player_stat
+        return None
 
     @staticmethod
     def get_team_stats(game_id: int, team_id: int, db: Session) -> Dict:
@@ -163,50 +212,311 @@ class StatsCalculationService:
         Calculate aggregated stats for a team in a game
         Returns team score and player stats
         """
-        team = db.query(Team).filter(Team.id == team_id).first()
-        if not team:
-            return None
-        
         game = db.query(Game).filter(Game.id == game_id).first()
         if not game:
             return None
-        
-        # Get all players in this game for this team
-        rosters = db.query(GameRoster).join(Player).filter(
-            GameRoster.game_id == game_id,
-            Player.team_id == team_id,
+
+        return BoxScoreService.get_box_score(game, db).get(team_id)
+
+
+class BoxScoreService:
+    """
+    Box score engine
+    Computes every player's and team's line for a game from one grouped
+    aggregate query over game_events instead of per-player queries
+    """
+
+    @staticmethod
+    def aggregate_events(game_id: int, db: Session) -> Tuple[Dict[Tuple[int, int], Dict[str, int]], Dict[int, int]]:
+        """
+        Aggregate a game's events grouped by user/team/event_type/outcome
+        Returns ({(team_id, user_id): counters}, {team_id: timeouts})
+        """
+        rows = db.query(
+            GameEvent.user_id,
+            GameEvent.team_id,
+            GameEvent.event_type,
+            GameEvent.outcome,
+            func.count(GameEvent.id),
+        ).filter(
+            GameEvent.game_id == game_id
+        ).group_by(
+            GameEvent.user_id,
+            GameEvent.team_id,
+            GameEvent.event_type,
+            GameEvent.outcome,
         ).all()
-        
-        team_points = 0
-        team_fouls = 0
-        team_timeouts = 0
-        player_stats = []
-        
-        for roster in rosters:
-            player_stat = StatsCalculationService.get_player_stats(
-                game_id, roster.player_id, db
-            )
-            if player_stat:
-                player_stats.append(player_stat)
-                team_points += player_stat["points"]
-                team_fouls += player_stat["fls"]
-        
-        # Count timeouts (team-level events)
-        team_timeouts = db.query(GameEvent).filter(
-            GameEvent.game_id == game_id,
-            GameEvent.team_id == team_id,
-            GameEvent.event_type == "TO",
-        ).count()
-        
-        return {
-            "team_id": team_id,
-            "team_name": team.name,
-            "points": team_points,
-            "fouls": team_fouls,
-            "timeouts": team_timeouts,
-            "players": player_stats,
+
+        player_counters: Dict[Tuple[int, int], Dict[str, int]] = {}
+        team_timeouts: Dict[int, int] = {}
+
+        for user_id, team_id, event_type, outcome, count in rows:
+            if event_type == "TO":
+                team_timeouts[team_id] = team_timeouts.get(team_id, 0) + count
+            if not user_id:
+                continue  # Team events without a user_id (like timeouts)
+
+            deltas = event_stat_deltas(event_type, outcome)
+            counters = player_counters.setdefault((team_id, user_id), empty_stat_counters())
+            for field, delta in deltas.items():
+                counters[field] += delta * count
+
+        return player_counters, team_timeouts
+
+    @staticmethod
+    def user_display_name(user: Optional[User]) -> str:
+        """Get a player's display name from their user"""
+        if user:
+            return format_display_name((user.username, user.first_name, user.last_name))
+        return UNKNOWN_PLAYER
+
+    @staticmethod
+    def load_roster(game: Game, player_keys, db: Session) -> Tuple[Dict[int, str], Dict[Tuple[int, int], Dict]]:
+        """
+        Load team names and roster info for a game with one query each
+        player_keys are (team_id, user_id) pairs that recorded events; those not
+        on the game roster are added with status "unknown"
+        Returns ({team_id: team_name}, {(team_id, user_id): player info})
+        """
+        team_ids = [game.home_team_id, game.away_team_id]
+        team_names = {
+            team.id: team.name
+            for team in db.query(Team).filter(Team.id.in_(team_ids)).all()
         }
 
+        entries = db.query(GamePlayer).filter(GamePlayer.game_id == game.id).all()
+
+        # Roster players and players who recorded events without being on the
+        # roster, named with one batched lookup
+        roster_keys = {(entry.team_id, entry.user_id) for entry in entries}
+        missing_keys = [key for key in player_keys if key not in roster_keys]
+        names = NameLoader(db).names(
+            [entry.user_id for entry in entries] + [user_id for (team_id, user_id) in missing_keys]
+        )
+
+        roster = {}
+        for entry in entries:
+            roster[(entry.team_id, entry.user_id)] = {
+                "name": names.get(entry.user_id, UNKNOWN_PLAYER),
+                "number": entry.jersey_number,
+                "position": entry.position,
+                "status": "starter" if entry.is_starter else "bench",
+            }
+
+        for team_id, user_id in missing_keys:
+            roster[(team_id, user_id)] = {
+                "name": names.get(user_id, UNKNOWN_PLAYER),
+                "number": None,
+                "position": None,
+                "status": "unknown",
+            }
+
+        return team_names, roster
+
+    @staticmethod
+    def format_team_lines(team_ids, team_names: Dict[int, str], roster: Dict[Tuple[int, int], Dict],
+                          player_counters: Dict[Tuple[int, int], Dict[str, int]],
+                          team_timeouts: Dict[int, int]) -> Dict[int, Dict]:
+        """
+        Turn aggregated counters into scoreboard team dicts keyed by team_id
+        Pure formatting - does not touch the database
+        """
+        result = {}
+        for team_id in team_ids:
+            if team_id not in team_names:
+                continue
+
+            player_stats = []
+            team_points = 0
+            team_fouls = 0
+
+            for key, info in roster.items():
+                if key[0] != team_id:
+                    continue
+                counters = player_counters.get(key) or empty_stat_counters()
+                line = StatsCalculationService.format_player_line(
+                    key[1], counters, info["name"], info["number"], info["position"], info["status"],
+                )
+                player_stats.append(line)
+                team_points += line["points"]
+                team_fouls += line["fls"]
+
+            result[team_id] = {
+                "team_id": team_id,
+                "team_name": team_names[team_id],
+                "points": team_points,
+                "fouls": team_fouls,
+                "timeouts": team_timeouts.get(team_id, 0),
+                "players": player_stats,
+            }
+
+        return result
+
+    @staticmethod
+    def build_team_lines(game: Game, player_counters: Dict[Tuple[int, int], Dict[str, int]],
+                         team_timeouts: Dict[int, int], db: Session) -> Dict[int, Dict]:
+        """
+        Turn aggregated counters into scoreboard team dicts keyed by team_id
+        Loads teams, roster and names with one query each
+        """
+        team_names, roster = BoxScoreService.load_roster(game, player_counters.keys(), db)
+        return BoxScoreService.format_team_lines(
+            [game.home_team_id, game.away_team_id], team_names, roster, player_counters, team_timeouts,
+        )
+
+    @staticmethod
+    def get_box_score(game: Game, db: Session) -> Dict[int, Dict]:
+        """
+        Calculate the full box score for a game
+        Returns {team_id: team stats} in the same shape as get_team_stats
+        """
+        player_counters, team_timeouts = BoxScoreService.aggregate_events(game.id, db)
+        return BoxScoreService.build_team_lines(game, player_counters, team_timeouts, db)
+
+
+class LiveBoxScoreService:
+    """
+    Incrementally maintained box score
+    Keeps LivePlayerGameStats/LiveTeamGameStats rows current inside the same
+    transaction as each event insert or undo, so reads never scan game_events
+    """
+
+    @staticmethod
+    def _get_team_row(game_id: int, team_id: int, db: Session) -> LiveTeamGameStats:
+        """Get or create the live team row for a game"""
+        row = db.query(LiveTeamGameStats).filter(
+            LiveTeamGameStats.game_id == game_id,
+            LiveTeamGameStats.team_id == team_id,
+        ).first()
+        if not row:
+            row = LiveTeamGameStats(game_id=game_id, team_id=team_id, points=0, fouls=0, timeouts=0)
+            db.add(row)
+            db.flush()
+        return row
+
+    @staticmethod
+    def _get_player_row(game_id: int, user_id: int, team_id: int, db: Session) -> LivePlayerGameStats:
+        """Get or create the live player row for a game"""
+        row = db.query(LivePlayerGameStats).filter(
+            LivePlayerGameStats.game_id == game_id,
+            LivePlayerGameStats.user_id == user_id,
+        ).first()
+        if not row:
+            row = LivePlayerGameStats(game_id=game_id, user_id=user_id, team_id=team_id, **empty_stat_counters())
+            db.add(row)
+            db.flush()
+        return row
+
+    @staticmethod
+    def apply_event(event: GameEvent, db: Session, direction: int = 1) -> None:
+        """
+        Apply an event to the live box score rows
+        direction=-1 reverses a previously applied event (undo)
+        Does not commit - the caller commits together with the event itself
+        """
+        team_row = LiveBoxScoreService._get_team_row(event.game_id, event.team_id, db)
+        if event.event_type == "TO":
+            team_row.timeouts += direction
+
+        if not event.user_id:
+            return  # Team events without a user_id (like timeouts)
+
+        deltas = event_stat_deltas(event.event_type, event.outcome)
+        if not deltas:
+            return
+
+        player_row = LiveBoxScoreService._get_player_row(event.game_id, event.user_id, event.team_id, db)
+        for field, delta in deltas.items():
+            setattr(player_row, field, getattr(player_row, field) + delta * direction)
+
+        team_row.points += deltas.get("points", 0) * direction
+        team_row.fouls += deltas.get("fouls", 0) * direction
+
+    @staticmethod
+    def has_rows(game_id: int, db: Session) -> bool:
+        """Whether a game's live rows exist yet"""
+        return db.query(LiveTeamGameStats.id).filter(
+            LiveTeamGameStats.game_id == game_id
+        ).first() is not None
+
+    @staticmethod
+    def record_event(event: GameEvent, db: Session, direction: int = 1) -> None:
+        """
+        Bring the live rows up to date with an event insert (direction=1) or
+        delete (direction=-1) that has already been flushed
+        A game without live rows yet is backfilled from game_events instead,
+        so events recorded before the live tables existed are not lost
+        Does not commit
+        """
+        if not LiveBoxScoreService.has_rows(event.game_id, db):
+            game = db.query(Game).filter(Game.id == event.game_id).first()
+            LiveBoxScoreService.rebuild(game, db, commit=False)
+            return
+        LiveBoxScoreService.apply_event(event, db, direction)
+
+    @staticmethod
+    def rebuild(game: Game, db: Session, commit: bool = True) -> None:
+        """
+        Recompute a game's live rows from game_events
+        Backfills games whose events predate the live tables; commits unless commit=False
+        """
+        db.query(LivePlayerGameStats).filter(LivePlayerGameStats.game_id == game.id).delete()
+        db.query(LiveTeamGameStats).filter(LiveTeamGameStats.game_id == game.id).delete()
+
+        player_counters, team_timeouts = BoxScoreService.aggregate_events(game.id, db)
+
+        team_totals = {
+            team_id: {"points": 0, "fouls": 0}
+            for team_id in (game.home_team_id, game.away_team_id)
+        }
+        for (team_id, user_id), counters in player_counters.items():
+            db.add(LivePlayerGameStats(game_id=game.id, user_id=user_id, team_id=team_id, **counters))
+            totals = team_totals.setdefault(team_id, {"points": 0, "fouls": 0})
+            totals["points"] += counters["points"]
+            totals["fouls"] += counters["fouls"]
+
+        for team_id, totals in team_totals.items():
+            db.add(LiveTeamGameStats(
+                game_id=game.id,
+                team_id=team_id,
+                points=totals["points"],
+                fouls=totals["fouls"],
+                timeouts=team_timeouts.get(team_id, 0),
+            ))
+
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+
+    @staticmethod
+    def get_player_rows(game: Game, db: Session, commit: bool = True) -> List[LivePlayerGameStats]:
+        """Get a game's live player rows, backfilling them on first read"""
+        if not LiveBoxScoreService.has_rows(game.id, db):
+            LiveBoxScoreService.rebuild(game, db, commit=commit)
+
+        return db.query(LivePlayerGameStats).filter(
+            LivePlayerGameStats.game_id == game.id
+        ).all()
+
+    @staticmethod
+    def get_box_score(game: Game, db: Session) -> Dict[int, Dict]:
+        """
+        Read the box score from the live rows
+        Returns {team_id: team stats} in the same shape as BoxScoreService.get_box_score
+        """
+        player_counters = {
+            (row.team_id, row.user_id): {field: getattr(row, field) for field in STAT_COUNTER_FIELDS}
+            for row in LiveBoxScoreService.get_player_rows(game, db)
+        }
+        team_timeouts = {
+            team_id: timeouts
+            for team_id, timeouts in db.query(
+                LiveTeamGameStats.team_id, LiveTeamGameStats.timeouts
+            ).filter(LiveTeamGameStats.game_id == game.id).all()
+        }
+        return BoxScoreService.build_team_lines(game, player_counters, team_timeouts, db)
+
 
 class GameStateService:
     """Service for managing game state and transitions"""
@@ -250,6 +560,9 @@ class GameStateService:
         game.status = "active"
         game.started_at = datetime.utcnow()
         db.commit()
+
+        from .services_live import live_game_registry
+        live_game_registry.hydrate(game, db)
         
         return True, "Game started successfully", game
 
@@ -272,6 +585,9 @@ class GameStateService:
         game.status = "completed"
         game.ended_at = datetime.utcnow()
         db.commit()
+
+        from .services_live import live_game_registry
+        live_game_registry.evict(game_id)
         
         return True, "Game ended successfully", game
 
@@ -279,8 +595,14 @@ class GameStateService:
     def get_current_period(game_id: int, db: Session) -> int:
         """
         Get current period based on PERIOD_START/PERIOD_END events
+        Served from the live game state while the game is in progress
         Returns period number (1-5)
         """
+        from .services_live import live_game_registry
+        state = live_game_registry.get_or_load(game_id, db)
+        if state:
+            return state.current_period
+
         period_start_events = db.query(GameEvent).filter(
             GameEvent.game_id == game_id,
             GameEvent.event_type == "PERIOD_START",
@@ -300,71 +622,52 @@ class EventValidationService:
                       event_type: str, period: int, db: Session) -> Tuple[bool, str]:
         """
         Validate a game event before recording
+        player_id is the event's user_id. Checks run against the game's live
+        state (status, teams, roster, running fouls), which the event write
+        path keeps current, so a game in progress needs no queries
         Returns (is_valid, error_message)
         """
-        # Validate game exists and is active
-        game = db.query(Game).filter(Game.id == game_id).first()
-        if not game:
-            return False, "Game not found"
-        
-        if game.status != "active":
-            return False, f"Game is {game.status}, not active"
-        
+        from .services_live import live_game_registry, LIVE_GAME_STATUSES
+
+        state = live_game_registry.get_or_load(game_id, db)
+        if not state:
+            game = db.query(Game.status).filter(Game.id == game_id).first()
+            if not game:
+                return False, "Game not found"
+            return False, f"Game is {game.status}, not in progress"
+
+        if state.status not in LIVE_GAME_STATUSES:
+            return False, f"Game is {state.status}, not in progress"
+
         # Validate period is valid (1-5)
         if period < 1 or period > 5:
             return False, "Period must be between 1 and 5"
-        
-        # Validate team exists
-        team = db.query(Team).filter(Team.id == team_id).first()
-        if not team:
-            return False, "Team not found"
-        
+
         # Validate team is in this game
-        is_team_in_game = (
-            (game.home_team_id == team_id or game.away_team_id == team_id)
-        )
-        if not is_team_in_game:
+        if team_id not in (state.home_team_id, state.away_team_id):
             return False, "Team is not in this game"
-        
-        # Events that require a player
-        player_required_events = ["2PT", "3PT", "FT", "AST", "REB", "FLS", "SUB"]
-        
-        if event_type in player_required_events:
+
+        # Validate event type
+        if event_type not in VALID_EVENT_TYPES:
+            return False, f"Invalid event type: {event_type}"
+
+        if event_type in PLAYER_EVENT_TYPES:
             if not player_id:
                 return False, f"Event type {event_type} requires a player"
-            
-            # Validate player exists
-            player = db.query(Player).filter(Player.id == player_id).first()
-            if not player:
-                return False, "Player not found"
-            
-            # Validate player is in game roster
-            roster = db.query(GameRoster).filter(
-                GameRoster.game_id == game_id,
-                GameRoster.player_id == player_id,
-            ).first()
-            if not roster:
-                return False, "Player is not in game roster"
-            
-            # Validate player's team matches event team
-            if player.team_id != team_id:
-                return False, "Player does not belong to the event team"
-            
+
+            # Games without a roster accept any player; otherwise the player
+            # must be rostered for the event team
+            if state.roster_teams:
+                roster_team_id = state.roster_teams.get(player_id)
+                if roster_team_id is None:
+                    return False, "Player is not in game roster"
+                if roster_team_id != team_id:
+                    return False, "Player does not belong to the event team"
+
             # Validate foul count doesn't exceed 6 (disqualification)
-            foul_count = db.query(GameEvent).filter(
-                GameEvent.game_id == game_id,
-                GameEvent.player_id == player_id,
-                GameEvent.event_type == "FLS",
-            ).count()
-            
-            if event_type == "FLS" and foul_count >= 6:
+            if event_type in FOUL_EVENT_TYPES and state.player_fouls(team_id, player_id) >= 6:
                 return False, "Player has been disqualified (6 fouls)"
-        
-        # Validate event type
-        valid_events = ["2PT", "3PT", "FT", "AST", "REB", "FLS", "SUB", "TO", "PERIOD_START", "PERIOD_END"]
-        if event_type not in valid_events:
-            return False, f"Invalid event type: {event_type}"
-        
+
         return True, ""
 
     @staticmethod
@@ -399,7 +702,12 @@ class RepositoryService:
 
     @staticmethod
     def get_latest_game_event(game_id: int, db: Session) -> Optional[GameEvent]:
-        """Get the most recent event for a game"""
+        """Get the most recent event for a game, from the live game state when tracked"""
+        from .services_live import live_game_registry
+        state = live_game_registry.get_or_load(game_id, db)
+        if state:
+            return state.last_event
+
         return db.query(GameEvent).filter(
             GameEvent.game_id == game_id
         ).order_by(GameEvent.created_at.desc()).first()
@@ -3,13 +3,17 @@ Authentication service for user management
 Handles user registration, login, and profile operations
 """
 
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import text
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text, select
 from typing import Optional, Tuple
 from datetime import datetime
 from .models import User, UserProfile, UserStats, HandStyle
-from .security import hash_password, verify_password, create_access_token, create_refresh_token
+from .security import password_hasher, create_access_token, create_refresh_token, decode_token
 from .schemas_auth import UserRegister, UserLogin
+from .services_names import name_cache
+from .services_auth_cache import auth_user_cache
+from .services_token_revocation import token_revocations
 
 
 class AuthService:
@@ -31,12 +35,15 @@ class AuthService:
         if existing_user:
             return None, "Username already taken"
 
+        # Hashed in the bounded pool; PasswordHashOverloaded propagates as 503
+        password_hash = password_hasher.hash(user_data.password)
+
         # Create new user
         try:
             user = User(
                 email=user_data.email,
                 username=user_data.username,
-                password_hash=hash_password(user_data.password),
+                password_hash=password_hash,
                 first_name=user_data.first_name,
                 last_name=user_data.last_name,
                 is_active=True
@@ -73,7 +80,7 @@ class AuthService:
         if not user:
             return None, "Invalid email or password"
 
-        if not verify_password(user_data.password, user.password_hash):
+        if not password_hasher.verify(user_data.password, user.password_hash):
             return None, "Invalid email or password"
 
         if not user.is_active:
@@ -81,6 +88,42 @@ class AuthService:
 
         return user, None
 
+    @staticmethod
+    async def authenticate_user_async(db: AsyncSession, user_data: UserLogin) -> Tuple[Optional[User], Optional[str]]:
+        """
+        Async variant of authenticate_user for the event loop
+        Loads profile and stats up front; the password hash is checked in the password pool
+        """
+        result = await db.execute(
+            select(User).options(
+                selectinload(User.profile),
+                selectinload(User.stats)
+            ).filter(User.email == user_data.email)
+        )
+        user = result.scalars().first()
+
+        if not user:
+            return None, "Invalid email or password"
+
+        if not await password_hasher.verify_async(user_data.password, user.password_hash):
+            return None, "Invalid email or password"
+
+        if not user.is_active:
+            return None, "User account is disabled"
+
+        return user, None
+
+    @staticmethod
+    async def get_user_by_id_async(db: AsyncSession, user_id: int) -> Optional[User]:
+        """Get user by ID with profile and stats loaded, on an AsyncSession"""
+        result = await db.execute(
+            select(User).options(
+                selectinload(User.profile),
+                selectinload(User.stats)
+            ).filter(User.id == user_id)
+        )
+        return result.scalars().first()
+
     @staticmethod
     def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
         """Get user by ID with relationships"""
@@ -237,6 +280,8 @@ class AuthService:
 
             # Commit all changes
             db.commit()
+            name_cache.invalidate(user_id)
+            auth_user_cache.invalidate(user_id)
             
             # Refresh user to get updated profile
             db.refresh(user)
@@ -265,12 +310,14 @@ class AuthService:
         if not user:
             return False, "User not found"
 
-        if not verify_password(old_password, user.password_hash):
+        if not password_hasher.verify(old_password, user.password_hash):
             return False, "Incorrect old password"
 
+        password_hash = password_hasher.hash(new_password)
         try:
-            user.password_hash = hash_password(new_password)
+            user.password_hash = password_hash
             db.commit()
+            auth_user_cache.invalidate(user_id)
             return True, "Password changed successfully"
         except Exception as e:
             db.rollback()
@@ -286,7 +333,27 @@ class AuthService:
 
             user.is_active = False
             db.commit()
+            # Outstanding access and refresh tokens stop working on every worker
+            token_revocations.revoke_user(db, user_id)
+            auth_user_cache.invalidate(user_id)
             return True, "User account deactivated"
         except Exception as e:
             db.rollback()
             return False, str(e)
+
+    @staticmethod
+    def logout_user(db: Session, user_id: int, token: str) -> Tuple[bool, str]:
+        """Revoke the access token used to log out"""
+        payload = decode_token(token)
+        if not payload or "jti" not in payload:
+            # Tokens issued without a jti can't be revoked one by one; they expire on their own
+            return True, "Logged out successfully"
+
+        try:
+            token_revocations.revoke_token(
+                db, user_id, payload["jti"], datetime.utcfromtimestamp(payload["exp"])
+            )
+            return True, "Logged out successfully"
+        except Exception as e:
+            db.rollback()
+            return False, str(e)
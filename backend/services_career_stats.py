@@ -0,0 +1,216 @@
+"""
+Career Stats Rollup
+Keeps UserStats in step with PlayerGameStats: each finalize/re-finalize applies
+only the difference between a game's old and new per-player rows
+"""
+
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import func, update
+from sqlalchemy.dialects import postgresql, sqlite
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .models import User, UserStats, PlayerGameStats
+
+# PlayerGameStats counter -> UserStats career total
+CAREER_TOTAL_FIELDS = {
+    "points": "total_points",
+    "assists": "total_assists",
+    "rebounds": "total_rebounds",
+    "fouls": "total_fouls",
+    "violations": "total_violations",
+    "shots_made": "total_shots_made",
+    "shots_attempted": "total_shots_attempted",
+}
+
+
+def empty_career_delta() -> Dict[str, int]:
+    """A zeroed UserStats delta"""
+    delta = {total: 0 for total in CAREER_TOTAL_FIELDS.values()}
+    delta["total_matches"] = 0
+    return delta
+
+
+class CareerStatsService:
+    """Maintain and read career totals in UserStats"""
+
+    @staticmethod
+    def game_rows(game_id: int, db: Session) -> Dict[int, Dict[str, int]]:
+        """Current PlayerGameStats counters for a game, {player_id: {counter: value}}"""
+        columns = [getattr(PlayerGameStats, field) for field in CAREER_TOTAL_FIELDS]
+        rows = db.query(PlayerGameStats.player_id, *columns).filter(
+            PlayerGameStats.game_id == game_id
+        ).all()
+        return {
+            row[0]: dict(zip(CAREER_TOTAL_FIELDS, row[1:]))
+            for row in rows
+        }
+
+    @staticmethod
+    def diff_game_rows(old_rows: Dict[int, Dict[str, int]],
+                       new_rows: Dict[int, Dict[str, int]]) -> Dict[int, Dict[str, int]]:
+        """
+        Per-player UserStats deltas between a game's old and new rows
+        A player who gains a row plays one more match, one who loses it one fewer
+        """
+        deltas = {}
+        for player_id in set(old_rows) | set(new_rows):
+            old = old_rows.get(player_id)
+            new = new_rows.get(player_id)
+            delta = empty_career_delta()
+            delta["total_matches"] = (new is not None) - (old is not None)
+            for field, total in CAREER_TOTAL_FIELDS.items():
+                delta[total] = (new or {}).get(field, 0) - (old or {}).get(field, 0)
+            if any(delta.values()):
+                deltas[player_id] = delta
+        return deltas
+
+    @staticmethod
+    def _refresh_averages(user_ids: List[int], db: Session) -> None:
+        """Recompute the per-game averages from the totals, in SQL"""
+        matches = func.nullif(UserStats.total_matches, 0)
+        db.execute(
+            update(UserStats)
+            .where(UserStats.user_id.in_(user_ids))
+            .values(
+                points_per_game=func.coalesce(UserStats.total_points * 1.0 / matches, 0.0),
+                assists_per_game=func.coalesce(UserStats.total_assists * 1.0 / matches, 0.0),
+                rebounds_per_game=func.coalesce(UserStats.total_rebounds * 1.0 / matches, 0.0),
+                updated_at=datetime.utcnow(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def apply_deltas(deltas: Dict[int, Dict[str, int]], db: Session) -> None:
+        """
+        Add per-player deltas to UserStats; does not commit
+        SQLite/Postgres use one INSERT ... ON CONFLICT (user_id) DO UPDATE with
+        column increments, so concurrent finalizes never overwrite each other
+        """
+        if not deltas:
+            return
+
+        now = datetime.utcnow()
+        dialect = db.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            rows = [
+                {
+                    "user_id": user_id, "created_at": now, "updated_at": now,
+                    "matches_won": 0, "matches_lost": 0, "win_rate": 0.0,
+                    "points_per_game": 0.0, "assists_per_game": 0.0, "rebounds_per_game": 0.0,
+                    **delta,
+                }
+                for user_id, delta in deltas.items()
+            ]
+            # Core executemany, so the statement compiles once (see _upsert_player_game_stats)
+            insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            statement = insert(UserStats.__table__)
+            statement = statement.on_conflict_do_update(
+                index_elements=["user_id"],
+                set_={
+                    column: statement.table.c[column] + statement.excluded[column]
+                    for column in empty_career_delta()
+                },
+            )
+            db.execute(statement, rows)
+        else:
+            existing = {
+                stats.user_id: stats
+                for stats in db.query(UserStats).filter(UserStats.user_id.in_(list(deltas))).all()
+            }
+            for user_id, delta in deltas.items():
+                stats = existing.get(user_id)
+                if not stats:
+                    stats = UserStats(user_id=user_id, **empty_career_delta())
+                    db.add(stats)
+                for column, value in delta.items():
+                    setattr(stats, column, (getattr(stats, column) or 0) + value)
+            db.flush()
+
+        CareerStatsService._refresh_averages(list(deltas), db)
+
+    @staticmethod
+    def get_career_stats(user_id: int, db: Session) -> Optional[Dict]:
+        """Career stats from the user's UserStats row; None if the user does not exist"""
+        stats = db.query(UserStats).filter(UserStats.user_id == user_id).first()
+        if not stats:
+            if not db.query(User.id).filter(User.id == user_id).first():
+                return None
+            stats = UserStats(user_id=user_id, **empty_career_delta())
+
+        shots_made = stats.total_shots_made or 0
+        shots_attempted = stats.total_shots_attempted or 0
+        shooting_pct = (shots_made / shots_attempted * 100) if shots_attempted > 0 else 0.0
+        return {
+            'user_id': user_id,
+            'total_games': stats.total_matches or 0,
+            'total_points': stats.total_points or 0,
+            'average_points_per_game': round(stats.points_per_game or 0.0, 2),
+            'total_assists': stats.total_assists or 0,
+            'total_rebounds': stats.total_rebounds or 0,
+            'total_fouls': stats.total_fouls or 0,
+            'total_violations': stats.total_violations or 0,
+            'total_shots_made': shots_made,
+            'total_shots_attempted': shots_attempted,
+            'career_shooting_percentage': round(shooting_pct, 2)
+        }
+
+    @staticmethod
+    def _backfill_chunk(session_factory: sessionmaker, user_ids: Tuple[int, ...]) -> int:
+        """Recompute UserStats totals for a range of users from PlayerGameStats (one worker)"""
+        db = session_factory()
+        try:
+            sums = [func.coalesce(func.sum(getattr(PlayerGameStats, field)), 0) for field in CAREER_TOTAL_FIELDS]
+            rows = db.query(PlayerGameStats.player_id, func.count(PlayerGameStats.id), *sums).filter(
+                PlayerGameStats.player_id.in_(user_ids)
+            ).group_by(PlayerGameStats.player_id).all()
+
+            totals = {user_id: empty_career_delta() for user_id in user_ids}
+            for row in rows:
+                totals[row[0]]["total_matches"] = row[1]
+                for total, value in zip(CAREER_TOTAL_FIELDS.values(), row[2:]):
+                    totals[row[0]][total] = value
+
+            # Reset to zero and add the recomputed totals
+            existing = {
+                user_id for (user_id,) in db.query(UserStats.user_id).filter(UserStats.user_id.in_(user_ids)).all()
+            }
+            if existing:
+                db.execute(
+                    update(UserStats)
+                    .where(UserStats.user_id.in_(existing))
+                    .values(**empty_career_delta())
+                    .execution_options(synchronize_session=False)
+                )
+            CareerStatsService.apply_deltas(
+                {user_id: delta for user_id, delta in totals.items() if user_id in existing or any(delta.values())},
+                db,
+            )
+            db.commit()
+            return len(user_ids)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def backfill(session_factory: sessionmaker, workers: int = 4, chunk_size: int = 500) -> int:
+        """
+        Rebuild every user's career totals from PlayerGameStats
+        Users are split into chunks that are aggregated and written in parallel,
+        one session per worker; returns the number of users processed
+        """
+        db = session_factory()
+        try:
+            user_ids = [user_id for (user_id,) in db.query(User.id).order_by(User.id).all()]
+        finally:
+            db.close()
+
+        chunks = [tuple(user_ids[i:i + chunk_size]) for i in range(0, len(user_ids), chunk_size)]
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            return sum(executor.map(
+                lambda chunk: CareerStatsService._backfill_chunk(session_factory, chunk), chunks
+            ))
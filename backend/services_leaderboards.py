@@ -0,0 +1,378 @@
+"""
+Leaderboards
+Top-K players per stat for the league (UserStats), a tournament or a team
+(player_scope_stats). Scope totals move by the same per-game deltas as career
+stats at finalize; reads are served from an in-process top-K per
+(stat, scope, scope_id), loaded from the indexed tables on a miss
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, desc, func, literal, select, insert as sql_insert
+from sqlalchemy.dialects import postgresql, sqlite
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import logging
+import os
+import threading
+import time
+
+from .models import Game, GamePlayer, PlayerGameStats, PlayerScopeStats, User, UserStats
+
+logger = logging.getLogger(__name__)
+
+LEADERBOARD_STATS = ("points", "assists", "rebounds", "shooting")
+LEADERBOARD_SCOPES = ("league", "tournament", "team")
+
+# Entries kept in memory per leaderboard; longer requests go to the database
+LEADERBOARD_TOP_K = int(os.getenv("LEADERBOARD_TOP_K", "100"))
+# Cached leaderboards are reloaded after this long, picking up other workers' finalizes
+LEADERBOARD_CACHE_TTL = float(os.getenv("LEADERBOARD_CACHE_TTL", "60"))
+# Players need this many shot attempts to appear on the shooting leaderboard
+LEADERBOARD_MIN_SHOT_ATTEMPTS = int(os.getenv("LEADERBOARD_MIN_SHOT_ATTEMPTS", "10"))
+
+# UserStats delta key -> player_scope_stats column
+SCOPE_DELTA_FIELDS = {
+    "total_matches": "games",
+    "total_points": "points",
+    "total_assists": "assists",
+    "total_rebounds": "rebounds",
+    "total_shots_made": "shots_made",
+    "total_shots_attempted": "shots_attempted",
+}
+
+ScopeKey = Tuple[str, int]  # ("league", 0), ("tournament", id), ("team", id)
+
+
+def _scope_columns(scope: str) -> Dict:
+    """Columns backing a scope's leaderboards"""
+    if scope == "league":
+        return {
+            "player_id": UserStats.user_id,
+            "games": UserStats.total_matches,
+            "points": UserStats.total_points,
+            "assists": UserStats.total_assists,
+            "rebounds": UserStats.total_rebounds,
+            "shots_made": UserStats.total_shots_made,
+            "shots_attempted": UserStats.total_shots_attempted,
+        }
+    return {
+        "player_id": PlayerScopeStats.player_id,
+        "games": PlayerScopeStats.games,
+        "points": PlayerScopeStats.points,
+        "assists": PlayerScopeStats.assists,
+        "rebounds": PlayerScopeStats.rebounds,
+        "shots_made": PlayerScopeStats.shots_made,
+        "shots_attempted": PlayerScopeStats.shots_attempted,
+    }
+
+
+def _scope_query(scope: str, scope_id: int):
+    """SELECT of a scope's rows with the player's name columns"""
+    columns = _scope_columns(scope)
+    query = select(
+        *[column.label(name) for name, column in columns.items()],
+        User.first_name, User.last_name, User.username,
+    ).join(User, User.id == columns["player_id"])
+    if scope != "league":
+        query = query.where(PlayerScopeStats.scope == scope, PlayerScopeStats.scope_id == scope_id)
+    return query, columns
+
+
+def _qualifies(stat: str, row) -> bool:
+    """Whether a row belongs on the stat's leaderboard"""
+    if stat == "shooting":
+        return row.shots_attempted >= LEADERBOARD_MIN_SHOT_ATTEMPTS
+    return row.games > 0 and getattr(row, stat) > 0
+
+
+def _entry(stat: str, row) -> Dict:
+    """Leaderboard entry for a row; sort_key orders entries best first"""
+    if row.first_name and row.last_name:
+        player_name = f"{row.first_name} {row.last_name}"
+    else:
+        player_name = row.username
+    if stat == "shooting":
+        ratio = row.shots_made / row.shots_attempted
+        value = round(ratio * 100, 2)
+        sort_key = (-ratio, -row.shots_made, row.player_id)
+    else:
+        value = getattr(row, stat)
+        sort_key = (-value, row.player_id)
+    return {
+        "user_id": row.player_id,
+        "player_name": player_name,
+        "games": row.games,
+        "value": value,
+        "sort_key": sort_key,
+    }
+
+
+def load_leaderboard(stat: str, scope: str, scope_id: int, limit: int, db: Session) -> List[Dict]:
+    """Top `limit` entries straight from the database"""
+    query, columns = _scope_query(scope, scope_id)
+    if stat == "shooting":
+        made, attempted = columns["shots_made"], columns["shots_attempted"]
+        query = query.where(attempted >= LEADERBOARD_MIN_SHOT_ATTEMPTS).order_by(
+            desc(made * 1.0 / attempted), desc(made), columns["player_id"]
+        )
+    else:
+        query = query.where(columns["games"] > 0, columns[stat] > 0).order_by(
+            desc(columns[stat]), columns["player_id"]
+        )
+    return [_entry(stat, row) for row in db.execute(query.limit(limit))]
+
+
+class TopK:
+    """The best K entries of one leaderboard"""
+
+    def __init__(self, entries: List[Dict], k: int):
+        self.k = k
+        self.entries: Dict[int, Dict] = {entry["user_id"]: entry for entry in entries}
+        # Fewer than K rows qualified, so every qualifying player is held here
+        self.complete = len(entries) < k
+        self.stale = False
+        self.loaded_at = time.monotonic()
+
+    def _worst(self) -> Optional[Dict]:
+        return max(self.entries.values(), key=lambda entry: entry["sort_key"], default=None)
+
+    def update(self, user_id: int, entry: Optional[Dict]) -> None:
+        """
+        Apply a player's new entry (None if they no longer qualify)
+        A player falling within or out of a full top-K may let an unseen player
+        in, so that marks the list stale and it is reloaded on the next read
+        """
+        current = self.entries.get(user_id)
+        if current is not None:
+            worse = entry is None or entry["sort_key"] > current["sort_key"]
+            if worse and not self.complete:
+                self.stale = True
+                return
+            if entry is None:
+                del self.entries[user_id]
+            else:
+                self.entries[user_id] = entry
+            return
+
+        if entry is None:
+            return
+        if len(self.entries) < self.k:
+            if self.complete:
+                self.entries[user_id] = entry
+            else:
+                self.stale = True
+            return
+        worst = self._worst()
+        if entry["sort_key"] < worst["sort_key"]:
+            del self.entries[worst["user_id"]]
+            self.entries[user_id] = entry
+        # Whichever of the two was left out still qualifies but isn't held here
+        self.complete = False
+
+    def top(self, limit: int) -> List[Dict]:
+        return sorted(self.entries.values(), key=lambda entry: entry["sort_key"])[:limit]
+
+
+class LeaderboardCache:
+    """In-process top-K lists keyed by (stat, scope, scope_id)"""
+
+    def __init__(self, k: int = LEADERBOARD_TOP_K, ttl: float = LEADERBOARD_CACHE_TTL):
+        self.k = k
+        self.ttl = ttl
+        self.boards: Dict[Tuple[str, str, int], TopK] = {}
+        self._lock = threading.Lock()
+
+    def get(self, stat: str, scope: str, scope_id: int, limit: int, db: Session) -> List[Dict]:
+        """Top `limit` entries, from memory when limit fits in the top-K"""
+        if limit > self.k:
+            return load_leaderboard(stat, scope, scope_id, limit, db)
+
+        key = (stat, scope, scope_id)
+        with self._lock:
+            board = self.boards.get(key)
+            if board and not board.stale and time.monotonic() - board.loaded_at < self.ttl:
+                return board.top(limit)
+
+        board = TopK(load_leaderboard(stat, scope, scope_id, self.k, db), self.k)
+        with self._lock:
+            self.boards[key] = board
+            return board.top(limit)
+
+    def apply(self, scopes: Iterable[ScopeKey], player_ids: Iterable[int], db: Session) -> None:
+        """Merge players' committed totals into the cached boards of each scope"""
+        player_ids = list(player_ids)
+        if not player_ids:
+            return
+        for scope, scope_id in scopes:
+            with self._lock:
+                cached = [stat for stat in LEADERBOARD_STATS if (stat, scope, scope_id) in self.boards]
+            if not cached:
+                continue
+
+            query, columns = _scope_query(scope, scope_id)
+            try:
+                rows = {row.player_id: row for row in db.execute(query.where(columns["player_id"].in_(player_ids)))}
+            except Exception as e:
+                # The totals are committed; drop the boards so the next read reloads them
+                logger.warning("Leaderboard refresh failed for %s %s: %s", scope, scope_id, e)
+                with self._lock:
+                    for stat in cached:
+                        self.boards.pop((stat, scope, scope_id), None)
+                continue
+            with self._lock:
+                for stat in cached:
+                    board = self.boards.get((stat, scope, scope_id))
+                    if not board:
+                        continue
+                    for player_id in player_ids:
+                        row = rows.get(player_id)
+                        board.update(player_id, _entry(stat, row) if row is not None and _qualifies(stat, row) else None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.boards.clear()
+
+
+# Global leaderboard cache
+leaderboard_cache = LeaderboardCache()
+
+
+class LeaderboardService:
+    """Maintain player_scope_stats and serve leaderboards"""
+
+    @staticmethod
+    def game_scopes(game: Game, team_by_player: Dict[int, int]) -> Set[ScopeKey]:
+        """Every leaderboard scope a game's stats count towards"""
+        scopes: Set[ScopeKey] = {("league", 0)}
+        if game.tournament_id:
+            scopes.add(("tournament", game.tournament_id))
+        scopes.update(("team", team_id) for team_id in team_by_player.values() if team_id)
+        return scopes
+
+    @staticmethod
+    def apply_game_deltas(game: Game, deltas: Dict[int, Dict[str, int]],
+                          team_by_player: Dict[int, int], db: Session) -> None:
+        """
+        Add per-player career deltas (CareerStatsService.diff_game_rows) to the
+        game's tournament and team scopes; the league scope is UserStats itself
+        Does not commit
+        """
+        rows = []
+        for player_id, delta in deltas.items():
+            values = {column: delta.get(field, 0) for field, column in SCOPE_DELTA_FIELDS.items()}
+            if not any(values.values()):
+                continue
+            targets = []
+            if game.tournament_id:
+                targets.append(("tournament", game.tournament_id))
+            if team_by_player.get(player_id):
+                targets.append(("team", team_by_player[player_id]))
+            for scope, scope_id in targets:
+                rows.append({"scope": scope, "scope_id": scope_id, "player_id": player_id, **values})
+        if not rows:
+            return
+
+        now = datetime.utcnow()
+        dialect = db.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            # Core executemany, so the statement compiles once and is cached
+            insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            statement = insert(PlayerScopeStats.__table__)
+            statement = statement.on_conflict_do_update(
+                index_elements=["scope", "scope_id", "player_id"],
+                set_={
+                    **{
+                        column: statement.table.c[column] + statement.excluded[column]
+                        for column in SCOPE_DELTA_FIELDS.values()
+                    },
+                    "updated_at": statement.excluded.updated_at,
+                },
+            )
+            db.execute(statement, [{**row, "updated_at": now} for row in rows])
+            return
+
+        for row in rows:
+            stats = db.query(PlayerScopeStats).filter(
+                PlayerScopeStats.scope == row["scope"],
+                PlayerScopeStats.scope_id == row["scope_id"],
+                PlayerScopeStats.player_id == row["player_id"],
+            ).first()
+            if not stats:
+                stats = PlayerScopeStats(
+                    scope=row["scope"], scope_id=row["scope_id"], player_id=row["player_id"],
+                    **{column: 0 for column in SCOPE_DELTA_FIELDS.values()}
+                )
+                db.add(stats)
+            for column in SCOPE_DELTA_FIELDS.values():
+                setattr(stats, column, (getattr(stats, column) or 0) + row[column])
+        db.flush()
+
+    @staticmethod
+    def get_leaderboard(stat: str, scope: str, scope_id: int, limit: int, db: Session) -> Dict:
+        """Ranked entries for a stat within a scope"""
+        if stat not in LEADERBOARD_STATS:
+            raise ValueError(f"Unknown leaderboard stat '{stat}'")
+        if scope not in LEADERBOARD_SCOPES:
+            raise ValueError(f"Unknown leaderboard scope '{scope}'")
+
+        entries = leaderboard_cache.get(stat, scope, scope_id if scope != "league" else 0, limit, db)
+        return {
+            "stat": stat,
+            "scope": scope,
+            "scope_id": scope_id if scope != "league" else None,
+            "entries": [
+                {
+                    "rank": rank,
+                    "user_id": entry["user_id"],
+                    "player_name": entry["player_name"],
+                    "games": entry["games"],
+                    "value": entry["value"],
+                }
+                for rank, entry in enumerate(entries, start=1)
+            ],
+        }
+
+    @staticmethod
+    def backfill(db: Session) -> int:
+        """
+        Rebuild player_scope_stats from PlayerGameStats with two INSERT ... SELECT
+        aggregations (tournament via games, team via game_players)
+        Returns the number of rows written
+        """
+        try:
+            db.query(PlayerScopeStats).delete(synchronize_session=False)
+            now = datetime.utcnow()
+            sums = [
+                func.count(PlayerGameStats.id),
+                func.sum(PlayerGameStats.points),
+                func.sum(PlayerGameStats.assists),
+                func.sum(PlayerGameStats.rebounds),
+                func.sum(PlayerGameStats.shots_made),
+                func.sum(PlayerGameStats.shots_attempted),
+            ]
+            target = ["scope", "scope_id", "player_id", *SCOPE_DELTA_FIELDS.values(), "updated_at"]
+
+            tournaments = select(
+                literal("tournament"), Game.tournament_id,
+                PlayerGameStats.player_id, *sums, literal(now, PlayerScopeStats.updated_at.type),
+            ).join(Game, Game.id == PlayerGameStats.game_id).where(
+                Game.tournament_id.isnot(None)
+            ).group_by(Game.tournament_id, PlayerGameStats.player_id)
+
+            teams = select(
+                literal("team"), GamePlayer.team_id,
+                PlayerGameStats.player_id, *sums, literal(now, PlayerScopeStats.updated_at.type),
+            ).join(GamePlayer, and_(
+                GamePlayer.game_id == PlayerGameStats.game_id,
+                GamePlayer.user_id == PlayerGameStats.player_id,
+            )).group_by(GamePlayer.team_id, PlayerGameStats.player_id)
+
+            count = 0
+            for query in (tournaments, teams):
+                count += db.execute(sql_insert(PlayerScopeStats).from_select(target, query)).rowcount
+            db.commit()
+            leaderboard_cache.clear()
+            return count
+        except Exception:
+            db.rollback()
+            raise
@@ -0,0 +1,147 @@
+"""
+Player Name Resolution
+Request-scoped batch loader for player display names: callers queue user ids,
+the first lookup resolves everything queued with one IN query, and resolved
+names are kept in a small process-wide LRU shared across requests
+"""
+
+from sqlalchemy.orm import Session
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+import os
+import threading
+
+from .models import User
+from .services_pubsub import pubsub
+
+# Display names kept across requests
+NAME_CACHE_SIZE = int(os.getenv("NAME_CACHE_SIZE", "4096"))
+# Bus channel carrying name changes to the other workers' caches
+USER_NAME_CHANNEL = "user_name"
+
+UNKNOWN_PLAYER = "Unknown Player"
+
+# (username, first_name, last_name)
+UserNameFields = Tuple[str, Optional[str], Optional[str]]
+
+
+def format_display_name(fields: Optional[UserNameFields]) -> str:
+    """'First Last' when both are set, else the username"""
+    if not fields:
+        return UNKNOWN_PLAYER
+    username, first_name, last_name = fields
+    if first_name and last_name:
+        return f"{first_name} {last_name}"
+    return username
+
+
+class NameCache:
+    """Thread-safe LRU of user name fields keyed by user id"""
+
+    def __init__(self, maxsize: int = NAME_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[int, UserNameFields]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, user_ids: Iterable[int]) -> Dict[int, UserNameFields]:
+        found = {}
+        with self._lock:
+            for user_id in user_ids:
+                fields = self._entries.get(user_id)
+                if fields is not None:
+                    self._entries.move_to_end(user_id)
+                    found[user_id] = fields
+        return found
+
+    def put_many(self, entries: Dict[int, UserNameFields]) -> None:
+        with self._lock:
+            for user_id, fields in entries.items():
+                self._entries[user_id] = fields
+                self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int, publish: bool = True) -> None:
+        """Forget a user whose name changed, here and on the other workers"""
+        with self._lock:
+            self._entries.pop(user_id, None)
+        if publish:
+            pubsub.publish(USER_NAME_CHANNEL, {"user_id": user_id})
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Global name cache
+name_cache = NameCache()
+pubsub.subscribe(USER_NAME_CHANNEL, lambda message: name_cache.invalidate(message["user_id"], publish=False))
+# Names have no TTL; invalidations published while this worker was off the bus were missed
+pubsub.on_connect(name_cache.clear)
+
+
+class NameLoader:
+    """
+    Batches user name lookups for one request/session
+    load() queues ids; name()/fields() resolve all queued ids at once
+    """
+
+    def __init__(self, db: Session, cache: NameCache = name_cache):
+        self.db = db
+        self.cache = cache
+        self._resolved: Dict[int, Optional[UserNameFields]] = {}
+        self._pending = set()
+
+    def load(self, user_ids: Iterable[Optional[int]]) -> "NameLoader":
+        """Queue user ids for the next batch"""
+        for user_id in user_ids:
+            if user_id and user_id not in self._resolved:
+                self._pending.add(user_id)
+        return self
+
+    def prime(self, user: User) -> None:
+        """Record an already-loaded user without querying"""
+        fields = (user.username, user.first_name, user.last_name)
+        self._resolved[user.id] = fields
+        self._pending.discard(user.id)
+        self.cache.put_many({user.id: fields})
+
+    def _dispatch(self) -> None:
+        """Resolve every queued id: LRU first, then one IN query for the rest"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, set()
+
+        cached = self.cache.get_many(pending)
+        self._resolved.update(cached)
+        missing = pending.difference(cached)
+        if not missing:
+            return
+
+        rows = self.db.query(User.id, User.username, User.first_name, User.last_name).filter(
+            User.id.in_(missing)
+        ).all()
+        loaded = {row[0]: tuple(row[1:]) for row in rows}
+        self.cache.put_many(loaded)
+        self._resolved.update(loaded)
+        for user_id in missing.difference(loaded):
+            self._resolved[user_id] = None
+
+    def fields(self, user_id: Optional[int]) -> Optional[UserNameFields]:
+        """(username, first_name, last_name) for a user, None if they do not exist"""
+        if not user_id:
+            return None
+        if user_id not in self._resolved:
+            self._pending.add(user_id)
+        self._dispatch()
+        return self._resolved.get(user_id)
+
+    def name(self, user_id: Optional[int]) -> str:
+        """Display name for a user"""
+        return format_display_name(self.fields(user_id))
+
+    def names(self, user_ids: Iterable[Optional[int]]) -> Dict[int, str]:
+        """Display names for several users with at most one query"""
+        user_ids = [user_id for user_id in user_ids if user_id]
+        self.load(user_ids)._dispatch()
+        return {user_id: format_display_name(self._resolved.get(user_id)) for user_id in user_ids}
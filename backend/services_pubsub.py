@@ -0,0 +1,330 @@
+"""
+Realtime Pub/Sub
+Fans room broadcasts out between worker processes. Each worker delivers a
+broadcast to its own sockets and publishes it on the bus; the other workers
+deliver it to theirs. Room membership counts are shared the same way.
+
+Backends:
+- "memory": single process, publish reaches no one else (default)
+- "unix": local broker on a Unix socket. The first worker to take the lock
+  file hosts the broker and the others connect to it. If that worker exits,
+  another one takes over on reconnect. No outside services are needed.
+
+Other transports plug in by subclassing PubSubBackend and adding the class to
+PUBSUB_BACKENDS; a Redis adapter, for example, could implement start/stop/
+publish with PUBLISH/SUBSCRIBE.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import fcntl
+import logging
+import os
+import tempfile
+import time
+import uuid
+
+from .serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+PUBSUB_BACKEND = os.getenv("PUBSUB_BACKEND", "memory")
+PUBSUB_SOCKET_PATH = os.getenv(
+    "PUBSUB_SOCKET_PATH", os.path.join(tempfile.gettempdir(), "scoring-basket-pubsub.sock")
+)
+# Seconds between broker reconnect attempts
+PUBSUB_RECONNECT_DELAY = float(os.getenv("PUBSUB_RECONNECT_DELAY", "0.5"))
+# Bytes buffered for one connection before messages are dropped (worker)
+# or the connection is closed (broker)
+PUBSUB_MAX_BUFFER = int(os.getenv("PUBSUB_MAX_BUFFER", str(4 * 1024 * 1024)))
+PUBSUB_MAX_FRAME = 1024 * 1024
+
+# Seconds between presence publications; counts from a worker that has been
+# silent for three intervals are ignored
+PRESENCE_INTERVAL = float(os.getenv("PRESENCE_INTERVAL", "1"))
+PRESENCE_CHANNEL = "presence"
+
+Handler = Callable[[dict], None]
+
+
+class PubSubBackend:
+    """
+    Bus interface
+    publish() may be called from any thread and never waits; handlers run on
+    the event loop and only see messages published by other workers
+    """
+
+    def __init__(self):
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.handlers: Dict[str, List[Handler]] = {}
+        self.connect_callbacks: List[Callable[[], None]] = []
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.metrics = {"published": 0, "received": 0, "dropped": 0, "errors": 0}
+
+    def subscribe(self, channel: str, handler: Handler) -> None:
+        self.handlers.setdefault(channel, []).append(handler)
+
+    def on_connect(self, callback: Callable[[], None]) -> None:
+        """Run callback each time this worker (re)joins the bus"""
+        self.connect_callbacks.append(callback)
+
+    async def start(self) -> None:
+        self.loop = asyncio.get_running_loop()
+
+    async def stop(self) -> None:
+        pass
+
+    def publish(self, channel: str, message: dict) -> None:
+        raise NotImplementedError
+
+    def dispatch(self, channel: str, message: dict) -> None:
+        """Run the handlers for a message from another worker"""
+        self.metrics["received"] += 1
+        for handler in self.handlers.get(channel, ()):
+            try:
+                handler(message)
+            except Exception as e:
+                self.metrics["errors"] += 1
+                logger.error(f"Pub/sub handler for {channel} failed: {e}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {**self.metrics, "backend": PUBSUB_BACKEND, "worker_id": self.worker_id}
+
+
+class InProcessBackend(PubSubBackend):
+    """Single worker: there is no one else to publish to"""
+
+    def publish(self, channel: str, message: dict) -> None:
+        pass
+
+
+class UnixSocketBackend(PubSubBackend):
+    """
+    Newline-delimited JSON over a Unix socket
+    The broker relays each frame to every connected worker except the sender
+    """
+
+    def __init__(self, path: str = PUBSUB_SOCKET_PATH):
+        super().__init__()
+        self.path = path
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.task: Optional[asyncio.Task] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.peers: set = set()
+        self._lock_file = None
+        self.metrics.update({"reconnects": 0, "broker_drops": 0})
+
+    async def start(self) -> None:
+        await super().start()
+        self.task = self.loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self.task:
+            self.task.cancel()
+        if self.writer:
+            self.writer.close()
+        if self.server:
+            self.server.close()
+            for peer in list(self.peers):
+                peer.close()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+        if self._lock_file:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def publish(self, channel: str, message: dict) -> None:
+        frame = (dumps({"channel": channel, "data": message}) + "\n").encode()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if self.loop and running is not self.loop:
+            if not self.loop.is_closed():
+                self.loop.call_soon_threadsafe(self._write, frame)
+            return
+        self._write(frame)
+
+    def _write(self, frame: bytes) -> None:
+        writer = self.writer
+        if not writer or writer.is_closing() or writer.transport.get_write_buffer_size() > PUBSUB_MAX_BUFFER:
+            self.metrics["dropped"] += 1
+            return
+        writer.write(frame)
+        self.metrics["published"] += 1
+
+    async def _become_broker(self) -> None:
+        """Host the broker if no live worker holds the lock file"""
+        if self.server:
+            return
+        lock_file = open(self.path + ".lock", "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return
+        try:
+            # Socket file left behind by a broker that exited
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        self._lock_file = lock_file
+        self.server = await asyncio.start_unix_server(self._serve_peer, path=self.path, limit=PUBSUB_MAX_FRAME)
+        logger.info(f"Pub/sub broker listening on {self.path}")
+
+    async def _serve_peer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Broker side: relay every frame from one worker to all the others"""
+        self.peers.add(writer)
+        try:
+            while True:
+                frame = await reader.readline()
+                if not frame:
+                    break
+                for peer in list(self.peers):
+                    if peer is writer or peer.is_closing():
+                        continue
+                    if peer.transport.get_write_buffer_size() > PUBSUB_MAX_BUFFER:
+                        # The worker stopped reading; it reconnects and catches up on presence
+                        self.metrics["broker_drops"] += 1
+                        self.peers.discard(peer)
+                        peer.close()
+                        continue
+                    peer.write(frame)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError, ValueError):
+            pass
+        finally:
+            self.peers.discard(writer)
+            writer.close()
+
+    async def _run(self) -> None:
+        """Connect to the broker (hosting it if needed) and dispatch incoming frames"""
+        while True:
+            try:
+                await self._become_broker()
+                reader, self.writer = await asyncio.open_unix_connection(self.path, limit=PUBSUB_MAX_FRAME)
+                for callback in self.connect_callbacks:
+                    callback()
+                while True:
+                    frame = await reader.readline()
+                    if not frame:
+                        break
+                    message = loads(frame)
+                    self.dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug(f"Pub/sub connection lost: {e}")
+            self.writer = None
+            self.metrics["reconnects"] += 1
+            await asyncio.sleep(PUBSUB_RECONNECT_DELAY)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            **super().get_metrics(),
+            "connected": self.writer is not None,
+            "broker": self.server is not None,
+            "broker_peers": len(self.peers),
+        }
+
+
+PUBSUB_BACKENDS = {
+    "memory": InProcessBackend,
+    "unix": UnixSocketBackend,
+}
+
+
+def create_backend(name: str = PUBSUB_BACKEND) -> PubSubBackend:
+    if name not in PUBSUB_BACKENDS:
+        raise ValueError(f"Unknown PUBSUB_BACKEND {name!r}; expected one of {', '.join(PUBSUB_BACKENDS)}")
+    return PUBSUB_BACKENDS[name]()
+
+
+class PresenceTracker:
+    """
+    Room membership counts summed over all workers
+    Each worker publishes its local counts per room kind ("game", "match")
+    whenever they change, and at least every few intervals as a heartbeat
+    """
+
+    def __init__(self, bus: PubSubBackend, interval: float = PRESENCE_INTERVAL):
+        self.bus = bus
+        self.interval = interval
+        self.providers: Dict[str, Callable[[], Dict[int, int]]] = {}
+        self.remote: Dict[str, tuple] = {}  # worker_id -> (received_at, counts)
+        self.task: Optional[asyncio.Task] = None
+        self._last_published: Optional[dict] = None
+        bus.subscribe(PRESENCE_CHANNEL, self._on_presence)
+        bus.on_connect(self._hello)
+
+    def register(self, kind: str, provider: Callable[[], Dict[int, int]]) -> None:
+        """provider() returns this worker's {room_id: members} for a room kind"""
+        self.providers[kind] = provider
+
+    def local_counts(self) -> Dict[str, Dict[int, int]]:
+        return {kind: provider() for kind, provider in self.providers.items()}
+
+    def _hello(self) -> None:
+        """Announce ourselves on (re)connect; the other workers answer with their counts"""
+        self._last_published = None
+        self.bus.publish(PRESENCE_CHANNEL, {"worker": self.bus.worker_id, "counts": self.local_counts(), "hello": True})
+
+    def _on_presence(self, message: dict) -> None:
+        if message.get("hello"):
+            # Republish on the next tick so the new worker sees our rooms
+            self._last_published = None
+        counts = {
+            kind: {int(room_id): members for room_id, members in rooms.items()}
+            for kind, rooms in message["counts"].items()
+        }
+        if counts:
+            self.remote[message["worker"]] = (time.monotonic(), counts)
+        else:
+            self.remote.pop(message["worker"], None)
+
+    def _remote_counts(self):
+        expired_before = time.monotonic() - 3 * self.interval
+        for worker, (received_at, counts) in list(self.remote.items()):
+            if received_at < expired_before:
+                del self.remote[worker]
+                continue
+            yield counts
+
+    def counts(self, kind: str) -> Dict[int, int]:
+        """{room_id: members} over every worker, rooms with members only"""
+        totals = dict(self.providers[kind]()) if kind in self.providers else {}
+        for counts in self._remote_counts():
+            for room_id, members in counts.get(kind, {}).items():
+                totals[room_id] = totals.get(room_id, 0) + members
+        return {room_id: members for room_id, members in totals.items() if members}
+
+    def count(self, kind: str, room_id: int) -> int:
+        return self.counts(kind).get(room_id, 0)
+
+    async def start(self) -> None:
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self.task:
+            self.task.cancel()
+        self.bus.publish(PRESENCE_CHANNEL, {"worker": self.bus.worker_id, "counts": {}})
+
+    async def _run(self) -> None:
+        heartbeat = 0
+        while True:
+            counts = {
+                kind: {room_id: members for room_id, members in rooms.items() if members}
+                for kind, rooms in self.local_counts().items()
+            }
+            heartbeat += 1
+            if counts != self._last_published or heartbeat >= 2:
+                self.bus.publish(PRESENCE_CHANNEL, {"worker": self.bus.worker_id, "counts": counts})
+                self._last_published = counts
+                heartbeat = 0
+            await asyncio.sleep(self.interval)
+
+
+# Global bus and presence tracker
+pubsub = create_backend()
+presence = PresenceTracker(pubsub)
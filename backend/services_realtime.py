@@ -3,14 +3,41 @@ Real-time Services
 Handles WebSocket connections, live match updates, and broadcasting
 """
 
-from typing import Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set
 from sqlalchemy.orm import Session
+from collections import deque
 from datetime import datetime
-import json
+from itertools import islice
 import asyncio
+import logging
+import os
+import threading
+import uuid
 from enum import Enum
 
 from .models import Game, GameEvent, User, Team
+from .serialization import dumps
+from .services_pubsub import pubsub, presence
+
+logger = logging.getLogger(__name__)
+
+# Outbound messages buffered per /ws/match connection
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "64"))
+# What to do with a spectator whose queue is full:
+# "fast_forward" replaces the backlog with the room snapshot, "drop" disconnects
+WS_SLOW_CONSUMER_POLICY = os.getenv("WS_SLOW_CONSUMER_POLICY", "fast_forward")
+# Seconds a single socket write may take before the connection is dropped
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "5"))
+# Close code for dropped slow consumers ("try again later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+# Bus channel carrying /ws/match broadcasts between workers
+MATCH_CHANNEL = "match"
+
+# Events kept per room for reconnecting clients (resume_from)
+ROOM_HISTORY_SIZE = int(os.getenv("ROOM_HISTORY_SIZE", "100"))
+# Events included in a room state snapshot
+ROOM_STATE_RECENT_EVENTS = 10
 
 
 class EventType(str, Enum):
@@ -56,19 +83,39 @@ class RealtimeEvent:
             "timestamp": self.timestamp.isoformat()
         }
     
+    @classmethod
+    def from_dict(cls, data: dict) -> "RealtimeEvent":
+        """Rebuild an event from to_dict() output"""
+        return cls(
+            event_type=EventType(data["type"]),
+            game_id=data["game_id"],
+            data=data["data"],
+            user_id=data.get("user_id"),
+            timestamp=datetime.fromisoformat(data["timestamp"])
+        )
+    
     def to_json(self) -> str:
         """Convert event to JSON string"""
-        return json.dumps(self.to_dict())
+        return dumps(self.to_dict())
 
 
 class GameRoom:
-    """Manages WebSocket connections for a specific game"""
+    """
+    Manages WebSocket connections for a specific game
+    Events get consecutive sequence numbers and are kept, encoded, in a
+    fixed-size ring buffer; stream identifies the numbering, which is local
+    to this room on this worker
+    """
     
     def __init__(self, game_id: int):
         self.game_id = game_id
         self.spectators: Set[str] = set()  # Connection IDs
         self.scoreboard_data: dict = {}
-        self.events_history: List[RealtimeEvent] = []
+        # (seq, event dict, encoded event), oldest first
+        self.events_history: deque = deque(maxlen=ROOM_HISTORY_SIZE)
+        self.seq = 0
+        self.stream = uuid.uuid4().hex[:12]
+        self._lock = threading.Lock()
         self.created_at = datetime.utcnow()
         self.last_activity = datetime.utcnow()
     
@@ -92,13 +139,45 @@ class GameRoom:
         """Get number of active spectators"""
         return len(self.spectators)
     
-    def add_event(self, event: RealtimeEvent) -> None:
-        """Add event to history"""
-        self.events_history.append(event)
+    def add_event(self, event: RealtimeEvent, envelope: Optional[str] = None) -> str:
+        """
+        Add event to history; returns it encoded, with its seq, ready to send
+        With an envelope the event is sent (and replayed) wrapped as
+        {"type": envelope, "data": event, "seq": seq}
+        """
+        data = event.to_dict()
+        with self._lock:
+            self.seq += 1
+            data["seq"] = self.seq
+            text = dumps({"type": envelope, "data": data, "seq": self.seq} if envelope else data)
+            # The deque drops the oldest event once full
+            self.events_history.append((self.seq, data, text))
         self.last_activity = datetime.utcnow()
-        # Keep only last 100 events
-        if len(self.events_history) > 100:
-            self.events_history = self.events_history[-100:]
+        return text
+    
+    def events_since(self, seq: int) -> Optional[List[str]]:
+        """
+        Encoded events after seq, oldest first
+        None if seq is not from this stream or events after it were evicted
+        """
+        with self._lock:
+            if seq > self.seq or seq < 0:
+                return None
+            if seq == self.seq:
+                return []
+            oldest = self.events_history[0][0]
+            if seq < oldest - 1:
+                return None
+            return [text for _, _, text in islice(self.events_history, seq - oldest + 1, None)]
+    
+    def recent_events(self, limit: Optional[int] = None) -> List[dict]:
+        """The last limit events (all kept events if None), oldest first"""
+        with self._lock:
+            if limit is None:
+                return [data for _, data, _ in self.events_history]
+            recent = [data for _, data, _ in islice(reversed(self.events_history), limit)]
+        recent.reverse()
+        return recent
     
     def update_scoreboard(self, home_score: int, away_score: int) -> dict:
         """Update and return scoreboard data"""
@@ -115,10 +194,89 @@ class GameRoom:
             "game_id": self.game_id,
             "spectators": self.get_spectator_count(),
             "scoreboard": self.scoreboard_data,
-            "recent_events": [e.to_dict() for e in self.events_history[-10:]],
+            "seq": self.seq,
+            "stream": self.stream,
+            "recent_events": self.recent_events(ROOM_STATE_RECENT_EVENTS),
             "created_at": self.created_at.isoformat(),
             "last_activity": self.last_activity.isoformat()
         }
+    
+    def get_snapshot(self) -> dict:
+        """Room state message for clients that cannot catch up event by event"""
+        return {"type": "snapshot", "data": self.get_state()}
+
+
+class ConnectionSender:
+    """
+    Bounded send queue and writer task for one WebSocket
+    Publishers enqueue encoded text without awaiting; the writer task drains
+    the queue, so a slow socket never blocks a room broadcast
+    """
+
+    def __init__(self, connection_id: str, websocket: Any, metrics: Dict[str, int],
+                 maxsize: int = WS_SEND_QUEUE_SIZE):
+        self.connection_id = connection_id
+        self.websocket = websocket
+        self.metrics = metrics
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.task: Optional[asyncio.Task] = None
+        self.closed = False
+
+    def start(self) -> None:
+        """Start the writer task; must run on the event loop"""
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    def offer(self, text: str) -> bool:
+        """Queue a message without waiting; False if the queue is full"""
+        if self.closed:
+            return True
+        try:
+            self.queue.put_nowait(text)
+        except asyncio.QueueFull:
+            return False
+        self.metrics["enqueued"] += 1
+        self.metrics["max_queue_depth"] = max(self.metrics["max_queue_depth"], self.queue.qsize())
+        return True
+
+    def fast_forward(self, snapshot_text: str) -> None:
+        """Discard the queued backlog and queue the room snapshot in its place"""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.metrics["skipped"] += 1
+        self.queue.put_nowait(snapshot_text)
+        self.metrics["fast_forwards"] += 1
+
+    def stop(self) -> None:
+        """Stop writing; queued messages are discarded"""
+        self.closed = True
+        if self.task and not self.task.done():
+            self.task.cancel()
+
+    def drop(self) -> None:
+        """Stop writing and close the socket"""
+        self.stop()
+        asyncio.get_running_loop().create_task(self._close())
+
+    async def _close(self) -> None:
+        try:
+            await self.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE, reason="Connection too slow")
+        except Exception:
+            pass
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                text = await self.queue.get()
+                await asyncio.wait_for(self.websocket.send_text(text), WS_SEND_TIMEOUT)
+                self.metrics["sent"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Write failed or timed out: the socket is gone or too slow to keep
+            self.closed = True
+            self.metrics["send_errors"] += 1
+            logger.debug(f"Writer for {self.connection_id} stopped: {e}")
+            await self._close()
 
 
 class ConnectionManager:
@@ -128,6 +286,12 @@ class ConnectionManager:
         self.rooms: Dict[int, GameRoom] = {}
         self.connection_map: Dict[str, int] = {}  # connection_id -> game_id
         self.active_connections: Dict[str, dict] = {}  # connection_id -> user info
+        self.senders: Dict[str, ConnectionSender] = {}  # connection_id -> send queue
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.metrics = {
+            "enqueued": 0, "sent": 0, "overflows": 0, "fast_forwards": 0,
+            "skipped": 0, "dropped": 0, "send_errors": 0, "max_queue_depth": 0,
+        }
     
     def create_room(self, game_id: int) -> GameRoom:
         """Create a new match room"""
@@ -144,10 +308,16 @@ class ConnectionManager:
         connection_id: str,
         game_id: int,
         user_id: int,
-        username: str
+        username: str,
+        websocket: Any = None
     ) -> GameRoom:
-        """Add a new WebSocket connection"""
+        """Add a new WebSocket connection; with a socket, on the event loop"""
         room = self.create_room(game_id)
+        if websocket is not None:
+            self.loop = asyncio.get_running_loop()
+            sender = ConnectionSender(connection_id, websocket, self.metrics)
+            sender.start()
+            self.senders[connection_id] = sender
         room.add_spectator(connection_id)
         self.connection_map[connection_id] = game_id
         self.active_connections[connection_id] = {
@@ -172,6 +342,9 @@ class ConnectionManager:
             
             del self.connection_map[connection_id]
             del self.active_connections[connection_id]
+            sender = self.senders.pop(connection_id, None)
+            if sender:
+                sender.stop()
             return game_id
         return None
     
@@ -186,14 +359,110 @@ class ConnectionManager:
         """Get match ID for a connection"""
         return self.connection_map.get(connection_id)
     
-    def broadcast_to_match(self, game_id: int, event: RealtimeEvent) -> int:
-        """Broadcast event to all connections in a match"""
+    def send_to_connection(self, connection_id: str, message: dict) -> None:
+        """Queue a message for one connection"""
+        self.send_text_to_connection(connection_id, dumps(message))
+
+    def send_text_to_connection(self, connection_id: str, text: str) -> None:
+        """Queue already encoded text for one connection"""
+        sender = self.senders.get(connection_id)
+        if sender and not sender.offer(text):
+            self._overflow(sender, self.connection_map.get(connection_id), {})
+
+    def send_to_match(self, game_id: int, message: dict, exclude: Optional[str] = None) -> int:
+        """
+        Encode a message once and queue it for every socket in a match room,
+        on this worker and (through the pub/sub bus) on the others
+        Never waits on a socket; safe to call from worker threads
+        """
+        text = dumps(message)
+        pubsub.publish(MATCH_CHANNEL, {"game_id": game_id, "text": text})
+        return self._deliver(game_id, text, exclude)
+
+    def _deliver(self, game_id: int, text: str, exclude: Optional[str] = None) -> int:
+        """Fan encoded text out to local sockets, hopping to the server loop if needed"""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if self.loop and running is not self.loop:
+            if not self.loop.is_closed():
+                self.loop.call_soon_threadsafe(self._fan_out, game_id, text, exclude)
+            room = self.rooms.get(game_id)
+            return room.get_spectator_count() if room else 0
+        return self._fan_out(game_id, text, exclude)
+
+    def receive_remote(self, message: dict) -> None:
+        """
+        Deliver a broadcast published by another worker to this worker's sockets
+        Events are added to the local history so they carry this room's seq
+        """
+        room = self.rooms.get(message["game_id"])
+        if not room:
+            return
+        if "event" in message:
+            text = room.add_event(RealtimeEvent.from_dict(message["event"]), message.get("envelope"))
+        else:
+            text = message["text"]
+        self._fan_out(message["game_id"], text)
+
+    def _fan_out(self, game_id: int, text: str, exclude: Optional[str] = None) -> int:
+        """Queue encoded text for a room; slow consumers get the overflow policy"""
         room = self.rooms.get(game_id)
         if not room:
             return 0
-        
-        room.add_event(event)
-        return room.get_spectator_count()
+        snapshot: Dict[str, str] = {}
+        queued = 0
+        for connection_id in list(room.spectators):
+            sender = self.senders.get(connection_id)
+            if connection_id == exclude or not sender:
+                continue
+            if sender.offer(text):
+                queued += 1
+            else:
+                self._overflow(sender, game_id, snapshot)
+        return queued
+
+    def _overflow(self, sender: ConnectionSender, game_id: Optional[int], snapshot: Dict[str, str]) -> None:
+        """
+        Handle a full send queue: fast-forward the connection to the room
+        snapshot (encoded once per fan-out) or drop it
+        """
+        self.metrics["overflows"] += 1
+        room = self.rooms.get(game_id)
+        if WS_SLOW_CONSUMER_POLICY == "fast_forward" and room:
+            if "text" not in snapshot:
+                snapshot["text"] = dumps(room.get_snapshot())
+            sender.fast_forward(snapshot["text"])
+            return
+        self.metrics["dropped"] += 1
+        self.senders.pop(sender.connection_id, None)
+        sender.drop()
+
+    def broadcast_to_match(self, game_id: int, event: RealtimeEvent, envelope: Optional[str] = None) -> int:
+        """Broadcast event to all connections in a match, optionally wrapped (see GameRoom.add_event)"""
+        message = {"game_id": game_id, "event": event.to_dict()}
+        if envelope:
+            message["envelope"] = envelope
+        pubsub.publish(MATCH_CHANNEL, message)
+        room = self.rooms.get(game_id)
+        if not room:
+            return 0
+        return self._deliver(game_id, room.add_event(event, envelope))
+
+    def get_spectator_counts(self) -> Dict[int, int]:
+        """This worker's {game_id: spectators}"""
+        return {game_id: room.get_spectator_count() for game_id, room in self.rooms.items()}
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Backpressure counters for /ws/match connections"""
+        return {
+            **self.metrics,
+            "connections": len(self.senders),
+            "queued": sum(sender.queue.qsize() for sender in self.senders.values()),
+            "queue_size": WS_SEND_QUEUE_SIZE,
+            "policy": WS_SLOW_CONSUMER_POLICY,
+        }
     
     def get_active_matches(self) -> List[dict]:
         """Get list of active matches with spectator info"""
@@ -369,7 +638,7 @@ class RealtimeService:
         username: str,
         message: str
     ) -> RealtimeEvent:
-        """Broadcast chat message to match spectators"""
+        """Broadcast chat message to match spectators as {"type": "chat", "data": event}"""
         event = RealtimeEvent(
             event_type=EventType.MESSAGE,
             game_id=game_id,
@@ -382,15 +651,12 @@ class RealtimeService:
             }
         )
         
-        self.connection_manager.broadcast_to_match(game_id, event)
+        self.connection_manager.broadcast_to_match(game_id, event, envelope="chat")
         return event
     
     def get_spectator_count(self, game_id: int) -> int:
-        """Get number of spectators for a match"""
-        room = self.connection_manager.get_room(game_id)
-        if room:
-            return room.get_spectator_count()
-        return 0
+        """Get number of spectators for a match, across all workers"""
+        return presence.count("match", game_id)
     
     def get_match_state(self, game_id: int) -> dict:
         """Get current state of a match room"""
@@ -402,3 +668,5 @@ class RealtimeService:
 
 # Global instance
 realtime_service = RealtimeService()
+pubsub.subscribe(MATCH_CHANNEL, realtime_service.connection_manager.receive_remote)
+presence.register("match", realtime_service.connection_manager.get_spectator_counts)
@@ -0,0 +1,324 @@
+"""
+Token Revocation
+Revoked access tokens are stored in the revoked_tokens table, keyed by jti
+(logout) or by user + issued-at (deactivation). An in-memory Bloom filter
+over those keys sits in front of the table, so a token that was never
+revoked is accepted after a bit probe, without a query. Only filter hits
+are confirmed against the database. The filter is rebuilt from the table at
+startup and on every bus (re)connect, and new revocations are added on
+every worker through the pub/sub bus.
+
+With several workers (WEB_CONCURRENCY > 1) this needs a shared bus
+(PUBSUB_BACKEND=unix). On the in-process bus another worker's revocation
+would never reach this worker's filter, so the filter is bypassed and
+every check queries the table.
+"""
+
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+
+from .models import RevokedToken
+from .services_pubsub import pubsub, InProcessBackend
+
+logger = logging.getLogger(__name__)
+
+# Revocations the filter is sized for before its false-positive rate climbs;
+# a rebuild grows it to twice the live rows if there are more
+REVOCATION_BLOOM_CAPACITY = int(os.getenv("REVOCATION_BLOOM_CAPACITY", "100000"))
+REVOCATION_BLOOM_ERROR_RATE = float(os.getenv("REVOCATION_BLOOM_ERROR_RATE", "0.001"))
+# Filter hits whose database answer is remembered, so a revoked token that
+# keeps being retried costs one query per worker
+REVOCATION_MEMO_SIZE = int(os.getenv("REVOCATION_MEMO_SIZE", "4096"))
+TOKEN_REVOKED_CHANNEL = "token_revoked"
+# Worker processes serving the app (the variable uvicorn/gunicorn read)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+_MISSING = object()
+
+
+def jti_key(jti: str) -> str:
+    return f"jti:{jti}"
+
+
+def user_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over string keys
+    One blake2b digest per key gives the k bit positions (double hashing)
+    """
+
+    def __init__(self, capacity: int = REVOCATION_BLOOM_CAPACITY, error_rate: float = REVOCATION_BLOOM_ERROR_RATE):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _hashes(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        return (
+            int.from_bytes(digest[:8], "little") % self.size,
+            int.from_bytes(digest[8:], "little") % self.size or 1,
+        )
+
+    def add(self, key: str) -> None:
+        """Not thread-safe; callers serialize adds"""
+        position, step = self._hashes(key)
+        bits, size = self.bits, self.size
+        for _ in range(self.hashes):
+            bits[position >> 3] |= 1 << (position & 7)
+            position = (position + step) % size
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        position, step = self._hashes(key)
+        bits, size = self.bits, self.size
+        for _ in range(self.hashes):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+            position = (position + step) % size
+        return True
+
+
+class TokenRevocationList:
+    """
+    Revocation checks for verified access tokens
+    Until the first rebuild succeeds every check goes to the database, so a
+    worker that could not load the table never accepts a revoked token
+    """
+
+    def __init__(self, session_factory: Optional[sessionmaker] = None):
+        # Sessions for the revoked_tokens table; the app's SessionLocal unless given
+        self.session_factory = session_factory
+        self.filter = BloomFilter()
+        self.ready = False
+        # The filter and memo are only trusted if every worker's revocations reach them
+        self.shared = WEB_CONCURRENCY <= 1 or not isinstance(pubsub, InProcessBackend)
+        if not self.shared:
+            logger.warning(
+                f"WEB_CONCURRENCY={WEB_CONCURRENCY} on the in-process pub/sub bus: token revocation "
+                "checks query the database on every request; set PUBSUB_BACKEND=unix"
+            )
+        self._memo: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+        self._pending: Optional[list] = None  # keys added while a rebuild is reading the table
+        self._generation = 0  # bumped on every add, so a lookup racing a revocation isn't memoized
+        self.metrics = {
+            "checks": 0, "filter_hits": 0, "db_checks": 0, "revoked": 0,
+            "false_positives": 0, "rebuilds": 0, "rebuild_ms": 0.0,
+        }
+
+    # ==================== CHECKS ====================
+
+    def is_revoked(self, user_id: int, iat: int, jti: Optional[str] = None) -> bool:
+        """True if the token was revoked by jti, or by a user-wide revocation covering its iat"""
+        self.metrics["checks"] += 1
+        if jti is not None and self._confirm(jti_key(jti), self._jti_revoked, jti):
+            return self._revoked()
+        not_before = self._confirm(user_key(user_id), self._user_not_before, user_id)
+        return self._covers(not_before, iat)
+
+    async def is_revoked_async(self, user_id: int, iat: int, jti: Optional[str] = None) -> bool:
+        """is_revoked for the event loop: a check that needs the table runs in the threadpool"""
+        self.metrics["checks"] += 1
+        if jti is not None and await self._confirm_async(jti_key(jti), self._jti_revoked, jti):
+            return self._revoked()
+        not_before = await self._confirm_async(user_key(user_id), self._user_not_before, user_id)
+        return self._covers(not_before, iat)
+
+    def _covers(self, not_before: Optional[int], iat: int) -> bool:
+        if not_before is not None and iat <= not_before:
+            return self._revoked()
+        return False
+
+    def _revoked(self) -> bool:
+        self.metrics["revoked"] += 1
+        return True
+
+    def _session(self) -> Session:
+        if self.session_factory is None:
+            # Lazy import to avoid circular imports
+            from .database import SessionLocal
+            self.session_factory = SessionLocal
+        return self.session_factory()
+
+    def _cached(self, key: str) -> Tuple[Any, Optional[int]]:
+        """
+        Answer from the filter or memo without a query: (value, None), or
+        (_MISSING, memo generation) when the table has to be asked
+        """
+        if not self.shared:
+            return _MISSING, None
+        if self.ready and key not in self.filter:
+            return None, None
+        self.metrics["filter_hits"] += 1
+        with self._lock:
+            value = self._memo.get(key, _MISSING)
+            if value is not _MISSING:
+                self._memo.move_to_end(key)
+                return value, None
+            return _MISSING, self._generation
+
+    def _query(self, key: str, generation: Optional[int], lookup, *args):
+        """Ask the table, remembering a filter hit's answer unless a revocation raced it"""
+        self.metrics["db_checks"] += 1
+        with self._session() as db:
+            value = lookup(db, *args)
+        if generation is None:
+            return value
+        if not value:
+            self.metrics["false_positives"] += 1
+        with self._lock:
+            if generation != self._generation:
+                return value
+            self._memo[key] = value
+            while len(self._memo) > REVOCATION_MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return value
+
+    def _confirm(self, key: str, lookup, *args):
+        """Database answer for a key the filter can't rule out; None/False when the filter can"""
+        value, generation = self._cached(key)
+        if value is _MISSING:
+            value = self._query(key, generation, lookup, *args)
+        return value
+
+    async def _confirm_async(self, key: str, lookup, *args):
+        value, generation = self._cached(key)
+        if value is _MISSING:
+            value = await run_in_threadpool(self._query, key, generation, lookup, *args)
+        return value
+
+    @staticmethod
+    def _jti_revoked(db: Session, jti: str) -> bool:
+        return db.query(RevokedToken.id).filter(RevokedToken.jti == jti).first() is not None
+
+    @staticmethod
+    def _user_not_before(db: Session, user_id: int) -> Optional[int]:
+        row = (
+            db.query(RevokedToken.not_before)
+            .filter(RevokedToken.user_id == user_id, RevokedToken.jti.is_(None))
+            .order_by(RevokedToken.not_before.desc())
+            .first()
+        )
+        return row[0] if row else None
+
+    # ==================== REVOCATION ====================
+
+    def revoke_token(self, db: Session, user_id: int, jti: str, expires_at: datetime) -> None:
+        """Revoke one access token until it expires"""
+        if self._jti_revoked(db, jti):
+            return
+        db.add(RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at))
+        db.commit()
+        self.add(jti_key(jti))
+
+    def revoke_user(self, db: Session, user_id: int) -> None:
+        """Revoke every token issued to a user up to now"""
+        from .security import REFRESH_TOKEN_EXPIRE_DAYS
+
+        # Covers the longest-lived token issued before now
+        expires_at = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+        db.add(RevokedToken(user_id=user_id, not_before=int(time.time()), expires_at=expires_at))
+        db.commit()
+        self.add(user_key(user_id))
+
+    def add(self, key: str, publish: bool = True) -> None:
+        """Add a revoked key to the filter, here and on the other workers"""
+        with self._lock:
+            self.filter.add(key)
+            self._memo.pop(key, None)
+            self._generation += 1
+            if self._pending is not None:
+                self._pending.append(key)
+        if publish:
+            pubsub.publish(TOKEN_REVOKED_CHANNEL, {"key": key})
+
+    # ==================== REBUILD ====================
+
+    def rebuild(self) -> int:
+        """
+        Purge expired rows and reload the filter from the rest
+        Returns the number of revocations loaded
+        """
+        with self._rebuild_lock:
+            start = time.perf_counter()
+            with self._lock:
+                self._pending = []
+            try:
+                with self._session() as db:
+                    try:
+                        db.query(RevokedToken).filter(RevokedToken.expires_at <= datetime.utcnow()).delete(
+                            synchronize_session=False
+                        )
+                        db.commit()
+                    except Exception:
+                        db.rollback()
+                        raise
+                    rows = db.query(RevokedToken.jti, RevokedToken.user_id).all()
+
+                bloom = BloomFilter(max(REVOCATION_BLOOM_CAPACITY, 2 * len(rows)))
+                for jti, user_id in rows:
+                    bloom.add(jti_key(jti) if jti is not None else user_key(user_id))
+            except Exception:
+                with self._lock:
+                    self._pending = None
+                raise
+
+            with self._lock:
+                # Revocations that arrived while the table was being read
+                for key in self._pending:
+                    bloom.add(key)
+                self._pending = None
+                self.filter = bloom
+                self._memo.clear()
+                self._generation += 1
+                self.ready = True
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.metrics["rebuilds"] += 1
+            self.metrics["rebuild_ms"] = round(elapsed_ms, 2)
+            logger.info(f"Loaded {len(rows)} token revocations in {elapsed_ms:.1f} ms")
+            return len(rows)
+
+    def _on_connect(self) -> None:
+        """Revocations published while this worker was off the bus were missed; reload"""
+        if pubsub.loop is not None:
+            pubsub.loop.run_in_executor(None, self._rebuild_logged)
+
+    def _rebuild_logged(self) -> None:
+        try:
+            self.rebuild()
+        except Exception as e:
+            logger.error(f"Token revocation rebuild failed: {e}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        bloom = self.filter
+        return {
+            **self.metrics,
+            "ready": self.ready,
+            "shared": self.shared,
+            "filter_keys": bloom.count,
+            "filter_bits": bloom.size,
+            "filter_hashes": bloom.hashes,
+            "memo_size": len(self._memo),
+        }
+
+
+# Global token revocation list
+token_revocations = TokenRevocationList()
+pubsub.subscribe(TOKEN_REVOKED_CHANNEL, lambda message: token_revocations.add(message["key"], publish=False))
+pubsub.on_connect(token_revocations._on_connect)
@@ -0,0 +1,37 @@
+"""
+In-memory top-K leaderboard maintenance
+"""
+
+from app.services_leaderboards import TopK
+
+
+def entry(user_id, points):
+    return {"user_id": user_id, "value": points, "sort_key": (-points, user_id)}
+
+
+def board_points(board):
+    return [(row["user_id"], row["value"]) for row in board.top(10)]
+
+
+def test_newcomer_dropped_from_full_board_makes_it_incomplete():
+    board = TopK([entry(2, 40)], k=2)
+    board.update(1, entry(1, 50))
+    assert board.complete
+
+    # Qualifies, but the board is full of better players
+    board.update(3, entry(3, 30))
+    assert not board.complete
+
+    # Player 3 may now belong on the board, so this can't be applied in place
+    board.update(1, entry(1, 10))
+    assert board.stale
+
+
+def test_complete_board_applies_demotions_in_place():
+    board = TopK([entry(1, 50)], k=3)
+    board.update(2, entry(2, 40))
+
+    board.update(1, entry(1, 10))
+
+    assert not board.stale
+    assert board_points(board) == [(2, 40), (1, 10)]
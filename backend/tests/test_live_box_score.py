@@ -0,0 +1,72 @@
+"""
+Live box score rows for games whose events predate the live tables
+"""
+
+from app.models import User, Team, Game, GameEvent, LivePlayerGameStats, LiveTeamGameStats
+from app.routes import undo_event
+from app.services import LiveBoxScoreService
+from app.services_games import GameService
+
+
+def seed_game(db):
+    """An active game with one player on the home team"""
+    users = [User(email=f"u{i}@test", username=f"u{i}", password_hash="x") for i in range(2)]
+    db.add_all(users)
+    db.flush()
+    home = Team(name="Home", owner_id=users[0].id)
+    away = Team(name="Away", owner_id=users[1].id)
+    db.add_all([home, away])
+    db.flush()
+    game = Game(home_team_id=home.id, away_team_id=away.id, status="active", created_by=users[0].id)
+    db.add(game)
+    db.commit()
+    return game, users[0], home
+
+
+def add_raw_events(db, game, user, team, count):
+    """Made 2PTs written straight to game_events, as before the live tables existed"""
+    for i in range(count):
+        db.add(GameEvent(game_id=game.id, user_id=user.id, team_id=team.id, event_type="2PT",
+                         period=1, timestamp=i, outcome="made"))
+    db.commit()
+
+
+def live_points(db, game, user, team):
+    player = db.query(LivePlayerGameStats).filter(
+        LivePlayerGameStats.game_id == game.id, LivePlayerGameStats.user_id == user.id
+    ).one()
+    team_row = db.query(LiveTeamGameStats).filter(
+        LiveTeamGameStats.game_id == game.id, LiveTeamGameStats.team_id == team.id
+    ).one()
+    return player.points, team_row.points
+
+
+def test_first_new_event_backfills_older_events(db):
+    game, user, team = seed_game(db)
+    add_raw_events(db, game, user, team, 3)
+
+    GameService(db).add_match_event(game.id, user.id, team.id, "2PT", timestamp=10, period=1, outcome="made")
+
+    assert live_points(db, game, user, team) == (8, 8)
+    assert LiveBoxScoreService.get_box_score(game, db)[team.id]["points"] == 8
+
+
+def test_later_events_apply_incrementally(db):
+    game, user, team = seed_game(db)
+    add_raw_events(db, game, user, team, 1)
+    service = GameService(db)
+
+    service.add_match_event(game.id, user.id, team.id, "2PT", timestamp=10, period=1, outcome="made")
+    service.add_match_event(game.id, user.id, team.id, "3PT", timestamp=11, period=1, outcome="made")
+
+    assert live_points(db, game, user, team) == (7, 7)
+
+
+def test_first_undo_backfills_remaining_events(db):
+    game, user, team = seed_game(db)
+    add_raw_events(db, game, user, team, 3)
+    last = db.query(GameEvent).order_by(GameEvent.id.desc()).first()
+
+    undo_event(game.id, last.id, db=db)
+
+    assert live_points(db, game, user, team) == (4, 4)
@@ -0,0 +1,46 @@
+"""
+Derived tables seeded at startup on databases that predate them
+"""
+
+from app.database import engine
+from app.migrations import seed_career_stats, seed_standings
+from app.models import User, Team, Game, PlayerGameStats, UserStats, TeamStanding
+
+
+def seed_played_game(db):
+    """A completed game with a stats line for one player, and no derived rows"""
+    users = [User(email=f"u{i}@test", username=f"u{i}", password_hash="x") for i in range(2)]
+    db.add_all(users)
+    db.flush()
+    home = Team(name="Home", owner_id=users[0].id)
+    away = Team(name="Away", owner_id=users[1].id)
+    db.add_all([home, away])
+    db.flush()
+    game = Game(home_team_id=home.id, away_team_id=away.id, status="completed", created_by=users[0].id,
+                home_score=12, away_score=8)
+    db.add(game)
+    db.flush()
+    db.add(PlayerGameStats(player_id=users[0].id, game_id=game.id, points=12, assists=3))
+    db.commit()
+    return game, users[0], home, away
+
+
+def test_career_stats_are_backfilled_once(db):
+    _, user, _, _ = seed_played_game(db)
+
+    assert seed_career_stats(engine) == 2
+    stats = db.query(UserStats).filter(UserStats.user_id == user.id).one()
+    assert (stats.total_matches, stats.total_points, stats.total_assists) == (1, 12, 3)
+
+    # Totals exist now, so the next startup leaves them alone
+    assert seed_career_stats(engine) == 0
+
+
+def test_standings_are_backfilled_once(db):
+    _, _, home, away = seed_played_game(db)
+
+    assert seed_standings(engine) == 1
+    standings = {row.team_id: (row.wins, row.losses) for row in db.query(TeamStanding).all()}
+    assert standings == {home.id: (1, 0), away.id: (0, 1)}
+
+    assert seed_standings(engine) == 0
@@ -0,0 +1,73 @@
+"""
+Access token revocation: refresh tokens, logout, and workers without a shared bus
+"""
+
+from datetime import datetime
+import asyncio
+import threading
+
+from app import services_token_revocation
+from app.models import User, RevokedToken
+from app.security import access_token_claims, create_access_token, create_refresh_token, decode_token
+from app.services_auth import AuthService
+from app.services_token_revocation import TokenRevocationList
+
+
+def seed_user(db):
+    user = User(email="u@test", username="u", password_hash="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_refresh_token_is_not_a_bearer_token(db):
+    user = seed_user(db)
+
+    assert access_token_claims(create_access_token({"sub": str(user.id)}))[0] == user.id
+    assert access_token_claims(create_refresh_token({"sub": str(user.id)})) is None
+
+
+def test_logout_revokes_access_token(db):
+    user = seed_user(db)
+    token = create_access_token({"sub": str(user.id)})
+    other = create_access_token({"sub": str(user.id)})
+
+    success, _ = AuthService.logout_user(db, user.id, token)
+
+    assert success
+    assert access_token_claims(token) is None
+    assert access_token_claims(other) is not None
+
+
+def test_filter_is_bypassed_without_a_shared_bus(db, monkeypatch):
+    user = seed_user(db)
+    token = create_access_token({"sub": str(user.id)})
+    monkeypatch.setattr(services_token_revocation, "WEB_CONCURRENCY", 2)
+    revocations = TokenRevocationList()
+    revocations.rebuild()
+    assert not revocations.shared
+
+    # Revoked by another worker: nothing reaches this worker's filter
+    db.add(RevokedToken(jti=decode_token(token)["jti"], user_id=user.id, expires_at=datetime(2100, 1, 1)))
+    db.commit()
+
+    payload = decode_token(token)
+    assert revocations.is_revoked(user.id, payload["iat"], payload["jti"])
+
+
+def test_async_check_queries_off_the_event_loop(db, monkeypatch):
+    user = seed_user(db)
+    token = create_access_token({"sub": str(user.id)})
+    AuthService.logout_user(db, user.id, token)
+    payload = decode_token(token)
+    revocations = TokenRevocationList()  # not rebuilt yet, so every check asks the table
+
+    threads = []
+    lookup = TokenRevocationList._jti_revoked
+    monkeypatch.setattr(
+        TokenRevocationList, "_jti_revoked",
+        staticmethod(lambda session, jti: threads.append(threading.get_ident()) or lookup(session, jti)),
+    )
+
+    assert asyncio.run(revocations.is_revoked_async(user.id, payload["iat"], payload["jti"]))
+    assert threads and threading.get_ident() not in threads